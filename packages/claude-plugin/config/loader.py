@@ -9,11 +9,24 @@ Usage:
     from config.loader import load_config
     config = load_config()
     daily_path = config['paths']['daily_notes']
+
+Hooks use get_config() instead: a read-only view that loads nothing until
+it is first read, so it is free on the fast-exit path.
+
+    config = get_config(vault_path)
+    daily_path = config.path('daily_notes')
+
+Loading config never writes anything. Callers about to write achievements
+call ensure_achievements_file() to create the default Achievements.md.
 """
 
+from __future__ import annotations
+
+import copy
 import json
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
 
 # Default configuration
 DEFAULTS = {
@@ -44,6 +57,18 @@ DEFAULTS = {
 }
 
 
+# Merged configs by vault path: (.flywheel.json mtime, config)
+_config_memo = {}
+
+# Vault roots by resolved start directory, least recently used first. Per
+# process: it only saves the ancestor walk in long-lived processes such as
+# hook-server.py; a new hook process walks once
+_root_memo = {}
+
+# Start directories remembered at most
+ROOT_MEMO_SIZE = 256
+
+
 def deep_merge(base: dict, override: dict) -> dict:
     """Deep merge override into base, returning new dict."""
     result = base.copy()
@@ -55,55 +80,141 @@ def deep_merge(base: dict, override: dict) -> dict:
     return result
 
 
-def resolve_achievements_path(vault_path: Path, config: dict) -> str:
+ROOT_ACHIEVEMENTS = "Achievements.md"
+
+
+def resolve_achievements_path(vault_path: Path, config: Mapping) -> str:
     """
     Achievements path resolution:
     1. If user explicitly configured via .flywheel.json, use that
     2. Otherwise default to Achievements.md at vault root
-    3. If file doesn't exist, create it for user to customize
-    """
-    root_path = "Achievements.md"
 
+    Pure: the file is created by ensure_achievements_file() when needed.
+    """
     user_path = config.get('paths', {}).get('achievements')
 
     # User explicitly configured - use as-is
-    if user_path and user_path != root_path:
+    if user_path and user_path != ROOT_ACHIEVEMENTS:
         return user_path
+    return ROOT_ACHIEVEMENTS
 
-    # Default to root - create if doesn't exist
-    root_file = vault_path / root_path
-    if not root_file.exists():
-        try:
-            root_file.write_text(
-                "# Achievements\n\n"
-                "Track your wins here. Flywheel will detect and display recent achievements.\n\n"
-                "## Format\n\n"
-                "Use date headers and bullet points:\n\n"
-                "## 2026-01-04\n\n"
-                "- First achievement!\n",
-                encoding='utf-8'
-            )
-        except (IOError, PermissionError):
-            pass  # Failed to create, will show "not found"
 
-    return root_path
+def ensure_achievements_file(vault_path: Path, config: Mapping) -> bool:
+    """
+    Make sure the achievements file exists before writing to it.
+
+    The default Achievements.md at the vault root is created for the user
+    to customize; a user-configured path is never created. Returns whether
+    the file exists afterwards.
+    """
+    relative = resolve_achievements_path(vault_path, config)
+    achievements_file = vault_path / relative
+    if achievements_file.exists():
+        return True
+    if relative != ROOT_ACHIEVEMENTS:
+        return False
+
+    try:
+        achievements_file.write_text(
+            "# Achievements\n\n"
+            "Track your wins here. Flywheel will detect and display recent achievements.\n\n"
+            "## Format\n\n"
+            "Use date headers and bullet points:\n\n"
+            "## 2026-01-04\n\n"
+            "- First achievement!\n",
+            encoding='utf-8'
+        )
+    except (IOError, PermissionError):
+        return False  # Failed to create, will show "not found"
+    return True
+
+
+def is_vault_root(path: Path) -> bool:
+    return (path / '.obsidian').exists() or (path / '.claude').exists()
+
+
+def is_state_root(path: Path) -> bool:
+    """
+    Whether hooks may keep vault state in path/.claude: a vault root, but
+    not the home directory marked only by the user-level ~/.claude.
+    """
+    if (path / '.obsidian').exists():
+        return True
+    if not (path / '.claude').exists():
+        return False
+    try:
+        return path.resolve() != Path.home().resolve()
+    except (OSError, RuntimeError):
+        return False
 
 
 def find_vault_root(start_path: Path = None) -> Path:
     """Find vault root by looking for .obsidian or .claude folder."""
     if start_path is None:
         start_path = Path.cwd()
+    start = current = start_path.resolve()
+
+    # A remembered root is reused while it is still a vault
+    memo = _root_memo.pop(start, None)
+    if memo is not None and is_vault_root(memo):
+        _root_memo[start] = memo  # Now the most recently used
+        return memo
 
-    current = start_path.resolve()
     while current != current.parent:
-        if (current / '.obsidian').exists() or (current / '.claude').exists():
+        if is_vault_root(current):
+            _root_memo[start] = current
+            if len(_root_memo) > ROOT_MEMO_SIZE:
+                del _root_memo[next(iter(_root_memo))]
             return current
         current = current.parent
 
-    # Fallback to cwd
+    # Fallback to cwd (not remembered: it depends on the caller's cwd)
     return Path.cwd()
 
 
+def _build_config(vault_path: Path, config_file: Path, config_mtime) -> dict:
+    """Parse .flywheel.json and merge it over the defaults."""
+    if config_mtime is not None:
+        try:
+            user_config = json.loads(config_file.read_text(encoding='utf-8'))
+            config = deep_merge(copy.deepcopy(DEFAULTS), user_config)
+        except (json.JSONDecodeError, IOError):
+            # Invalid config, use defaults
+            config = copy.deepcopy(DEFAULTS)
+    else:
+        config = copy.deepcopy(DEFAULTS)
+
+    # Smart path resolution for achievements
+    config['paths']['achievements'] = resolve_achievements_path(vault_path, config)
+    return config
+
+
+def _config_mtime(vault_path: Path):
+    try:
+        return (vault_path / '.flywheel.json').stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_merged(vault_path: Path = None) -> dict:
+    """
+    Merged config, reused while .flywheel.json is unchanged (which only
+    pays off in a long-lived process such as hook-server.py). The dict is
+    shared; callers must not modify it.
+    """
+    if vault_path is None:
+        vault_path = find_vault_root()
+
+    config_mtime = _config_mtime(vault_path)
+    memo = _config_memo.get(vault_path)
+    if memo and memo[0] == config_mtime:
+        return memo[1]
+
+    config = _build_config(vault_path, vault_path / '.flywheel.json', config_mtime)
+    _config_memo[vault_path] = (config_mtime, config)
+    return config
+
+
 def load_config(vault_path: Path = None) -> dict:
     """
     Load configuration from .flywheel.json.
@@ -114,25 +225,96 @@ def load_config(vault_path: Path = None) -> dict:
     Returns:
         Merged configuration dict (user config over defaults)
     """
-    if vault_path is None:
-        vault_path = find_vault_root()
+    return copy.deepcopy(_load_merged(vault_path))
 
-    config_file = vault_path / '.flywheel.json'
 
-    if config_file.exists():
-        try:
-            user_config = json.loads(config_file.read_text(encoding='utf-8'))
-            config = deep_merge(DEFAULTS, user_config)
-        except (json.JSONDecodeError, IOError):
-            # Invalid config, use defaults
-            config = DEFAULTS.copy()
-    else:
-        config = DEFAULTS.copy()
+def freeze(value: object) -> object:
+    """Read-only copy of parsed JSON: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
 
-    # Smart path resolution for achievements
-    config['paths']['achievements'] = resolve_achievements_path(vault_path, config)
 
-    return config
+def thaw(value: object) -> object:
+    """Plain, mutable JSON-compatible copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+# Frozen configs by vault path: (merged config they were made from, frozen config)
+_frozen_memo = {}
+
+
+class ConfigView(Mapping):
+    """
+    Read-only view of a vault's merged config, loaded on first access.
+
+    Creating a view does no I/O; the vault root is found and the config
+    loaded when a key is first read, and each path is resolved when first
+    asked for. Sections are read-only mappings and lists are tuples, so a
+    hook cannot change the config another stage sees.
+    """
+
+    __slots__ = ('_vault_path', '_config', '_paths')
+
+    def __init__(self, vault_path: Path = None):
+        self._vault_path = vault_path
+        self._config = None
+        self._paths = None
+
+    @property
+    def vault_path(self) -> Path:
+        if self._vault_path is None:
+            self._vault_path = find_vault_root()
+        return self._vault_path
+
+    def load(self) -> ConfigView:
+        """Load now (normally done on first access); returns the view."""
+        if self._config is None:
+            vault_path = self.vault_path
+            merged = _load_merged(vault_path)
+            memo = _frozen_memo.get(vault_path)
+            if memo is None or memo[0] is not merged:
+                memo = _frozen_memo[vault_path] = (merged, freeze(merged))
+            self._config = memo[1]
+            self._paths = {}
+        return self
+
+    def __getitem__(self, key: str) -> object:
+        return self.load()._config[key]
+
+    def __iter__(self):
+        return iter(self.load()._config)
+
+    def __len__(self) -> int:
+        return len(self.load()._config)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._config is not None else 'not loaded'
+        return f'<ConfigView {self._vault_path} ({state})>'
+
+    def path(self, key: str) -> Path:
+        """config['paths'][key] resolved against the vault root."""
+        self.load()
+        resolved = self._paths.get(key)
+        if resolved is None:
+            relative = self._config['paths'].get(key, DEFAULTS['paths'].get(key, ''))
+            resolved = self._paths[key] = self.vault_path / relative
+        return resolved
+
+    def to_dict(self) -> dict:
+        """Mutable copy of the whole config."""
+        return thaw(self.load()._config)
+
+
+def get_config(vault_path: Path = None) -> ConfigView:
+    """Read-only config view for the vault; nothing is loaded until it is read."""
+    return ConfigView(vault_path)
 
 
 def get_path(config: dict, key: str, vault_path: Path = None) -> Path:
@@ -12,8 +12,15 @@ Exit codes:
 - 0: Always (informational only, never blocks)
 """
 
-import json
+import os
 import sys
+
+# Reject calls this hook would ignore before the heavier imports below
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('achievement-detect')
+
 from pathlib import Path
 
 # Configure UTF-8 output for Windows console
@@ -24,100 +31,80 @@ except AttributeError:
 
 # Add parent directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config.loader import load_config
+from config.loader import ensure_achievements_file
 
 # Import shared achievement detection library
 sys.path.insert(0, str(Path(__file__).parent))
 from lib.achievement_detector import (
+    ACHIEVEMENTS_INDEX_FILE,
     check_for_achievements,
     write_achievements_to_file
 )
+from lib.hook_context import HookContext, run_standalone
+
+HOOK_LABEL = 'Achievement detector'
+
+
+def process(ctx: HookContext) -> None:
+    """Detect achievements in the edited daily note (stage entry point)."""
+    # Only run on Edit/Write operations
+    if ctx.tool_name not in ['Edit', 'Write']:
+        return
+
+    file_path = ctx.file_path
+
+    # Only check daily notes
+    if not file_path.endswith('.md'):
+        return
+
+    config = ctx.config
+    daily_notes_folder = config['paths']['daily_notes']
+    if daily_notes_folder not in file_path:
+        return
+
+    # Check if file exists
+    if not ctx.exists:
+        return
+
+    # Check for achievements using shared library (only lines around an Edit if located)
+    region = ctx.edit_region
+    achievements = check_for_achievements(
+        ctx.content, config, span=(region.start, region.end) if region is not None else None
+    )
+
+    if achievements:
+        # Get achievements file path from config
+        achievements_file = config.path('achievements')
+
+        # Only a caller that is about to write creates the default file
+        if ensure_achievements_file(ctx.vault_path, config):
+            # Write achievements using shared library (no limit - log everything)
+            num_written = write_achievements_to_file(
+                achievements,
+                achievements_file,
+                max_achievements=1000,
+                index_file=ctx.vault_path / '.claude' / ACHIEVEMENTS_INDEX_FILE
+            )
+
+            if num_written > 0:
+                ctx.print(f"\n✓ Auto-Added {num_written} Achievements")
+                ctx.print("-" * 50)
+                for a in achievements[:num_written]:
+                    ctx.print(f"  • {a['line'][:80]}{'...' if len(a['line']) > 80 else ''}")
+                ctx.print("-" * 50)
+                ctx.print("")
+        else:
+            # Fallback: just notify
+            ctx.print(f"\n🏆 Achievement Detected (Achievements file not found)")
+            ctx.print("-" * 50)
+            for a in achievements[:3]:
+                ctx.print(f"  • {a['line'][:80]}{'...' if len(a['line']) > 80 else ''}")
+            ctx.print("-" * 50)
+            ctx.print("")
 
 
 def main():
-    try:
-        # Read hook input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Only run on Edit/Write operations
-        tool_name = hook_input.get('tool_name', '')
-        if tool_name not in ['Edit', 'Write']:
-            sys.exit(0)
-
-        # Get the file path from tool input
-        tool_input = hook_input.get('tool_input', {})
-        file_path = tool_input.get('file_path', '')
-
-        # Load config
-        config = load_config()
-        daily_notes_folder = config['paths']['daily_notes']
-
-        # Only check daily notes
-        if daily_notes_folder not in file_path or not file_path.endswith('.md'):
-            sys.exit(0)
-
-        # Check if file exists
-        path = Path(file_path)
-        if not path.exists():
-            sys.exit(0)
-
-        # Read file content
-        content = path.read_text(encoding='utf-8')
-
-        # Check for achievements using shared library
-        achievements = check_for_achievements(content, config)
-
-        if achievements:
-            # Get vault root
-            vault_path = path
-            while vault_path.parent != vault_path:
-                if (vault_path / '.obsidian').exists() or (vault_path / '.claude').exists():
-                    break
-                vault_path = vault_path.parent
-
-            # Get achievements file path from config
-            achievements_file = vault_path / config['paths']['achievements']
-
-            if achievements_file.exists():
-                # Write achievements using shared library (no limit - log everything)
-                num_written = write_achievements_to_file(
-                    achievements,
-                    achievements_file,
-                    max_achievements=1000
-                )
-
-                if num_written > 0:
-                    print(f"\n✓ Auto-Added {num_written} Achievements")
-                    print("-" * 50)
-                    for a in achievements[:num_written]:
-                        print(f"  • {a['line'][:80]}{'...' if len(a['line']) > 80 else ''}")
-                    print("-" * 50)
-                    print("")
-            else:
-                # Fallback: just notify
-                print(f"\n🏆 Achievement Detected (Achievements file not found)")
-                print("-" * 50)
-                for a in achievements[:3]:
-                    print(f"  • {a['line'][:80]}{'...' if len(a['line']) > 80 else ''}")
-                print("-" * 50)
-                print("")
-
-        sys.exit(0)
-
-    except json.JSONDecodeError:
-        sys.exit(0)
-    except FileNotFoundError as e:
-        print(f"[flywheel] Achievement detector: File not found - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except PermissionError as e:
-        print(f"[flywheel] Achievement detector: Permission denied - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except ModuleNotFoundError as e:
-        print(f"[flywheel] Achievement detector: Missing module - {e.name}. Check plugin installation.", file=sys.stderr)
-        sys.exit(0)
-    except Exception as e:
-        print(f"[flywheel] Achievement detector error: {type(e).__name__}: {e}", file=sys.stderr)
-        sys.exit(0)
+    run_standalone(process, HOOK_LABEL)
 
 
 if __name__ == '__main__':
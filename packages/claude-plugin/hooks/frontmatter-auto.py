@@ -6,8 +6,8 @@ Runs after Edit/Write operations to AUTO-ADD missing frontmatter fields
 based on folder conventions. This hook MODIFIES files.
 
 Logic:
-1. Scan all notes in the same folder as the edited file
-2. Find fields present in >90% of notes with enumerable values
+1. Update the folder's notes in the vault index (only changed notes are read)
+2. Query fields present in >90% of notes with enumerable values
 3. If the edited file is missing those fields, auto-add them
 
 Safety:
@@ -20,12 +20,18 @@ Exit codes:
 - 0: Always (informational only, never blocks)
 """
 
-import json
+import os
 import sys
-import re
+
+# Reject calls this hook would ignore before the heavier imports below
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('frontmatter-auto')
+
+import json
+import sqlite3
 from pathlib import Path
-from collections import defaultdict
-from typing import Any
 
 # Configure UTF-8 output for Windows console
 try:
@@ -35,7 +41,15 @@ except AttributeError:
 
 # Add parent directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config.loader import load_config, find_vault_root, get_periodic_folders
+from config.loader import get_periodic_folders
+
+# Shared hook context (stage entry point for post-mutation.py)
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_context import HookContext, run_standalone
+from lib.markdown_document import parse_document
+from lib.vault_index import VaultIndex
+
+HOOK_LABEL = 'Frontmatter complete'
 
 # Minimum frequency to consider a field "expected" (90%)
 MIN_FREQUENCY = 0.9
@@ -57,56 +71,10 @@ def parse_frontmatter(content: str) -> tuple[dict, str, int]:
     Returns:
         (frontmatter_dict, body, frontmatter_end_pos)
     """
-    if not content.startswith('---'):
-        return {}, content, 0
-
-    # Find closing ---
-    lines = content.split('\n')
-    end_idx = -1
-    for i, line in enumerate(lines[1:], start=1):
-        if line.strip() == '---':
-            end_idx = i
-            break
-
-    if end_idx == -1:
+    document = parse_document(content)
+    if not document.has_frontmatter:
         return {}, content, 0
-
-    # Parse YAML manually (simple key: value pairs)
-    frontmatter = {}
-    for line in lines[1:end_idx]:
-        if ':' in line:
-            key, _, value = line.partition(':')
-            key = key.strip()
-            value = value.strip()
-
-            # Handle quoted strings
-            if value.startswith('"') and value.endswith('"'):
-                value = value[1:-1]
-            elif value.startswith("'") and value.endswith("'"):
-                value = value[1:-1]
-            # Handle arrays (basic)
-            elif value.startswith('['):
-                try:
-                    value = json.loads(value)
-                except json.JSONDecodeError:
-                    pass
-            # Handle booleans
-            elif value.lower() in ('true', 'false'):
-                value = value.lower() == 'true'
-            # Handle numbers
-            elif value.isdigit():
-                value = int(value)
-            elif value.replace('.', '').isdigit():
-                value = float(value)
-
-            if key:
-                frontmatter[key] = value
-
-    # Calculate end position
-    end_pos = sum(len(l) + 1 for l in lines[:end_idx + 1])
-    body = '\n'.join(lines[end_idx + 1:])
-
-    return frontmatter, body, end_pos
+    return dict(document.fields), document.body, document.frontmatter_end
 
 
 def add_frontmatter_fields(content: str, new_fields: dict) -> str:
@@ -141,34 +109,33 @@ def add_frontmatter_fields(content: str, new_fields: dict) -> str:
     return '\n'.join(lines) + '\n' + body.lstrip('\n')
 
 
-def scan_folder_conventions(folder_path: Path, exclude_file: Path = None) -> dict:
+def scan_folder_conventions(folder_path: Path, exclude_file: Path = None, vault_path: Path = None) -> dict:
     """
-    Scan all markdown files in folder to infer conventions.
+    Infer conventions from the folder's notes in the vault index.
+
+    Only notes added or changed since the last call are read; the edited
+    note (exclude_file) is left out of the counts.
 
-    Returns dict of field_name -> {frequency, common_values}
+    Returns dict of field_name -> {frequency, common_value, unique_count}
     """
-    field_stats = defaultdict(lambda: {'count': 0, 'values': defaultdict(int)})
-    total_notes = 0
+    if vault_path is None:
+        vault_path = folder_path.parent
+    exclude_name = exclude_file.name if exclude_file else None
 
-    for md_file in folder_path.glob('*.md'):
-        if md_file == exclude_file:
-            continue
+    try:
+        with VaultIndex.open(vault_path) as index:
+            folder = index.folder_key(folder_path)
+            index.refresh_folder(folder, skip_name=exclude_name)
+            exclude = f'{folder}/{exclude_name}' if folder and exclude_name else exclude_name
+            total_notes, field_stats = index.folder_field_stats(folder, exclude, SKIP_FIELDS)
+    except (OSError, sqlite3.Error):
+        return {}
+
+    return conventions_from_stats(total_notes, field_stats)
 
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            frontmatter, _, _ = parse_frontmatter(content)
-
-            if frontmatter:
-                total_notes += 1
-                for key, value in frontmatter.items():
-                    if key.lower() not in SKIP_FIELDS:
-                        field_stats[key]['count'] += 1
-                        # Track values (convert to string for counting)
-                        value_str = json.dumps(value) if not isinstance(value, str) else value
-                        field_stats[key]['values'][value_str] += 1
-        except Exception:
-            continue
 
+def conventions_from_stats(total_notes: int, field_stats: dict) -> dict:
+    """Pick the high-frequency enumerable fields from folder statistics."""
     if total_notes < 3:
         # Not enough notes to infer conventions
         return {}
@@ -219,105 +186,84 @@ def is_within_vault(file_path: Path, vault_path: Path) -> bool:
         return False
 
 
+def process(ctx: HookContext) -> None:
+    """Auto-add missing frontmatter to the edited file (stage entry point)."""
+    # Only run on Edit/Write operations
+    if ctx.tool_name not in ['Edit', 'Write']:
+        return
+
+    # Only check markdown files
+    if not ctx.file_path.endswith('.md'):
+        return
+
+    path = ctx.path
+    if not ctx.exists:
+        return
+
+    # Check vault boundary
+    env_vault_path = get_vault_path_from_env()
+    if env_vault_path and not is_within_vault(path, env_vault_path):
+        return
+
+    # Skip dot folders
+    path_parts = path.parts
+    if any(part.startswith('.') and len(part) > 1 for part in path_parts):
+        return
+
+    # Get vault root
+    vault_path = ctx.vault_path
+    config = ctx.config
+
+    # Skip periodic note folders (they have their own conventions)
+    periodic_folders = get_periodic_folders(config)
+    folder_name = path.parent.name
+    if folder_name in periodic_folders:
+        return
+
+    # Skip root-level files (no folder convention to infer)
+    if path.parent == vault_path:
+        return
+
+    # Scan folder for conventions
+    conventions = scan_folder_conventions(path.parent, exclude_file=path, vault_path=vault_path)
+
+    if not conventions:
+        return
+
+    # Read current file content
+    content = ctx.content
+    existing_fm = ctx.document.fields
+
+    # Find missing fields
+    missing_fields = {}
+    for field, stats in conventions.items():
+        if field not in existing_fm:
+            # Parse the common value back from JSON string
+            try:
+                value = json.loads(stats['common_value'])
+            except json.JSONDecodeError:
+                value = stats['common_value']
+
+            missing_fields[field] = value
+
+    if not missing_fields:
+        return
+
+    # Add missing fields (written back once by the caller)
+    ctx.content = add_frontmatter_fields(content, missing_fields)
+
+    # Report what was added
+    ctx.print(f"\n✓ Auto-Added Frontmatter to {path.name}")
+    ctx.print("-" * 60)
+    for field, value in missing_fields.items():
+        display_value = value if len(str(value)) < 40 else str(value)[:37] + '...'
+        ctx.print(f"  {field}: {display_value}")
+    ctx.print("-" * 60)
+    ctx.print("")
+
+
 def main():
-    try:
-        # Read hook input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # Only run on Edit/Write operations
-        tool_name = hook_input.get('tool_name', '')
-        if tool_name not in ['Edit', 'Write']:
-            sys.exit(0)
-
-        # Get the file path from tool input
-        tool_input = hook_input.get('tool_input', {})
-        file_path = tool_input.get('file_path', '')
-
-        # Only check markdown files
-        if not file_path.endswith('.md'):
-            sys.exit(0)
-
-        path = Path(file_path)
-        if not path.exists():
-            sys.exit(0)
-
-        # Check vault boundary
-        env_vault_path = get_vault_path_from_env()
-        if env_vault_path and not is_within_vault(path, env_vault_path):
-            sys.exit(0)
-
-        # Skip dot folders
-        path_parts = path.parts
-        if any(part.startswith('.') and len(part) > 1 for part in path_parts):
-            sys.exit(0)
-
-        # Get vault root
-        vault_path = find_vault_root(path)
-        config = load_config(vault_path)
-
-        # Skip periodic note folders (they have their own conventions)
-        periodic_folders = get_periodic_folders(config)
-        folder_name = path.parent.name
-        if folder_name in periodic_folders:
-            sys.exit(0)
-
-        # Skip root-level files (no folder convention to infer)
-        if path.parent == vault_path:
-            sys.exit(0)
-
-        # Scan folder for conventions
-        conventions = scan_folder_conventions(path.parent, exclude_file=path)
-
-        if not conventions:
-            sys.exit(0)
-
-        # Read current file content
-        content = path.read_text(encoding='utf-8')
-        existing_fm, _, _ = parse_frontmatter(content)
-
-        # Find missing fields
-        missing_fields = {}
-        for field, stats in conventions.items():
-            if field not in existing_fm:
-                # Parse the common value back from JSON string
-                try:
-                    value = json.loads(stats['common_value'])
-                except json.JSONDecodeError:
-                    value = stats['common_value']
-
-                missing_fields[field] = value
-
-        if not missing_fields:
-            sys.exit(0)
-
-        # Add missing fields
-        updated_content = add_frontmatter_fields(content, missing_fields)
-
-        # Write back
-        path.write_text(updated_content, encoding='utf-8')
-
-        # Report what was added
-        print(f"\n✓ Auto-Added Frontmatter to {path.name}")
-        print("-" * 60)
-        for field, value in missing_fields.items():
-            display_value = value if len(str(value)) < 40 else str(value)[:37] + '...'
-            print(f"  {field}: {display_value}")
-        print("-" * 60)
-        print("")
-
-        sys.exit(0)
-
-    except json.JSONDecodeError:
-        sys.exit(0)
-    except FileNotFoundError as e:
-        print(f"[flywheel] Frontmatter complete: File not found - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except PermissionError as e:
-        print(f"[flywheel] Frontmatter complete: Permission denied - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except Exception as e:
-        print(f"[flywheel] Frontmatter complete error: {type(e).__name__}: {e}", file=sys.stderr)
-        sys.exit(0)
+    run_standalone(process, HOOK_LABEL)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Hook Client Shim (hook-client.py)
+
+Forwards a hook call to hook-server.py, or runs the hook in-process when
+no server is listening.
+
+Usage (hooks.json):
+    python3 hook-client.py <hook-name>
+
+Supported hooks: pre-mutation-gate, read-cache, post-mutation.
+
+Calls the hook would ignore (e.g. an Edit of a non-markdown file) are
+rejected by lib/bootstrap.py before the socket is imported or the server
+contacted. Only os/sys/json/socket are imported on the forwarding path;
+the hook modules are loaded only for the in-process fallback. With
+FLYWHEEL_HOOK_SERVER=1 a missing server is started in the background for
+the next call.
+
+If the server accepts a call but does not answer in time, the gate and
+read-cache run in-process instead, so a busy or hung server never lets
+an edit through unchecked (see RERUN_ON_TIMEOUT in lib/hook_server.py).
+
+Exit codes:
+- Same as the forwarded hook (always 0 for flywheel hooks)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from lib.bootstrap import should_run
+
+
+def main():
+    hook = sys.argv[1] if len(sys.argv) > 1 else ''
+    raw_input = sys.stdin.read()
+    if not should_run(hook, raw_input):
+        sys.exit(0)
+
+    import socket
+    from lib.hook_server import (
+        RERUN_ON_TIMEOUT, SERVED_HOOKS, make_request, response_timeout, run_hook_main, send_request,
+        start_background
+    )
+
+    if hook not in SERVED_HOOKS:
+        print(f"[flywheel] Hook client: unknown hook '{hook}'", file=sys.stderr)
+        sys.exit(0)
+
+    try:
+        response = send_request(make_request(hook, raw_input), response_timeout(hook))
+    except (socket.timeout, OSError):
+        if hook not in RERUN_ON_TIMEOUT:
+            # Server took the request and may still run it - don't run it twice
+            print(f"[flywheel] Hook client: {hook} timed out", file=sys.stderr)
+            sys.exit(0)
+        # Server busy or hung: answer here rather than fail open
+        response = run_hook_main(hook, raw_input)
+    else:
+        if response is None:
+            if os.environ.get('FLYWHEEL_HOOK_SERVER') == '1':
+                start_background()
+            response = run_hook_main(hook, raw_input)
+
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except AttributeError:
+        pass
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stderr.write(response.get('stderr', ''))
+    sys.exit(response.get('exit_code', 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Flywheel Hook Server (hook-server.py)
+
+Optional long-lived process that runs hooks in-process for a whole session.
+hook-client.py forwards each hook's stdin JSON to it over a local Unix
+socket; when the server is not running the client runs the hook in-process
+instead, so hooks work the same either way.
+
+Kept warm across hook calls:
+- Imported hook modules and their compiled regexes
+- Wikilink entity cache (wikilink-auto.py, keyed by cache file mtime)
+- Folder-convention stats (frontmatter-auto.py, keyed by folder listing)
+- Merged config (config/loader.py, keyed by .flywheel.json mtime)
+
+Usage:
+    python3 hook-server.py start    # Start in the background
+    python3 hook-server.py stop     # Stop the running server
+    python3 hook-server.py status   # Show whether a server is listening
+    python3 hook-server.py serve    # Run in the foreground
+
+Set FLYWHEEL_HOOK_SERVER=1 to let hook-client.py start the server on first
+use. The server exits after 30 minutes without requests.
+
+Exit codes:
+- 0: Success
+- 1: Unsupported platform or server not running (status/stop)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_server import (
+    is_supported,
+    send_request,
+    serve,
+    socket_path,
+    start_background,
+)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+
+    if not is_supported():
+        print("[flywheel] Hook server: Unix sockets not supported on this platform", file=sys.stderr)
+        sys.exit(1)
+
+    if command == 'serve':
+        serve()
+        sys.exit(0)
+
+    if command == 'start':
+        if send_request({'command': 'ping'}):
+            print(f"Hook server already running: {socket_path()}")
+            sys.exit(0)
+        start_background()
+        # Wait briefly so callers can rely on the server once start returns
+        for _ in range(50):
+            if send_request({'command': 'ping'}):
+                print(f"Hook server started: {socket_path()}")
+                sys.exit(0)
+            time.sleep(0.05)
+        print("[flywheel] Hook server: did not start", file=sys.stderr)
+        sys.exit(1)
+
+    if command == 'stop':
+        if send_request({'command': 'shutdown'}):
+            print("Hook server stopped")
+            sys.exit(0)
+        print("Hook server not running")
+        sys.exit(1)
+
+    if command == 'status':
+        response = send_request({'command': 'ping'})
+        if response:
+            print(f"Hook server running (pid {response.get('pid')}): {socket_path()}")
+            sys.exit(0)
+        print("Hook server not running")
+        sys.exit(1)
+
+    print(f"Usage: {Path(__file__).name} start|stop|status|serve", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Flywheel Hook Timing (hook-timing.py)
+
+Summarizes the latency log written when FLYWHEEL_HOOK_TIMING=1: call
+count, p50/p95/p99 wall time per hook and per stage (stdin parse, config
+load, vault-root discovery, file read, each post-mutation stage,
+write-back), and the mean work counts (entities, regex passes, files read).
+
+Usage:
+    python3 hook-timing.py summary [hook]   # Print percentiles (default)
+    python3 hook-timing.py clear            # Delete the timing log
+
+Exit codes:
+- 0: Success
+- 1: No timing records or unknown command
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_timing import TIMING_ENV, load_records, log_path, summarize
+
+
+def format_summary(summary: dict) -> str:
+    lines = []
+    for hook, stats in summary.items():
+        total = stats['total']
+        lines.append(f"{hook}  ({stats['calls']} calls)")
+        lines.append(f"  {'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        lines.append(f"  {'total':<22}{total[50]:>10.2f}{total[95]:>10.2f}{total[99]:>10.2f}")
+        for name, pcts in sorted(stats['stages'].items(), key=lambda item: -item[1][50]):
+            lines.append(f"  {name:<22}{pcts[50]:>10.2f}{pcts[95]:>10.2f}{pcts[99]:>10.2f}")
+        if stats['counts']:
+            counts = ', '.join(f"{name}={mean:g}" for name, mean in sorted(stats['counts'].items()))
+            lines.append(f"  mean counts: {counts}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'summary'
+    path = log_path()
+
+    if command == 'summary':
+        records = load_records(path)
+        if len(sys.argv) > 2:
+            records = [r for r in records if r['hook'] == sys.argv[2]]
+        if not records:
+            print(f"No timing records in {path} (set {TIMING_ENV}=1 to record)")
+            sys.exit(1)
+        print(format_summary(summarize(records)), end='')
+        sys.exit(0)
+
+    if command == 'clear':
+        for part in (path, path.with_name(path.name + '.1')):
+            try:
+                part.unlink()
+            except OSError:
+                pass
+        print(f"Cleared {path}")
+        sys.exit(0)
+
+    print(f"Usage: {Path(__file__).name} summary [hook]|clear", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -18,10 +18,16 @@ LIBERAL DETECTION: Captures a wide range of achievements including:
 Strategy: Capture more, curate later. Better to catch too much than miss achievements.
 """
 
+import bisect
+import hashlib
+import json
+import os
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from lib.hook_timing import current as current_timer
 
 
 # Keywords that suggest significant achievements (LIBERAL - capture more, curate later)
@@ -174,50 +180,99 @@ ACHIEVEMENT_KEYWORDS = [
 ]
 
 
-def check_for_achievements(content: str, config: dict) -> List[Dict[str, str]]:
+def _lowercase_pattern(pattern: str) -> str:
+    """Lowercase the literal text of a pattern, leaving escapes (\\S, \\D) alone."""
+    return re.sub(r'\\.|[^\\]+', lambda m: m.group() if m.group()[0] == '\\' else m.group().lower(), pattern)
+
+
+# All keywords in one alternation. Each keyword ends in an empty marker
+# group, so m.lastindex - 1 is the index of the keyword that matched and
+# m.start(m.lastindex) where it ended. Lines are lowercased and matched
+# case-sensitively: case-insensitive literals defeat the per-branch
+# first-character check, which makes the alternation several times slower.
+_KEYWORD_RE = re.compile('|'.join(f'(?:{_lowercase_pattern(p)})()' for p in ACHIEVEMENT_KEYWORDS))
+
+# For the rare line whose length changes when lowercased
+_KEYWORD_RE_IGNORECASE = re.compile('|'.join(f'(?:{p})()' for p in ACHIEVEMENT_KEYWORDS), re.IGNORECASE)
+
+_BULLET_RE = re.compile(r'^[-*]\s*')
+
+
+def classify_line(line: str) -> Optional[tuple]:
+    """
+    First keyword (in ACHIEVEMENT_KEYWORDS order) found in a line.
+
+    Returns:
+        (keyword index, match start, matched text), or None
+    """
+    text, keyword_re = line.lower(), _KEYWORD_RE
+    if len(text) != len(line):
+        text, keyword_re = line, _KEYWORD_RE_IGNORECASE
+
+    best = None
+    match = keyword_re.search(text)
+    while match:
+        index = match.lastindex - 1
+        if best is None or index < best[0]:
+            best = (index, match.start(), line[match.start():match.start(match.lastindex)])
+            if index == 0:
+                break
+        # At each position the alternation reports its lowest keyword;
+        # step one character so keywords inside this match are seen too
+        match = keyword_re.search(text, match.start() + 1)
+    return best
+
+
+def check_for_achievements(content: str, config: dict,
+                           span: Optional[Tuple[int, int]] = None) -> List[Dict[str, str]]:
     """
     Scan content for achievement-worthy entries.
 
+    Each log line is classified in one pass and reported once, for the
+    first keyword in ACHIEVEMENT_KEYWORDS that matches it. Results are in
+    keyword order, then line order.
+
     Args:
         content: Text content to scan (typically from daily note)
         config: Configuration dict with 'sections' key containing 'log' header
+        span: Optional (start, end) of whole lines to limit the scan to
+            (the region around an edit); still only within the Log section
 
     Returns:
         List of achievement dicts with keys: keyword, line, context
     """
-    achievements = []
-
     # Focus on Log section if it exists
     log_header = config['sections']['log']
     log_pattern = re.escape(log_header) + r'\s*\n([\s\S]*?)(?=\n## |\n# |\Z)'
     log_match = re.search(log_pattern, content)
-    search_content = log_match.group(1) if log_match else content
-
-    for pattern in ACHIEVEMENT_KEYWORDS:
-        matches = re.finditer(pattern, search_content, re.IGNORECASE)
-        for match in matches:
-            # Get the full line containing the match
-            line_start = search_content.rfind('\n', 0, match.start()) + 1
-            line_end = search_content.find('\n', match.end())
-            if line_end == -1:
-                line_end = len(search_content)
-
-            full_line = search_content[line_start:line_end].strip()
-
-            # Clean up the line (remove leading - or *)
-            full_line = re.sub(r'^[-*]\s*', '', full_line)
+    start, end = log_match.span(1) if log_match else (0, len(content))
+    if span is not None:
+        start, end = max(start, span[0]), min(end, span[1])
+    search_content = content[start:end] if start < end else ''
 
-            if full_line and len(full_line) > 10:  # Minimum meaningful length
-                achievements.append({
-                    'keyword': match.group(),
-                    'line': full_line,
-                    'context': pattern
-                })
+    achievements = []
+    lines = search_content.split('\n')
+    current_timer().count('lines_scanned', len(lines))
+    for line_no, line in enumerate(lines):
+        # Clean up the line (remove leading - or *)
+        full_line = _BULLET_RE.sub('', line.strip())
+        if len(full_line) <= 10:  # Minimum meaningful length
+            continue
+
+        found = classify_line(line)
+        if found:
+            index, start, keyword = found
+            achievements.append(((index, line_no, start), {
+                'keyword': keyword,
+                'line': full_line,
+                'context': ACHIEVEMENT_KEYWORDS[index]
+            }))
 
     # Deduplicate by line
+    achievements.sort(key=lambda a: a[0])
     seen_lines = set()
     unique_achievements = []
-    for a in achievements:
+    for _, a in achievements:
         if a['line'] not in seen_lines:
             seen_lines.add(a['line'])
             unique_achievements.append(a)
@@ -279,20 +334,121 @@ def filter_existing_achievements(achievements: List[Dict[str, str]], existing_co
     return new_achievements
 
 
+# Sidecar index of Achievements.md (kept in <vault>/.claude by the hook)
+ACHIEVEMENTS_INDEX_FILE = 'achievements-index.json'
+
+ACHIEVEMENTS_INDEX_VERSION = 1
+
+# Indexes kept in a long-lived process: achievements file -> index
+_index_memo = {}  # type: Dict[str, dict]
+
+
+def achievement_fingerprint(text: str) -> str:
+    """Short hash of the normalized text, used for duplicate checks."""
+    return hashlib.blake2b(normalize_for_comparison(text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def build_achievements_index(data: bytes) -> dict:
+    """
+    Index Achievements.md in one pass.
+
+    Returns:
+        {"fingerprints": set of bullet fingerprints,
+         "headings": [[line_start, gap, text], ...]} where gap is the byte
+        offset of the line break before the heading (where a '\\n###'
+        search lands) and offsets are in bytes
+    """
+    fingerprints = set()
+    headings = []
+    offset = 0
+    prev_end = 0
+    for raw in data.split(b'\n'):
+        line = raw.rstrip(b'\r').decode('utf-8', errors='replace')
+        if line.startswith('#'):
+            headings.append([offset, prev_end, line])
+        else:
+            stripped = line.strip()
+            if stripped.startswith('-') or stripped.startswith('*'):
+                if len(normalize_for_comparison(stripped)) > 10:  # Only meaningful lines
+                    fingerprints.add(achievement_fingerprint(stripped))
+        prev_end = offset + len(raw.rstrip(b'\r'))
+        offset += len(raw) + 1
+    return {'fingerprints': fingerprints, 'headings': headings}
+
+
+def _load_achievements_index(achievements_file: Path, index_file: Optional[Path]) -> dict:
+    """Index for the file as it is now; rebuilt if the file changed since it was saved."""
+    stat = achievements_file.stat()
+    key = str(achievements_file)
+
+    def current(index):
+        return index is not None and (index['size'], index['mtime_ns']) == (stat.st_size, stat.st_mtime_ns)
+
+    index = _index_memo.get(key)
+    if not current(index) and index_file is not None:
+        try:
+            data = json.loads(index_file.read_text(encoding='utf-8'))
+            if data.get('version') == ACHIEVEMENTS_INDEX_VERSION and data.get('file') == key:
+                index = dict(data, fingerprints=set(data['fingerprints']))
+        except (OSError, ValueError, AttributeError, KeyError, TypeError):
+            index = None
+
+    if not current(index):
+        # Missing, or Achievements.md was edited by hand: index it again
+        data = achievements_file.read_bytes()
+        index = build_achievements_index(data)
+        index['newline'] = '\r\n' if b'\r\n' in data[:data.find(b'\n') + 1] else '\n'
+        index.update(file=key, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    return index
+
+
+def _save_achievements_index(index: dict, index_file: Optional[Path]) -> None:
+    _index_memo[index['file']] = index
+    if index_file is None:
+        return
+    data = dict(index, version=ACHIEVEMENTS_INDEX_VERSION, fingerprints=sorted(index['fingerprints']))
+    tmp = index_file.with_name(f'{index_file.name}.{os.getpid()}.tmp')
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, index_file)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _insert_bytes(achievements_file: Path, offset: int, data: bytes) -> None:
+    """Insert data at offset, rewriting only the bytes after it."""
+    with open(achievements_file, 'r+b') as f:
+        f.seek(offset)
+        tail = f.read()
+        f.seek(offset)
+        f.write(data + tail)
+
+
 def write_achievements_to_file(
     achievements: List[Dict[str, str]],
     achievements_file: Path,
     max_achievements: int = 1000,
-    target_month: Optional[str] = None
+    target_month: Optional[str] = None,
+    index_file: Optional[Path] = None
 ) -> int:
     """
     Write achievements to the Achievements.md file.
 
+    Duplicates are found with a fingerprint index of the file, and new
+    bullets are inserted in place: only the part of the file after the
+    insertion point is rewritten.
+
     Args:
         achievements: List of achievement dicts to write
         achievements_file: Path to Achievements.md
         max_achievements: Maximum number of achievements to write (default 1000, effectively unlimited)
         target_month: Optional month string like "December 2025" (defaults to current month)
+        index_file: Optional sidecar file that keeps the index between runs;
+            without it the file is indexed on every call
 
     Returns:
         Number of achievements actually written
@@ -304,53 +460,58 @@ def write_achievements_to_file(
     if target_month is None:
         target_month = datetime.now().strftime('%B %Y')  # e.g., "December 2025"
 
-    # Read achievements file
-    achievements_content = achievements_file.read_text(encoding='utf-8')
+    index = _load_achievements_index(achievements_file, index_file)
 
     # Filter out achievements that already exist in the file
-    new_achievements = filter_existing_achievements(achievements, achievements_content)
+    new_achievements = [
+        a for a in achievements
+        if achievement_fingerprint(a['line']) not in index['fingerprints']
+    ][:max_achievements]
 
     if not new_achievements:
         return 0  # All achievements already exist
 
     # Find or create current month section
     month_header = f"### {target_month}"
-
-    if month_header in achievements_content:
-        # Month section exists, add to it
-        month_start = achievements_content.find(month_header)
-        next_section = achievements_content.find('\n###', month_start + len(month_header))
-        if next_section == -1:
-            next_section = len(achievements_content)
-
-        # Insert achievements before next section (limit to max)
-        insert_point = next_section
-        new_lines = '\n'.join(f"- {a['line']}" for a in new_achievements[:max_achievements])
-        achievements_content = (
-            achievements_content[:insert_point] +
-            f"\n{new_lines}\n" +
-            achievements_content[insert_point:]
-        )
+    new_lines = '\n'.join(f"- {a['line']}" for a in new_achievements)
+    headings = index['headings']
+    new_heading = None
+
+    month = next((i for i, h in enumerate(headings) if month_header in h[2]), None)
+    if month is not None:
+        # Month section exists, insert before the next section
+        insert_point = next((h[1] for h in headings[month + 1:] if h[2].startswith('###')), index['size'])
+        text = f"\n{new_lines}\n"
     else:
-        # Create new month section - find current year
-        current_year = datetime.now().strftime('%Y')
-        year_section = f"## {current_year}"
-        if year_section in achievements_content:
-            year_start = achievements_content.find(year_section)
-            next_year = achievements_content.find('\n##', year_start + len(year_section))
-            if next_year == -1:
-                next_year = len(achievements_content)
-
-            new_lines = '\n'.join(f"- {a['line']}" for a in new_achievements[:max_achievements])
-            new_section = f"\n\n{month_header}\n{new_lines}\n"
-
-            achievements_content = (
-                achievements_content[:next_year] +
-                new_section +
-                achievements_content[next_year:]
-            )
-
-    # Write back
-    achievements_file.write_text(achievements_content, encoding='utf-8')
-
-    return min(len(new_achievements), max_achievements)
+        # Create new month section at the top of the current year
+        year_section = f"## {datetime.now().strftime('%Y')}"
+        year = next((i for i, h in enumerate(headings) if year_section in h[2]), None)
+        if year is None:
+            return 0  # Nowhere to put it
+        insert_point = next((h[1] for h in headings[year + 1:] if h[2].startswith('##')), index['size'])
+        text = f"\n\n{month_header}\n{new_lines}\n"
+        new_heading = month_header
+
+    newline = index['newline']
+    data = text.replace('\n', newline).encode('utf-8')
+    _insert_bytes(achievements_file, insert_point, data)
+
+    # Shift the index past the insertion point
+    for h in headings:
+        if h[0] >= insert_point:
+            h[0] += len(data)
+        if h[1] >= insert_point:
+            h[1] += len(data)
+    if new_heading is not None:
+        gap = insert_point + len(newline)
+        bisect.insort(headings, [gap + len(newline), gap, new_heading])
+    index['fingerprints'].update(
+        achievement_fingerprint(a['line']) for a in new_achievements
+        if len(normalize_for_comparison(a['line'])) > 10
+    )
+
+    stat = achievements_file.stat()
+    index.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    _save_achievements_index(index, index_file)
+
+    return len(new_achievements)
@@ -0,0 +1,112 @@
+"""
+Hook Bootstrap
+
+Fast rejection of hook calls a hook would ignore, decided before the hook
+imports anything heavy (re, pathlib, config.loader, the hook libraries)
+or reconfigures stdout. Most PostToolUse calls are for non-markdown files
+and end here.
+
+Only stdlib io/os/sys are imported up front; most rejections are decided
+by a substring test on the raw input (no ".md", no matching tool name) and
+json is imported only when that test passes. Each rule is a conservative
+subset of the hook's own checks: the prefilter may let through a call the
+hook then skips, but never rejects one it would act on.
+
+The rejection path costs about as much as starting the interpreter; see
+the noop case of scripts/benchmark-hooks.py.
+
+Used by hook-client.py for the registered hooks, and at the top of each
+hook script when it is run directly:
+
+    if __name__ == '__main__':
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from lib.bootstrap import prefilter
+        prefilter('wikilink-auto')
+"""
+
+import io
+import sys
+
+MUTATION_TOOLS = ('Edit', 'Write')
+
+# hook: (tools, markdown only, skip paths containing .claude, skip dot folders)
+RULES = {
+    'pre-mutation-gate': (MUTATION_TOOLS, False, True, False),
+    'read-cache': (('Read',), True, True, False),
+    'post-mutation': (MUTATION_TOOLS, True, False, False),
+    'verify-mutation': (MUTATION_TOOLS, True, True, False),
+    'syntax-validate': (MUTATION_TOOLS, True, False, False),
+    'wikilink-auto': (MUTATION_TOOLS, True, False, True),
+    'frontmatter-auto': (MUTATION_TOOLS, True, False, True),
+    'achievement-detect': (MUTATION_TOOLS, True, False, False),
+}
+
+
+def parse_input(raw_input: str):
+    """Hook input dict, or None if it is not a JSON object."""
+    import json
+    try:
+        hook_input = json.loads(raw_input)
+    except ValueError:
+        return None
+    return hook_input if isinstance(hook_input, dict) else None
+
+
+def in_dot_folder(file_path: str) -> bool:
+    parts = file_path.replace('\\', '/').split('/')
+    return any(part.startswith('.') and len(part) > 1 and part != '..' for part in parts)
+
+
+def is_eligible(hook: str, hook_input) -> bool:
+    """Whether the hook could act on this input (unknown hooks always may)."""
+    rule = RULES.get(hook)
+    if rule is None:
+        return True
+    if not isinstance(hook_input, dict):
+        return False
+
+    tools, markdown_only, skip_claude, skip_dot_folders = rule
+    if hook_input.get('tool_name') not in tools:
+        return False
+    tool_input = hook_input.get('tool_input')
+    file_path = tool_input.get('file_path') if isinstance(tool_input, dict) else None
+    if not file_path or not isinstance(file_path, str):
+        return False
+    if markdown_only and not file_path.endswith('.md'):
+        return False
+    if skip_claude and '.claude' in file_path:
+        return False
+    if skip_dot_folders and in_dot_folder(file_path):
+        return False
+    return True
+
+
+def could_be_eligible(hook: str, raw_input: str) -> bool:
+    """
+    Substring test on the raw JSON: False when no call to the hook could
+    match (JSON encoders do not escape the ASCII in a tool name or ".md").
+    """
+    rule = RULES.get(hook)
+    if rule is None:
+        return True
+    tools, markdown_only = rule[0], rule[1]
+    if markdown_only and '.md' not in raw_input:
+        return False
+    return any(f'"{tool}"' in raw_input for tool in tools)
+
+
+def should_run(hook: str, raw_input: str) -> bool:
+    """Whether the hook could act on this raw stdin input."""
+    return could_be_eligible(hook, raw_input) and is_eligible(hook, parse_input(raw_input))
+
+
+def prefilter(hook: str) -> None:
+    """
+    Read the hook input from stdin and exit 0 if the hook has nothing to
+    do. Otherwise put the input back on sys.stdin for the hook's own
+    parsing and return.
+    """
+    raw_input = sys.stdin.read()
+    if not should_run(hook, raw_input):
+        sys.exit(0)
+    sys.stdin = io.StringIO(raw_input)
@@ -0,0 +1,147 @@
+"""
+Content Digest Cache
+
+Per-file record of which PostToolUse stages (at which version) have
+already processed which content, so an Edit/Write that leaves a note's
+content unchanged does not run the stages again. Common cases:
+- re-saving a note after wikilink-auto's own write-back
+- an Edit that only changes trailing whitespace
+
+A stage's digest is recorded only for content it ran on without error
+and left unchanged. After a stage changes the note, the stages that ran
+before it have not seen the new content and run on it next time.
+
+A stage's version covers its script, the shared hook code (hooks/lib and
+config/), the vault config, and any vault files the script lists in
+VERSION_FILES (wikilink-auto: the entity cache), so changing any of them
+makes it run again.
+
+Store: <vault>/.claude/content-digests/{crc32 of relative path}.json,
+only kept for notes in a vault (config.loader.is_state_root)
+    {"file": "rel/path.md", "stages": {label: {"version": v, "digests": [...]}}}
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+DIGEST_DIR = 'content-digests'
+
+# Code every stage imports from; a change to any module here re-runs all stages
+SHARED_CODE_DIRS = (
+    Path(__file__).resolve().parent,  # hooks/lib
+    Path(__file__).resolve().parents[2] / 'config',
+)
+
+# Digests remembered per stage and file
+MAX_DIGESTS = 8
+
+
+def content_digest(content: str) -> str:
+    """Digest of a note, ignoring trailing whitespace on lines and at the end."""
+    normalized = '\n'.join(line.rstrip() for line in content.split('\n')).rstrip('\n')
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ContentDigests:
+    """Digests already processed for one file."""
+
+    def __init__(self, store: Path, rel_file: str, config: dict, vault_path: Path = None):
+        self.store = store
+        self.rel_file = rel_file
+        self.vault_path = vault_path
+        self.config_crc = zlib.crc32(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        self._shared_code = None
+        self.changed = False
+        try:
+            data = json.loads(store.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            data = None
+        if isinstance(data, dict) and data.get('file') == rel_file and isinstance(data.get('stages'), dict):
+            self.stages = data['stages']  # type: Dict[str, dict]
+        else:
+            self.stages = {}
+
+    @classmethod
+    def for_context(cls, ctx) -> Optional['ContentDigests']:
+        """Digest cache for the edited note, or None if it does not apply."""
+        if ctx.tool_name not in ('Edit', 'Write') or not ctx.file_path.endswith('.md') or not ctx.exists:
+            return None
+        # Not the cwd fallback or $HOME: the note's folder is not a vault
+        from config.loader import is_state_root
+        if not is_state_root(ctx.vault_path):
+            return None
+        try:
+            rel_path = ctx.path.resolve().relative_to(ctx.vault_path.resolve())
+        except (ValueError, OSError):
+            return None
+        if any(part.startswith('.') for part in rel_path.parts):
+            return None
+        rel_file = rel_path.as_posix()
+        store = ctx.vault_path / '.claude' / DIGEST_DIR / f'{zlib.crc32(rel_file.encode("utf-8")):08x}.json'
+        return cls(store, rel_file, ctx.config.to_dict(), ctx.vault_path)
+
+    @staticmethod
+    def _stamp(path) -> str:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return f'{path}|-'
+        return f'{path}|{stat.st_mtime_ns}|{stat.st_size}'
+
+    def shared_code(self) -> str:
+        """Stamps of the shared hook modules (listed once per instance)."""
+        if self._shared_code is None:
+            stamps = []
+            for directory in SHARED_CODE_DIRS:
+                try:
+                    with os.scandir(directory) as it:
+                        stamps.extend(self._stamp(entry.path) for entry in it if entry.name.endswith('.py'))
+                except OSError:
+                    continue
+            self._shared_code = '|'.join(sorted(stamps))
+        return self._shared_code
+
+    def version(self, process: Callable) -> str:
+        """
+        Stage version: the script defining process(), the shared hook code,
+        the vault config and the stage's VERSION_FILES.
+        """
+        parts = [self._stamp(process.__code__.co_filename), self.shared_code(), str(self.config_crc)]
+        if self.vault_path is not None:
+            parts.extend(self._stamp(self.vault_path / rel) for rel in process.__globals__.get('VERSION_FILES', ()))
+        return f'{zlib.crc32("|".join(parts).encode("utf-8")):08x}'
+
+    def processed(self, label: str, version: str, digest: str) -> bool:
+        entry = self.stages.get(label)
+        return bool(entry) and entry.get('version') == version and digest in entry.get('digests', ())
+
+    def record(self, label: str, version: str, digest: str) -> None:
+        entry = self.stages.get(label)
+        if not entry or entry.get('version') != version:
+            entry = self.stages[label] = {'version': version, 'digests': []}
+        digests = entry['digests']
+        if digest in digests:
+            return
+        digests.append(digest)
+        del digests[:-MAX_DIGESTS]
+        self.changed = True
+
+    def save(self) -> None:
+        if not self.changed:
+            return
+        tmp = self.store.with_name(f'{self.store.name}.{os.getpid()}.tmp')
+        try:
+            self.store.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({'file': self.rel_file, 'stages': self.stages}, separators=(',', ':')),
+                           encoding='utf-8')
+            os.replace(tmp, self.store)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        self.changed = False
@@ -0,0 +1,123 @@
+"""
+Edit Region
+
+Locates the span an Edit call changed, so PostToolUse stages can analyze
+that span plus a margin instead of the whole note. A one-line edit to a
+year-long log then costs a few lines of work rather than a full pass.
+
+The Edit tool's new_string is searched for in the note: it must occur
+exactly once (every occurrence, from first to last, with replace_all).
+The span is widened to whole lines plus EDIT_MARGIN_LINES on each side,
+then until neither end falls inside a protected zone of the whole note
+(frontmatter, code, comments, math, links, tags, HTML), including inline
+zones that run over a line break. A region then tokenizes the same way on
+its own as within the note: the tokenizer is at a zone boundary where the
+region starts, and no zone runs past where it ends.
+
+None means the edit could not be located (Write calls, deletions, text
+that occurs more than once or was changed by an earlier stage); callers
+then analyze the whole note.
+
+Used by:
+- hook_context.py    : ctx.edit_region for the current content
+- syntax-validate.py, verify-mutation.py, wikilink-auto.py,
+  achievement-detect.py : analyze only the region
+
+Usage:
+    region = locate_edit_region(content, tool_input)
+    if region is not None:
+        text = region.text(content)
+        content = region.splice(content, fix(text))
+"""
+
+from typing import NamedTuple, Optional
+
+from lib.protected_zones import ZoneIndex, find_frontmatter_end, scan_protected_zones
+
+# Whole lines kept on each side of the edited span
+EDIT_MARGIN_LINES = 2
+
+
+class EditRegion(NamedTuple):
+    start: int
+    end: int
+    first_line: int  # 1-based line number of start
+
+    def text(self, content: str) -> str:
+        return content[self.start:self.end]
+
+    def splice(self, content: str, text: str) -> str:
+        """content with the region replaced by text."""
+        return content[:self.start] + text + content[self.end:]
+
+
+def find_edit_span(content: str, tool_input: dict) -> Optional[tuple]:
+    """(start, end) of the Edit's new_string in content, or None if not unique."""
+    new_string = tool_input.get('new_string')
+    if not isinstance(new_string, str) or not new_string.strip():
+        return None
+
+    start = content.find(new_string)
+    if start == -1:
+        return None
+    if tool_input.get('replace_all'):
+        end = content.rfind(new_string) + len(new_string)
+    elif content.find(new_string, start + 1) != -1:
+        return None
+    else:
+        end = start + len(new_string)
+    return start, end
+
+
+def _line_start(content: str, position: int, extra_lines: int = 0) -> int:
+    """Start of the line holding position, or of the line extra_lines above it."""
+    start = content.rfind('\n', 0, position) + 1
+    for _ in range(extra_lines):
+        if start == 0:
+            break
+        start = content.rfind('\n', 0, start - 1) + 1
+    return start
+
+
+def _line_end(content: str, position: int, extra_lines: int = 0) -> int:
+    """Offset past the line holding position, or past the line extra_lines below it."""
+    newline = content.find('\n', position)
+    for _ in range(extra_lines):
+        if newline == -1:
+            break
+        newline = content.find('\n', newline + 1)
+    return len(content) if newline == -1 else newline + 1
+
+
+def locate_edit_region(content: str, tool_input: dict, margin: int = EDIT_MARGIN_LINES,
+                       zones: ZoneIndex = None) -> Optional[EditRegion]:
+    """
+    Self-contained region of content around the Edit, or None to analyze it all.
+    zones are the protected zones of all of content, if already scanned.
+    """
+    span = find_edit_span(content, tool_input)
+    if span is None:
+        return None
+    if zones is None:
+        zones = scan_protected_zones(content)
+
+    start = _line_start(content, span[0], margin)
+    end = _line_end(content, max(span[1] - 1, span[0]), margin)
+
+    widened = True
+    while widened:
+        widened = False
+        zone = zones.zone_at(start)
+        if zone is not None and zone[0] < start:
+            start = _line_start(content, zone[0])
+            widened = True
+        elif start and find_frontmatter_end(content[start:end]):
+            # Would read as frontmatter on its own (a --- rule pair)
+            start = _line_start(content, start - 1)
+            widened = True
+        zone = zones.zone_at(end - 1) if end < len(content) else None
+        if zone is not None and zone[1] > end:
+            end = _line_end(content, zone[1] - 1)
+            widened = True
+
+    return EditRegion(start, end, content.count('\n', 0, start) + 1)
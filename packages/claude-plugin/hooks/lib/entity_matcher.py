@@ -0,0 +1,131 @@
+"""
+Entity Matcher
+
+Aho-Corasick automaton over entity names, used by wikilink-auto.py to find
+every entity occurrence in a document in one linear pass instead of one
+regex scan per entity.
+
+Matching follows the regex the hook used before:
+    re.finditer(r'\\b' + re.escape(entity) + r'\\b', text, re.IGNORECASE)
+- Case-insensitive (simple case folding, length-preserving)
+- Word boundary required at both ends (same \\b rule as `re`)
+
+Usage:
+    matcher = EntityMatcher(['Sarah Chen', 'Acme Corp'])
+    matcher.find_all(text)     # [(start, end, entity), ...]
+    matcher.entities_in(text)  # {'Sarah Chen'}
+"""
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def fold_case(text: str) -> str:
+    """Lowercase without changing length, so offsets map 1:1 to the original."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        # Final sigma is contextual in str.lower(); normalize it
+        return lowered.replace('ς', 'σ')
+    # Rare: some characters lowercase to multiple code points - keep those as-is
+    return ''.join(
+        (c.lower() if len(c.lower()) == 1 else c) for c in text
+    ).replace('ς', 'σ')
+
+
+def is_word_char(c: str) -> bool:
+    """Match `re`'s \\w for str patterns."""
+    return c.isalnum() or c == '_'
+
+
+def is_word_boundary(text: str, pos: int) -> bool:
+    """Match `re`'s \\b at pos."""
+    before = pos > 0 and is_word_char(text[pos - 1])
+    after = pos < len(text) and is_word_char(text[pos])
+    return before != after
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over case-folded entity names."""
+
+    def __init__(self, entities: Iterable[str]):
+        self.entities = []  # type: List[str]
+        self._lengths = []  # type: List[int]
+
+        # Trie: transitions per node, failure links, pattern ids ending at node
+        self._goto = [{}]  # type: List[Dict[str, int]]
+        self._fail = [0]
+        self._out = [[]]  # type: List[List[int]]
+
+        seen = set()
+        for entity in entities:
+            if not entity or entity in seen:
+                continue
+            seen.add(entity)
+            self._add(entity)
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def _add(self, entity: str) -> None:
+        pattern_id = len(self.entities)
+        self.entities.append(entity)
+        self._lengths.append(len(entity))
+
+        node = 0
+        for c in fold_case(entity):
+            nxt = self._goto[node].get(c)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][c] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pattern_id)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for c, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(c, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit matches that end here via the suffix link
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find every word-bounded occurrence of every entity.
+
+        Occurrences may overlap. Returned in order of end position.
+        """
+        if not self.entities or not text:
+            return []
+
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        folded = fold_case(text)
+        matches = []
+        node = 0
+        for i, c in enumerate(folded):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            if out[node]:
+                end = i + 1
+                for pattern_id in out[node]:
+                    start = end - lengths[pattern_id]
+                    if is_word_boundary(text, start) and is_word_boundary(text, end):
+                        matches.append((start, end, self.entities[pattern_id]))
+        return matches
+
+    def entities_in(self, text: str) -> Set[str]:
+        """Entities with at least one word-bounded occurrence in text."""
+        return {entity for _, _, entity in self.find_all(text)}
@@ -0,0 +1,219 @@
+"""
+Entity Table
+
+Compact binary form of the wikilink entity cache (.claude/wikilink-entities.bin),
+written next to wikilink-entities.json. wikilink-auto.py maps it with mmap
+and answers lookups by binary search, so an edit no longer parses the JSON
+and builds a set (or an automaton) over every entity first.
+
+Layout (little-endian), version FORMAT_VERSION:
+    header      MAGIC, version, entity count, longest key (code points),
+                size of the category block
+    categories  per category: length byte + UTF-8 name; its index is its bit
+    entries     count x ENTRY (key offset, key length, name length, flags),
+                sorted by key
+    pool        per entity: UTF-8 key, then the UTF-8 name unless it equals
+                the key (name length 0)
+
+The key is the name case-folded with entity_matcher.fold_case, so UTF-8
+byte order of the keys is the order binary search needs and a folded
+text slice is looked up directly. flags holds one bit per category the
+name is in, plus MIXED_CASE for names with upper and lower case letters.
+
+Usage:
+    table = EntityTable.load(path)
+    'Sarah Chen' in table
+    table.find_all(text, MIXED_CASE)   # [(start, end, name), ...]
+"""
+
+import mmap
+import re
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from lib.entity_matcher import fold_case
+
+MAGIC = b'FWET'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<4sHxxIII')
+ENTRY = struct.Struct('<IHHH')
+
+# flags: bits 0..MAX_CATEGORIES-1 are categories
+MAX_CATEGORIES = 15
+MIXED_CASE = 1 << 15
+
+# Probe results kept per table (words recur across notes in batch runs and
+# the hook server); cleared when this many slices are cached
+PROBE_CACHE_SIZE = 200_000
+
+# Same boundary rule EntityMatcher applies (re's \b)
+_BOUNDARY_RE = re.compile(r'\b')
+
+
+def is_mixed_case(name: str) -> bool:
+    return any(c.isupper() for c in name) and any(c.islower() for c in name)
+
+
+def encode_entity_table(cache: dict) -> bytes:
+    """Binary table for an entity cache dict ({category: [names], '_metadata': ...})."""
+    categories = sorted(k for k, v in cache.items() if k != '_metadata' and isinstance(v, list))
+    if len(categories) > MAX_CATEGORIES:
+        raise ValueError(f"Too many entity categories ({len(categories)})")
+
+    flags_by_name = {}  # type: Dict[str, int]
+    for bit, category in enumerate(categories):
+        for name in cache[category]:
+            if isinstance(name, str) and name:
+                flags_by_name[name] = flags_by_name.get(name, 0) | (1 << bit)
+
+    records = []
+    for name, flags in flags_by_name.items():
+        key, raw = fold_case(name).encode('utf-8'), name.encode('utf-8')
+        if len(raw) > 0xFFFF:
+            continue
+        records.append((key, raw, flags | (MIXED_CASE if is_mixed_case(name) else 0)))
+    records.sort()
+
+    category_block = bytearray()
+    for category in categories:
+        encoded = category.encode('utf-8')[:255]
+        category_block += bytes([len(encoded)]) + encoded
+
+    entries, pool = bytearray(), bytearray()
+    for key, raw, flags in records:
+        name = b'' if raw == key else raw
+        entries += ENTRY.pack(len(pool), len(key), len(name), flags)
+        pool += key + name
+
+    max_key = max((len(name) for name in flags_by_name), default=0)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(records), max_key, len(category_block))
+    return b''.join((header, category_block, entries, pool))
+
+
+class EntityTable:
+    """Read-only view of an encoded entity table (bytes or an mmap)."""
+
+    def __init__(self, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Entity table is truncated")
+        magic, version, count, max_key, categories_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not an entity table of this version")
+
+        self._data = data
+        self._probes = {}
+        self._count = count
+        self.max_key_length = max_key
+        self._entries = HEADER.size + categories_size
+        self._pool = self._entries + count * ENTRY.size
+        if self._pool > len(data):
+            raise ValueError("Entity table is truncated")
+
+        self.categories = []  # type: List[str]
+        offset = HEADER.size
+        while offset < self._entries:
+            size = data[offset]
+            self.categories.append(bytes(data[offset + 1:offset + 1 + size]).decode('utf-8'))
+            offset += 1 + size
+
+    @classmethod
+    def load(cls, path: Path) -> 'EntityTable':
+        """Map a table file. Raises OSError or ValueError if it can't be used."""
+        with open(path, 'rb') as f:
+            if sys.platform == 'win32':
+                # A mapped file can't be replaced on Windows; the next rebuild must be able to
+                return cls(f.read())
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_cache(cls, cache: dict) -> 'EntityTable':
+        return cls(encode_entity_table(cache))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key(self, index: int) -> bytes:
+        offset, key_len, _, _ = ENTRY.unpack_from(self._data, self._entries + index * ENTRY.size)
+        start = self._pool + offset
+        return self._data[start:start + key_len]
+
+    def _name(self, index: int) -> Tuple[str, int]:
+        offset, key_len, name_len, flags = ENTRY.unpack_from(self._data, self._entries + index * ENTRY.size)
+        start = self._pool + offset + (key_len if name_len else 0)
+        return self._data[start:start + (name_len or key_len)].decode('utf-8'), flags
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _probe(self, key: bytes) -> Tuple[bool, List[Tuple[str, int]]]:
+        """(a longer key starts with key, [(name, flags)] whose key equals it)."""
+        index = self._lower_bound(key)
+        exact = []
+        while index < self._count:
+            found = self._key(index)
+            if found != key:
+                return found.startswith(key), exact
+            exact.append(self._name(index))
+            index += 1
+        return False, exact
+
+    def lookup(self, name: str) -> List[Tuple[str, int]]:
+        """[(name, flags)] for every entity that case-folds like name."""
+        return self._probe(fold_case(name).encode('utf-8'))[1]
+
+    def __contains__(self, name) -> bool:
+        return isinstance(name, str) and any(found == name for found, _ in self.lookup(name))
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._name(index)[0]
+
+    def find_all(self, text: str, flags: int = 0) -> List[Tuple[int, int, str]]:
+        """
+        Every word-bounded, case-insensitive occurrence in text of an entity
+        having all of flags set, as EntityMatcher.find_all would report it
+        (ordered by start rather than end).
+
+        From each word boundary the slice is extended boundary by boundary
+        while some key starts with it; probes are memoized per slice, so
+        repeated words cost a dict lookup.
+        """
+        if not self._count or not text:
+            return []
+
+        folded = fold_case(text)
+        bounds = [m.start() for m in _BOUNDARY_RE.finditer(text)]
+        max_key = self.max_key_length
+        memo = self._probes
+        if len(memo) > PROBE_CACHE_SIZE:
+            memo.clear()
+        matches = []
+        for i, start in enumerate(bounds):
+            for j in range(i + 1, len(bounds)):
+                end = bounds[j]
+                if end - start > max_key:
+                    break
+                piece = folded[start:end]
+                probe = memo.get(piece)
+                if probe is None:
+                    probe = memo[piece] = self._probe(piece.encode('utf-8'))
+                longer, exact = probe
+                for name, name_flags in exact:
+                    if name_flags & flags == flags:
+                        matches.append((start, end, name))
+                if not longer:
+                    break
+        return matches
+
+    def entities_in(self, text: str, flags: int = 0) -> set:
+        return {name for _, _, name in self.find_all(text, flags)}
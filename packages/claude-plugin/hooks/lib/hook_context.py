@@ -0,0 +1,243 @@
+"""
+Shared Hook Context
+
+Per-event state shared by the PostToolUse Edit/Write hook stages:
+- verify-mutation.py, syntax-validate.py, wikilink-auto.py,
+  frontmatter-auto.py, achievement-detect.py
+
+Each stage exposes `process(ctx)` and works against a HookContext instead of
+parsing stdin, reading the file and loading config itself. This lets
+post-mutation.py run every stage in one interpreter:
+- stdin parsed once
+- edited file read once, written back at most once
+- note parsed once per content version (ctx.document)
+- for Edit, the changed region located once per content version
+  (ctx.edit_region; None means analyze the whole note)
+- vault root and config resolved once
+- stage output buffered and emitted together
+
+Each stage script still runs standalone through run_standalone().
+
+Stages that already processed the note's current content are skipped
+(see lib/content_digest.py).
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Sequence, Tuple
+
+# Plugin root on path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from lib.content_digest import ContentDigests, content_digest
+from lib.hook_timing import current as current_timer, timed_hook
+
+
+class HookContext:
+    """State for a single Edit/Write event, shared across hook stages."""
+
+    def __init__(self, hook_input: dict):
+        self.hook_input = hook_input
+        self.tool_name = hook_input.get('tool_name', '')
+        self.tool_input = hook_input.get('tool_input', {}) or {}
+        self.file_path = self.tool_input.get('file_path', '') or ''
+        self.path = Path(self.file_path) if self.file_path else None
+
+        self.stdout = []
+        self.stderr = []
+
+        self._exists = None
+        self._content = None
+        self._original_content = None
+        self._vault_path = None
+        self._config = None
+        self._edit_region = (None, None)  # (content, region)
+
+    @property
+    def exists(self) -> bool:
+        """Whether the edited file exists (checked once)."""
+        if self._exists is None:
+            self._exists = self.path is not None and self.path.exists()
+        return self._exists
+
+    @property
+    def content(self) -> str:
+        """Current file content, including changes made by earlier stages."""
+        if self._content is None:
+            with current_timer().stage('read'):
+                self._content = self.path.read_text(encoding='utf-8')
+            self._original_content = self._content
+        return self._content
+
+    @content.setter
+    def content(self, value: str) -> None:
+        if self._content is None:
+            self.content  # Load original so write_back can compare
+        self._content = value
+
+    @property
+    def document(self) -> 'MarkdownDocument':
+        """Parse of the current content, shared by every stage that reads it."""
+        from lib.markdown_document import parse_document
+        return parse_document(self.content)
+
+    @property
+    def edit_region(self) -> Optional['EditRegion']:
+        """Region of the current content an Edit changed (plus margin), or None."""
+        if self.tool_name != 'Edit':
+            return None
+        content = self.content
+        if self._edit_region[0] is not content:
+            from lib.edit_region import locate_edit_region
+            region = locate_edit_region(content, self.tool_input, zones=self.document.zones())
+            self._edit_region = (content, region)
+        return self._edit_region[1]
+
+    @property
+    def modified(self) -> bool:
+        """True if a stage changed the content since it was read."""
+        return self._content is not None and self._content != self._original_content
+
+    def write_back(self) -> bool:
+        """Write modified content to disk. Returns True if a write happened."""
+        if not self.modified:
+            return False
+        with current_timer().stage('write_back'):
+            self.path.write_text(self._content, encoding='utf-8')
+        self._original_content = self._content
+        return True
+
+    @property
+    def vault_path(self) -> Path:
+        """Vault root for the edited file."""
+        if self._vault_path is None:
+            from config.loader import find_vault_root
+            with current_timer().stage('vault_root'):
+                self._vault_path = find_vault_root(self.path) if self.path else find_vault_root()
+        return self._vault_path
+
+    @property
+    def config(self) -> Mapping:
+        """Merged flywheel config for the vault (read-only view)."""
+        if self._config is None:
+            from config.loader import get_config
+            vault_path = self.vault_path
+            with current_timer().stage('config'):
+                self._config = get_config(vault_path).load()
+        return self._config
+
+    def print(self, *args, file=None, sep: str = ' ', end: str = '\n') -> None:
+        """Buffer output; stderr when file=sys.stderr, stdout otherwise."""
+        target = self.stderr if file is sys.stderr else self.stdout
+        target.append(sep.join(str(a) for a in args) + end)
+
+    def flush(self) -> None:
+        """Emit buffered output."""
+        if self.stdout:
+            sys.stdout.write(''.join(self.stdout))
+            sys.stdout.flush()
+        if self.stderr:
+            sys.stderr.write(''.join(self.stderr))
+            sys.stderr.flush()
+        self.stdout = []
+        self.stderr = []
+
+
+def run_stage(ctx: HookContext, process: Callable[[HookContext], None], label: str) -> bool:
+    """Run one hook stage, reporting errors without stopping later stages."""
+    try:
+        process(ctx)
+        return True
+    except FileNotFoundError as e:
+        ctx.print(f"[flywheel] {label}: File not found - {e.filename}", file=sys.stderr)
+    except PermissionError as e:
+        ctx.print(f"[flywheel] {label}: Permission denied - {e.filename}", file=sys.stderr)
+    except Exception as e:
+        ctx.print(f"[flywheel] {label} error: {type(e).__name__}: {e}", file=sys.stderr)
+    return False
+
+
+def write_back(ctx: HookContext, label: str) -> bool:
+    """Write the shared content back once, reporting failures like a stage."""
+    return run_stage(ctx, lambda c: c.write_back(), label)
+
+
+def _whole_note_in_view(ctx: HookContext) -> bool:
+    """True unless the stages look at only part of the note (an Edit's region)."""
+    try:
+        region = ctx.edit_region
+    except Exception:
+        return False
+    return region is None or (region.start == 0 and region.end >= len(ctx.content))
+
+
+def run_stages(ctx: HookContext, stages: Sequence[Tuple[Callable[[HookContext], None], str]],
+               label: str) -> None:
+    """
+    Run (process, label) stages in order and write back once.
+
+    A stage is skipped if it already processed the note's current content,
+    and recorded only for content it ran on and left unchanged. On an Edit
+    that is only the case when the edit region spans the whole note: stages
+    that saw the region have not processed the rest.
+    """
+    timer = current_timer()
+    try:
+        digests = ContentDigests.for_context(ctx)
+        if digests:
+            content = ctx.content
+            with timer.stage('digest'):
+                digest = content_digest(content)
+    except Exception:
+        digests = None  # Unreadable note: let the stages report it
+
+    for process, stage_label in stages:
+        # Timed under the stage script's name, e.g. 'wikilink-auto'
+        stage_name = Path(process.__code__.co_filename).stem
+        if digests is None:
+            with timer.stage(stage_name):
+                run_stage(ctx, process, stage_label)
+            continue
+
+        version = digests.version(process)
+        if digests.processed(stage_label, version, digest):
+            timer.count('stages_skipped')
+            continue
+        before = ctx.content
+        with timer.stage(stage_name):
+            ok = run_stage(ctx, process, stage_label)
+        if not ok:
+            continue
+        if ctx.content == before:
+            if _whole_note_in_view(ctx):
+                digests.record(stage_label, version, digest)
+        else:
+            # Earlier stages have not seen this content; they run on it next time
+            digest = content_digest(ctx.content)
+
+    if write_back(ctx, label) and digests is not None:
+        digests.save()
+
+
+def read_hook_input() -> Optional[dict]:
+    """Parse hook JSON from stdin. Returns None on invalid input."""
+    try:
+        with current_timer().stage('stdin'):
+            hook_input = json.load(sys.stdin)
+    except json.JSONDecodeError:
+        return None
+    return hook_input if isinstance(hook_input, dict) else None
+
+
+def run_standalone(process: Callable[[HookContext], None], label: str) -> None:
+    """Entry point for a stage script invoked directly as a hook."""
+    with timed_hook(Path(process.__code__.co_filename).stem):
+        hook_input = read_hook_input()
+        if hook_input is None:
+            sys.exit(0)
+
+        ctx = HookContext(hook_input)
+        run_stages(ctx, [(process, label)], label)
+        ctx.flush()
+    sys.exit(0)
@@ -0,0 +1,44 @@
+"""
+Hook Module Loader
+
+Hook scripts use hyphenated file names (wikilink-auto.py) so they cannot be
+imported with a normal import statement. This loads them by path so the
+dispatcher and CLIs can call their functions in-process.
+
+Usage:
+    from lib.hook_loader import load_hook
+    wikilink_auto = load_hook('wikilink-auto')
+    wikilink_auto.process(ctx)
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+
+_loaded = {}
+
+
+def load_hook(name: str):
+    """Import hooks/<name>.py as a module (cached per process)."""
+    if name in _loaded:
+        return _loaded[name]
+
+    hook_path = HOOKS_DIR / f'{name}.py'
+    module_name = 'flywheel_hook_' + name.replace('-', '_')
+
+    spec = importlib.util.spec_from_file_location(module_name, hook_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load hook: {hook_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+
+    _loaded[name] = module
+    return module
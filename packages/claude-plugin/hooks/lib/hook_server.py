@@ -0,0 +1,293 @@
+"""
+Hook Server Protocol
+
+Shared by hook-server.py (long-lived server) and hook-client.py (per-call
+shim). The server keeps hook modules imported so each hook call skips
+interpreter startup, imports, regex compilation and config/cache loading.
+
+Protocol (one request per connection, over a local Unix socket):
+    client -> server: {"hook": name, "input": {...}, "cwd": ..., "env": {...}}
+    server -> client: {"stdout": ..., "stderr": ..., "exit_code": 0}
+
+The client must stay cheap: only os/sys/json/socket are imported at module
+level. Server-only imports happen inside the functions that need them.
+"""
+
+import json
+import os
+import socket
+import sys
+
+# Hooks the server will run. Anything else falls back to a normal subprocess.
+SERVED_HOOKS = ('pre-mutation-gate', 'read-cache', 'post-mutation')
+
+# Environment passed through per request (hooks read these at call time)
+FORWARDED_ENV = ('PROJECT_PATH', 'CLAUDE_PROJECT_DIR', 'FLYWHEEL_HOOK_TIMING')
+
+# Seconds without a request before the server exits
+IDLE_TIMEOUT = 30 * 60
+
+# Seconds the client waits for a response once the request is sent
+RESPONSE_TIMEOUT = 4.0
+
+# Hooks that answer in milliseconds: a slower answer means the server is busy
+# with another call (it serves one at a time), so the client stops waiting sooner
+RESPONSE_TIMEOUTS = {'pre-mutation-gate': 1.0, 'read-cache': 1.0}
+
+# Hooks the client runs in-process when the server accepted a call but did not
+# answer. The server may still run them too, which is harmless: the gate only
+# reads, and read-cache's duplicate journal line is folded away. post-mutation
+# is not re-run, as two runs could write the same note at once.
+RERUN_ON_TIMEOUT = ('pre-mutation-gate', 'read-cache')
+
+# AF_UNIX path limit is ~104-108 bytes depending on platform
+MAX_SOCKET_PATH = 100
+
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def state_dir() -> str:
+    """State directory shared with the Gate 1 caches."""
+    return os.environ.get('CLAUDE_LOCAL_STATE_DIR') or os.path.join(os.path.expanduser('~'), '.claude')
+
+
+def socket_path() -> str:
+    """Socket path for this state directory."""
+    path = os.path.join(state_dir(), 'flywheel-hooks.sock')
+    if len(path) > MAX_SOCKET_PATH:
+        import tempfile
+        import zlib
+        digest = zlib.crc32(path.encode('utf-8'))
+        path = os.path.join(tempfile.gettempdir(), f'flywheel-hooks-{digest:08x}.sock')
+    return path
+
+
+def pid_path() -> str:
+    return socket_path() + '.pid'
+
+
+def is_supported() -> bool:
+    """Unix sockets are unavailable on some platforms (e.g. older Windows Pythons)."""
+    return hasattr(socket, 'AF_UNIX')
+
+
+def _recv_all(conn) -> bytes:
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def send_request(request: dict, timeout: float = RESPONSE_TIMEOUT):
+    """
+    Send a request to the running server.
+
+    Returns:
+        Response dict, or None if no server is listening (caller falls back).
+
+    Raises:
+        socket.timeout if the server accepted the request but did not answer.
+    """
+    if not is_supported():
+        return None
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(timeout)
+        try:
+            conn.connect(socket_path())
+        except (FileNotFoundError, ConnectionRefusedError, OSError):
+            return None
+        conn.sendall(json.dumps(request).encode('utf-8'))
+        conn.shutdown(socket.SHUT_WR)
+        data = _recv_all(conn)
+    finally:
+        conn.close()
+
+    if not data:
+        return None
+    try:
+        return json.loads(data.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def response_timeout(hook: str) -> float:
+    return RESPONSE_TIMEOUTS.get(hook, RESPONSE_TIMEOUT)
+
+
+def make_request(hook: str, raw_input: str) -> dict:
+    """Build a request for the current process environment."""
+    try:
+        hook_input = json.loads(raw_input) if raw_input.strip() else None
+    except json.JSONDecodeError:
+        hook_input = None
+    return {
+        'hook': hook,
+        'input': hook_input,
+        'cwd': os.getcwd(),
+        'env': {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ},
+    }
+
+
+def run_hook_main(hook: str, raw_input: str, served: bool = False) -> dict:
+    """
+    Run a hook script's main() in this process with captured stdio.
+
+    Used by the server for every request and by the client as its fallback.
+    """
+    import io
+    if HOOKS_DIR not in sys.path:
+        sys.path.insert(0, HOOKS_DIR)
+    from lib.hook_loader import load_hook
+    from lib.hook_timing import timed_hook
+
+    module = load_hook(hook)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(raw_input), stdout, stderr
+    exit_code = 0
+    try:
+        with timed_hook(hook, served=served):
+            module.main()
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        stderr.write(f"[flywheel] Hook server: {hook} error: {type(e).__name__}: {e}\n")
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit_code': exit_code}
+
+
+def _warm_up() -> None:
+    if HOOKS_DIR not in sys.path:
+        sys.path.insert(0, HOOKS_DIR)
+    from lib.hook_loader import load_hook
+
+    for hook in SERVED_HOOKS:
+        module = load_hook(hook)
+        for stage in getattr(module, 'STAGES', ()):
+            load_hook(stage)
+
+
+def _handle(request: dict) -> dict:
+    """Run one request with the caller's cwd and environment applied."""
+    hook = request.get('hook')
+    if hook not in SERVED_HOOKS:
+        return {'stdout': '', 'stderr': f"[flywheel] Hook server: unknown hook {hook}\n", 'exit_code': 0}
+
+    raw_input = json.dumps(request['input']) if request.get('input') is not None else ''
+    saved_cwd = os.getcwd()
+    saved_env = {k: os.environ.get(k) for k in FORWARDED_ENV}
+    try:
+        cwd = request.get('cwd')
+        if cwd and os.path.isdir(cwd):
+            os.chdir(cwd)
+        env = request.get('env') or {}
+        for key in FORWARDED_ENV:
+            if key in env:
+                os.environ[key] = env[key]
+            else:
+                os.environ.pop(key, None)
+        return run_hook_main(hook, raw_input, served=True)
+    finally:
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def serve(idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """
+    Serve hook requests until shutdown or idle timeout.
+
+    Requests are handled one at a time: hooks redirect stdio and read
+    process-wide state, so they must not overlap.
+    """
+    path = socket_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        if send_request({'command': 'ping'}, timeout=1.0):
+            return  # Another server already owns the socket
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+
+    with open(pid_path(), 'w', encoding='utf-8') as f:
+        f.write(str(os.getpid()))
+
+    # Import hooks (and dispatcher stages) up front so the first call is fast too
+    try:
+        _warm_up()
+    except Exception:
+        pass
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break  # Idle - session is over
+
+            with conn:
+                try:
+                    conn.settimeout(RESPONSE_TIMEOUT)
+                    request = json.loads(_recv_all(conn).decode('utf-8') or '{}')
+                except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+                    continue
+
+                if request.get('command') == 'shutdown':
+                    conn.sendall(json.dumps({'status': 'stopping'}).encode('utf-8'))
+                    break
+                if request.get('command') == 'ping':
+                    conn.sendall(json.dumps({'status': 'ok', 'pid': os.getpid()}).encode('utf-8'))
+                    continue
+
+                response = _handle(request)
+                try:
+                    conn.sendall(json.dumps(response).encode('utf-8'))
+                except OSError:
+                    pass
+    finally:
+        server.close()
+        for stale in (path, pid_path()):
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass
+
+
+def start_background() -> bool:
+    """Start hook-server.py serve detached from the caller."""
+    if not is_supported():
+        return False
+    import subprocess
+    kwargs = {}
+    if sys.platform != 'win32':
+        kwargs['start_new_session'] = True
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.join(HOOKS_DIR, 'hook-server.py'), 'serve'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **kwargs
+        )
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,191 @@
+"""
+Hook Timing
+
+Opt-in latency instrumentation for the flywheel hooks. Set
+FLYWHEEL_HOOK_TIMING=1 and every hook call appends one JSON record to
+<state dir>/flywheel-hook-timing.jsonl:
+
+    {"ts": 1767225600.0, "hook": "post-mutation", "served": true,
+     "total_ms": 12.4,
+     "stages": {"stdin": 0.1, "read": 0.2, "wikilink-auto": 6.1, ...},
+     "counts": {"entities": 1840, "regex_passes": 2, ...}}
+
+Hooks mark their phases with `current().stage(name)` and tally work with
+`current().count(name, n)`. With timing off, current() is a no-op timer,
+so the hooks need no checks of their own. Stages that trigger lazy loads
+(config, vault root) include that time too.
+
+The log rotates to .1 at MAX_LOG_BYTES. `hook-timing.py summary` prints
+p50/p95/p99 per hook and stage.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+TIMING_ENV = 'FLYWHEEL_HOOK_TIMING'
+
+LOG_FILE = 'flywheel-hook-timing.jsonl'
+
+# Rotate the log once it reaches this size (one previous file is kept)
+MAX_LOG_BYTES = 2 * 1024 * 1024
+
+
+def enabled() -> bool:
+    return os.environ.get(TIMING_ENV) == '1'
+
+
+def log_path() -> Path:
+    """Timing log, next to the Gate 1 caches."""
+    state_dir = os.environ.get('CLAUDE_LOCAL_STATE_DIR') or os.path.join(os.path.expanduser('~'), '.claude')
+    return Path(state_dir) / LOG_FILE
+
+
+class HookTimer:
+    """Wall time per stage and work counts for one hook call."""
+
+    def __init__(self, hook: str):
+        self.hook = hook
+        self.started = time.perf_counter()
+        self.stages = {}  # type: Dict[str, float]
+        self.counts = {}  # type: Dict[str, int]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def record(self, **fields) -> dict:
+        return dict(
+            ts=round(time.time(), 3),
+            hook=self.hook,
+            **fields,
+            total_ms=round((time.perf_counter() - self.started) * 1000, 3),
+            stages={k: round(v, 3) for k, v in self.stages.items()},
+            counts=self.counts,
+        )
+
+
+class _NullTimer:
+    """Timer used while timing is off: every call is a no-op."""
+
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+_current = NULL_TIMER
+
+
+def current():
+    """Timer for the hook call in progress (a no-op timer if timing is off)."""
+    return _current
+
+
+@contextmanager
+def timed_hook(hook: str, **fields) -> Iterator[object]:
+    """
+    Time one hook call and append its record when it ends, including via
+    sys.exit(). Extra fields are stored in the record. Nested calls share
+    the outer timer and record.
+    """
+    global _current
+    if _current is not NULL_TIMER or not enabled():
+        yield _current
+        return
+
+    previous, timer = _current, HookTimer(hook)
+    _current = timer
+    try:
+        yield timer
+    finally:
+        _current = previous
+        append_record(timer.record(**fields))
+
+
+def append_record(record: dict) -> None:
+    """Append one record (single O_APPEND write), rotating a full log first."""
+    path = log_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size >= MAX_LOG_BYTES:
+            os.replace(path, path.with_name(path.name + '.1'))
+        fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8'))
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # Timing must never break a hook
+
+
+def load_records(path: Path = None) -> List[dict]:
+    """Records from the rotated and current logs, oldest first."""
+    path = path or log_path()
+    records = []
+    for part in (path.with_name(path.name + '.1'), path):
+        try:
+            lines = part.read_text(encoding='utf-8').splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a concurrent append
+            if isinstance(record, dict) and 'hook' in record:
+                records.append(record)
+    return records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(records: List[dict]) -> Dict[str, dict]:
+    """
+    Per hook: call count, p50/p95/p99 of total and of each stage (over the
+    calls that ran it), and mean counts.
+    """
+    by_hook = {}
+    for record in records:
+        by_hook.setdefault(record['hook'], []).append(record)
+
+    summary = {}
+    for hook, calls in sorted(by_hook.items()):
+        stage_values, count_values = {}, {}
+        for call in calls:
+            for name, ms in (call.get('stages') or {}).items():
+                stage_values.setdefault(name, []).append(ms)
+            for name, n in (call.get('counts') or {}).items():
+                count_values.setdefault(name, []).append(n)
+
+        totals = [call.get('total_ms', 0.0) for call in calls]
+        summary[hook] = {
+            'calls': len(calls),
+            'total': {p: percentile(totals, p) for p in (50, 95, 99)},
+            'stages': {
+                name: {p: percentile(values, p) for p in (50, 95, 99)}
+                for name, values in stage_values.items()
+            },
+            'counts': {name: sum(values) / len(calls) for name, values in count_values.items()},
+        }
+    return summary
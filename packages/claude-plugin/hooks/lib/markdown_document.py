@@ -0,0 +1,235 @@
+"""
+Markdown Document
+
+One parse of a note shared by every hook analysis: frontmatter span and
+fields, protected zones (code, links, ...), wikilinks, markdown links,
+headings and sections, with line/column and byte offsets on demand.
+
+Each part is computed on first use and kept, so a stage pays only for
+what it reads and later stages reuse it. parse_document() keeps recent
+documents keyed by content, so every stage handed the same text gets the
+same document; a stage that changes the text gets a fresh one.
+
+Used by:
+- hook_context.py      : ctx.document for the edited note
+- frontmatter-auto.py  : frontmatter fields
+- verify-mutation.py   : frontmatter span and text
+- syntax-validate.py   : code zones
+- wikilink-auto.py     : protected zones
+
+Usage:
+    doc = parse_document(content)
+    doc.fields                 # {'type': 'person', ...}
+    doc.zones(CODE_KINDS)      # private ZoneIndex copy (safe to shift/add)
+    doc.wikilinks              # [Link(start, end, target), ...]
+    doc.line_col(offset)       # (line, column), both 1-based
+"""
+
+import bisect
+import json
+import re
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from lib.protected_zones import ALL_KINDS, ZoneIndex, find_frontmatter_end, scan_protected_zones
+
+# Documents kept by parse_document()
+MAX_CACHED_DOCUMENTS = 8
+
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$', re.MULTILINE)
+
+
+class Link(NamedTuple):
+    start: int
+    end: int
+    target: str
+
+
+class Heading(NamedTuple):
+    start: int
+    level: int
+    text: str
+
+
+class Section(NamedTuple):
+    heading: Heading
+    end: int  # Start of the next heading of the same or a higher level
+
+
+def parse_field_value(value: str):
+    """Value of a simple `key: value` frontmatter line (quotes, arrays, booleans, numbers)."""
+    # Handle quoted strings
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1]
+    if value.startswith("'") and value.endswith("'"):
+        return value[1:-1]
+    # Handle arrays (basic)
+    if value.startswith('['):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    # Handle booleans
+    if value.lower() in ('true', 'false'):
+        return value.lower() == 'true'
+    # Handle numbers
+    if value.isdigit():
+        return int(value)
+    if value.replace('.', '').isdigit():
+        return float(value)
+    return value
+
+
+class MarkdownDocument:
+    """Lazily parsed view of one note's content."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self._zones = {}  # type: Dict[Tuple[str, ...], ZoneIndex]
+
+    # Frontmatter
+
+    @cached_property
+    def frontmatter_end(self) -> int:
+        """Offset just past the closing --- line, or 0 without (closed) frontmatter."""
+        return find_frontmatter_end(self.content)
+
+    @property
+    def has_frontmatter(self) -> bool:
+        return self.frontmatter_end > 0
+
+    @property
+    def frontmatter_unclosed(self) -> bool:
+        """Opened with --- but never closed."""
+        return self.content.startswith('---') and not self.has_frontmatter
+
+    @cached_property
+    def frontmatter_lines(self) -> List[str]:
+        """Lines between the --- delimiters."""
+        if not self.has_frontmatter:
+            return []
+        first = self.content.find('\n') + 1
+        closing = self.content.rfind('\n', 0, self.frontmatter_end - 1) + 1
+        return self.content[first:closing].split('\n')[:-1]
+
+    @property
+    def frontmatter_text(self) -> str:
+        return '\n'.join(self.frontmatter_lines)
+
+    @cached_property
+    def fields(self) -> dict:
+        """Simple `key: value` frontmatter fields (not a full YAML parse)."""
+        fields = {}
+        for line in self.frontmatter_lines:
+            if ':' in line:
+                key, _, value = line.partition(':')
+                key = key.strip()
+                if key:
+                    fields[key] = parse_field_value(value.strip())
+        return fields
+
+    @property
+    def body(self) -> str:
+        """Content after the frontmatter."""
+        return self.content[self.frontmatter_end:]
+
+    # Zones and links
+
+    def _scan(self, kinds: Sequence[str]) -> ZoneIndex:
+        key = tuple(kinds)
+        zones = self._zones.get(key)
+        if zones is None:
+            zones = self._zones[key] = scan_protected_zones(self.content, key)
+        return zones
+
+    def zones(self, kinds: Sequence[str] = ALL_KINDS) -> ZoneIndex:
+        """Protected zones of the given kinds; a copy the caller may modify."""
+        return self._scan(kinds).copy()
+
+    def _links(self, kind: str, target_re) -> List[Link]:
+        links = []
+        for start, end, zone_kind in self._scan(ALL_KINDS):
+            if zone_kind == kind:
+                match = target_re.match(self.content, start, end)
+                links.append(Link(start, end, match.group(1).strip() if match else ''))
+        return links
+
+    @cached_property
+    def wikilinks(self) -> List[Link]:
+        """[[target|alias]] links outside code, with target (no #heading or alias)."""
+        return self._links('wikilink', re.compile(r'\[\[([^\]|#]*)'))
+
+    @cached_property
+    def markdown_links(self) -> List[Link]:
+        """[text](target) links outside code."""
+        return self._links('markdown_link', re.compile(r'\[[^\]]+\]\(([^\)]+)\)'))
+
+    # Headings and sections
+
+    @cached_property
+    def headings(self) -> List[Heading]:
+        """ATX headings outside frontmatter and code."""
+        code = self._scan(('frontmatter', 'fenced_code'))
+        return [
+            Heading(match.start(), len(match.group(1)), match.group(2))
+            for match in _HEADING_RE.finditer(self.content, self.frontmatter_end)
+            if not code.contains(match.start())
+        ]
+
+    @cached_property
+    def sections(self) -> List[Section]:
+        sections = []
+        headings = self.headings
+        for i, heading in enumerate(headings):
+            end = len(self.content)
+            for later in headings[i + 1:]:
+                if later.level <= heading.level:
+                    end = later.start
+                    break
+            sections.append(Section(heading, end))
+        return sections
+
+    def section(self, text: str) -> Optional[Section]:
+        """First section whose heading text matches (case-insensitive)."""
+        wanted = text.strip().lower()
+        for section in self.sections:
+            if section.heading.text.strip().lower() == wanted:
+                return section
+        return None
+
+    # Offsets
+
+    @cached_property
+    def line_starts(self) -> List[int]:
+        starts = [0]
+        find = self.content.find
+        position = find('\n')
+        while position != -1:
+            starts.append(position + 1)
+            position = find('\n', position + 1)
+        return starts
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        """1-based line and column of a character offset."""
+        line = bisect.bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def byte_offset(self, offset: int) -> int:
+        """UTF-8 byte offset of a character offset."""
+        return len(self.content[:offset].encode('utf-8'))
+
+
+_cache = OrderedDict()  # type: OrderedDict[str, MarkdownDocument]
+
+
+def parse_document(content: str) -> MarkdownDocument:
+    """Document for content, shared with earlier callers passing the same text."""
+    document = _cache.get(content)
+    if document is not None:
+        _cache.move_to_end(content)
+        return document
+    document = _cache[content] = MarkdownDocument(content)
+    while len(_cache) > MAX_CACHED_DOCUMENTS:
+        _cache.popitem(last=False)
+    return document
@@ -0,0 +1,216 @@
+"""
+Protected Zones
+
+One tokenizer pass over a markdown document that finds the regions mutating
+hooks must never touch (frontmatter, code, links, URLs, tags, comments,
+math), stored as a sorted, non-overlapping index with O(log n) lookups.
+
+Used by:
+- wikilink-auto.py   : never link inside a protected zone
+- syntax-validate.py : never "fix" anything inside code
+
+Usage:
+    zones = scan_protected_zones(content)
+    zones.overlaps(start, end)        # does [start, end) touch a zone?
+    zones.add(start, end, 'wikilink') # protect a span created by an edit
+    zones.shift(edits)                # keep offsets valid after edits
+    zones.strip(content)              # content with every zone removed
+"""
+
+import bisect
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# Zone patterns, in priority order for tokens starting at the same offset
+# (``` before `, [[ before [, $$ before $)
+ZONE_PATTERNS = (
+    ('fenced_code', r'```[\s\S]*?```'),
+    ('inline_code', r'`[^`]+`'),
+    ('wikilink', r'\[\[[^\]]+\]\]'),
+    ('markdown_link', r'\[[^\]]+\]\([^\)]+\)'),
+    ('url', r'https?://[^\s\)\]]+(?:\([^\)]+\))?[^\s\)\]]*'),
+    ('hashtag', r'#[\w-]+'),
+    ('html_tag', r'<[^>]+>'),
+    ('comment', r'%%[\s\S]*?%%'),
+    ('math', r'\$\$[\s\S]*?\$\$|\$[^\$]+\$'),
+)
+
+ALL_KINDS = ('frontmatter',) + tuple(kind for kind, _ in ZONE_PATTERNS)
+
+# Regions syntax fixes must leave alone
+CODE_KINDS = ('fenced_code', 'inline_code')
+
+# An edit replaces content[start:end] with replacement
+Edit = Tuple[int, int, str]
+
+_tokenizers = {}
+
+
+def _tokenizer(kinds: Sequence[str]):
+    """Compiled alternation over the requested zone kinds (cached)."""
+    key = tuple(kinds)
+    pattern = _tokenizers.get(key)
+    if pattern is None:
+        alternatives = [
+            f'(?P<{kind}>{regex})' for kind, regex in ZONE_PATTERNS if kind in key
+        ]
+        pattern = re.compile('|'.join(alternatives)) if alternatives else None
+        _tokenizers[key] = pattern
+    return pattern
+
+
+def find_frontmatter_end(content: str) -> int:
+    """Find where YAML frontmatter ends. Returns 0 if no frontmatter."""
+    if not content.startswith('---'):
+        return 0
+
+    # The closing --- must be on its own line, after the opening one
+    position = content.find('\n') + 1
+    if position == 0:
+        return 0
+
+    while position < len(content):
+        newline = content.find('\n', position)
+        line_end = newline if newline != -1 else len(content)
+        if content[position:line_end].strip() == '---':
+            # Position after the closing --- line (including its newline)
+            return line_end + 1
+        if newline == -1:
+            break
+        position = newline + 1
+
+    return 0  # No closing --- found
+
+
+def apply_edits(text: str, edits: Iterable[Edit]) -> str:
+    """Apply sorted, non-overlapping edits in one pass."""
+    parts = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
+class ZoneIndex:
+    """Sorted, non-overlapping (start, end, kind) regions with bisect lookup."""
+
+    def __init__(self, zones: Iterable[Tuple[int, int, str]] = ()):
+        self._starts = []  # type: List[int]
+        self._ends = []  # type: List[int]
+        self._kinds = []  # type: List[str]
+        for start, end, kind in sorted(zones):
+            if start >= end:
+                continue
+            if self._ends and start < self._ends[-1]:
+                # Merge into the previous zone
+                self._ends[-1] = max(self._ends[-1], end)
+                continue
+            self._starts.append(start)
+            self._ends.append(end)
+            self._kinds.append(kind)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends, self._kinds))
+
+    def copy(self) -> 'ZoneIndex':
+        clone = ZoneIndex()
+        clone._starts = list(self._starts)
+        clone._ends = list(self._ends)
+        clone._kinds = list(self._kinds)
+        return clone
+
+    def zone_at(self, pos: int) -> Optional[Tuple[int, int, str]]:
+        """The zone containing pos, if any."""
+        i = bisect.bisect_right(self._starts, pos) - 1
+        if i >= 0 and pos < self._ends[i]:
+            return self._starts[i], self._ends[i], self._kinds[i]
+        return None
+
+    def contains(self, pos: int) -> bool:
+        return self.zone_at(pos) is not None
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Does [start, end) intersect any zone?"""
+        # First zone ending after start; zones are disjoint so ends are sorted
+        i = bisect.bisect_right(self._ends, start)
+        return i < len(self._starts) and self._starts[i] < end
+
+    def add(self, start: int, end: int, kind: str) -> None:
+        """Protect a new span. It must not overlap an existing zone."""
+        if self.overlaps(start, end):
+            raise ValueError(f"Zone {start}-{end} overlaps an existing zone")
+        i = bisect.bisect_left(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._kinds.insert(i, kind)
+
+    def shift(self, edits: Sequence[Edit]) -> None:
+        """
+        Move zones to match content after applying sorted, non-overlapping edits.
+
+        Edits ending at or before a zone move it; edits inside a zone resize it.
+        Edits must not straddle a zone boundary.
+        """
+        if not edits:
+            return
+        delta = 0
+        k = 0
+        for i in range(len(self._starts)):
+            start, end = self._starts[i], self._ends[i]
+            # Edits entirely before this zone
+            while k < len(edits) and edits[k][1] <= start and edits[k][0] < end:
+                delta += len(edits[k][2]) - (edits[k][1] - edits[k][0])
+                k += 1
+            new_start = start + delta
+            # Edits inside this zone change its length
+            while k < len(edits) and edits[k][0] < end:
+                delta += len(edits[k][2]) - (edits[k][1] - edits[k][0])
+                k += 1
+            self._starts[i] = new_start
+            self._ends[i] = end + delta
+
+    def mask(self, text: str, fill: str = '\x00') -> str:
+        """Same-length text with every zone character replaced by fill."""
+        parts = []
+        position = 0
+        for start, end in zip(self._starts, self._ends):
+            parts.append(text[position:start])
+            parts.append(fill * (end - start))
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def strip(self, text: str) -> str:
+        """Text with every zone removed."""
+        parts = []
+        position = 0
+        for start, end in zip(self._starts, self._ends):
+            parts.append(text[position:start])
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
+
+
+def scan_protected_zones(content: str, kinds: Sequence[str] = ALL_KINDS) -> ZoneIndex:
+    """Tokenize content once and index its protected zones."""
+    zones = []
+    position = 0
+
+    if 'frontmatter' in kinds:
+        # CRITICAL: Frontmatter is always protected and always first
+        position = find_frontmatter_end(content)
+        if position:
+            zones.append((0, position, 'frontmatter'))
+
+    tokenizer = _tokenizer(kinds)
+    if tokenizer is not None:
+        for match in tokenizer.finditer(content, position):
+            zones.append((match.start(), match.end(), match.lastgroup))
+
+    return ZoneIndex(zones)
@@ -0,0 +1,187 @@
+"""
+Gate 1 Read Journal
+
+Append-only, per-session record of files Read in a session, shared by:
+- read-cache.py        : appends one line per Read
+- pre-mutation-gate.py : loads the journal into a set to enforce Gate 1
+
+Each Read is a single O_APPEND write of one JSON-encoded path plus newline,
+so parallel Read hooks never lock or read-modify-write: the kernel places
+every append at the current end of file. Duplicate lines are harmless and
+are folded away by periodic compaction.
+
+Files (in <state dir>/gate1-reads/):
+    {session_id}.log   - journal (one JSON string per line)
+    {session_id}.log.lock - held while the journal is compacted
+    {session_id}.json  - legacy JSON list written by older versions (read only)
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+# Compact once the journal has this many lines...
+COMPACT_MIN_LINES = 256
+
+# ...and at least this many lines per unique path
+COMPACT_RATIO = 2
+
+# Seconds after which a compaction lock is assumed abandoned
+COMPACT_LOCK_STALE = 30
+
+# Per-journal state in a long-lived process: path -> (inode, offset, lines, reads)
+_loaded = {}  # type: Dict[Path, Tuple[int, int, int, Set[str]]]
+
+
+def journal_path(cache_dir: Path, session_id: str) -> Path:
+    return cache_dir / f'{session_id}.log'
+
+
+def legacy_path(cache_dir: Path, session_id: str) -> Path:
+    return cache_dir / f'{session_id}.json'
+
+
+def _append(path: Path, data: bytes) -> None:
+    fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _encode(paths) -> bytes:
+    return ''.join(json.dumps(p) + '\n' for p in paths).encode('utf-8')
+
+
+def _parse(data: bytes) -> Tuple[Set[str], int]:
+    """Parse journal lines. Returns (paths, line count); torn lines are skipped."""
+    reads = set()
+    lines = data.split(b'\n')
+    for line in lines:
+        if not line:
+            continue
+        try:
+            reads.add(json.loads(line.decode('utf-8')))
+        except (ValueError, UnicodeDecodeError):
+            continue
+    return reads, len(lines) - 1
+
+
+def append_read(cache_dir: Path, session_id: str, normalized: str) -> None:
+    """Record one Read (lock-free)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _append(journal_path(cache_dir, session_id), _encode([normalized]))
+
+
+def load_reads(cache_dir: Path, session_id: str) -> Set[str]:
+    """
+    All paths Read in this session (journal plus legacy JSON list).
+
+    In a long-lived process only bytes appended since the last call are
+    parsed. Compacts the journal when it is mostly duplicates.
+    """
+    reads = set()
+
+    legacy = legacy_path(cache_dir, session_id)
+    try:
+        if legacy.exists():
+            with open(legacy, 'r', encoding='utf-8') as f:
+                reads.update(json.load(f))
+    except (json.JSONDecodeError, PermissionError, OSError, TypeError):
+        pass
+
+    path = journal_path(cache_dir, session_id)
+    try:
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            inode = stat.st_ino
+            ino, offset, lines, journal_reads = _loaded.get(path, (None, 0, 0, set()))
+            if ino != inode or offset > stat.st_size:
+                offset, lines, journal_reads = 0, 0, set()
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        _loaded.pop(path, None)
+        return reads
+    except OSError:
+        return reads
+
+    # Only consume complete lines; a partial last line is re-read next time
+    complete = data.rfind(b'\n') + 1
+    new_reads, new_lines = _parse(data[:complete])
+    journal_reads = journal_reads | new_reads
+    lines += new_lines
+    _loaded[path] = (inode, offset + complete, lines, journal_reads)
+    reads |= journal_reads
+
+    if lines >= COMPACT_MIN_LINES and lines >= COMPACT_RATIO * len(journal_reads):
+        compact(cache_dir, session_id)
+
+    return reads
+
+
+def _take_lock(lock: Path) -> bool:
+    try:
+        if time.time() - lock.stat().st_mtime > COMPACT_LOCK_STALE:
+            lock.unlink()
+    except OSError:
+        pass
+    try:
+        os.close(os.open(str(lock), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+    except OSError:
+        return False
+    return True
+
+
+def compact(cache_dir: Path, session_id: str) -> None:
+    """
+    Rewrite the journal with one line per path.
+
+    The compacted journal is written to a temp file that os.replace swaps
+    in, so readers always find a whole journal at the usual path. The old
+    journal stays open throughout: appends that reach it while the temp
+    file is written, or just after the swap, are copied across.
+
+    One compaction runs at a time; while the lock is held others skip.
+    A second swap could otherwise replace a journal that appends had
+    already reached after the first.
+    """
+    path = journal_path(cache_dir, session_id)
+    lock = path.with_name(f'{path.name}.lock')
+    if not _take_lock(lock):
+        return
+    try:
+        _compact(path)
+    finally:
+        try:
+            lock.unlink()
+        except OSError:
+            pass
+
+
+def _compact(path: Path) -> None:
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(path, 'rb') as old:
+            data = old.read()
+            complete = data.rfind(b'\n') + 1
+            reads, _ = _parse(data[:complete])
+            with open(tmp, 'wb') as f:
+                # A partial last line stays last, for its writer to finish
+                f.write(_encode(sorted(reads)) + data[complete:] + old.read())
+            os.replace(tmp, path)
+
+            # Appends that opened the old journal before the swap
+            late = old.read()
+            if late:
+                _append(path, late)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return  # The journal is untouched
+
+    _loaded.pop(path, None)
@@ -0,0 +1,153 @@
+"""
+Transcript Read Index
+
+Per-session index of the files Read according to the session transcript,
+used by pre-mutation-gate.py (Gate 1).
+
+The transcript is an append-only JSONL file that grows to many megabytes in
+long sessions. Instead of decoding all of it on every Edit/Write, the index
+stores the byte offset already consumed and the Read paths found so far;
+each check parses only the newly appended tail, and only decodes lines
+that contain a Read tool use.
+
+Index file: <state dir>/gate1-reads/{session_id}.transcript.json
+    {"transcript": path, "inode": n, "offset": n, "head_crc": n,
+     "reads": [...], "raw": [...]}
+"""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Set
+
+# Cheap byte test before json.loads: every Read tool use contains this
+READ_MARKER = b'"Read"'
+
+# Leading bytes fingerprinted to detect a rewritten (not appended) transcript
+HEAD_BYTES = 4096
+
+# Parsed indexes kept in a long-lived process (hook-server.py)
+_memo = {}  # type: Dict[Path, dict]
+
+
+def index_path(cache_dir: Path, session_id: str, transcript_path: str) -> Path:
+    """Index file for a session (or for the transcript, without a session id)."""
+    if not session_id:
+        session_id = 'transcript-%08x' % zlib.crc32(transcript_path.encode('utf-8'))
+    return cache_dir / f'{session_id}.transcript.json'
+
+
+def _load_index(path: Path, transcript_path: str) -> dict:
+    index = _memo.get(path)
+    if index is None:
+        try:
+            index = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            index = None
+    if not isinstance(index, dict) or index.get('transcript') != transcript_path:
+        index = {'transcript': transcript_path, 'inode': None, 'offset': 0, 'head_crc': None,
+                 'reads': [], 'raw': []}
+    return index
+
+
+def _save_index(path: Path, index: dict) -> None:
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(index, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _head_crc(f, length: int) -> int:
+    """Fingerprint of the indexed part of the transcript (first HEAD_BYTES)."""
+    f.seek(0)
+    return zlib.crc32(f.read(min(length, HEAD_BYTES)))
+
+
+def _scan_tail(data: bytes, reads: Set[str], raw: Set[str]) -> None:
+    """Add Read tool uses found in transcript lines."""
+    for line in data.split(b'\n'):
+        if READ_MARKER not in line:
+            continue
+        try:
+            event = json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            continue
+        if not isinstance(event, dict):
+            continue
+        if event.get('type') != 'tool_use' or event.get('name') != 'Read':
+            continue
+        event_path = (event.get('input') or {}).get('file_path', '')
+        if not event_path:
+            continue
+        try:
+            reads.add(str(Path(event_path).resolve()))
+        except (ValueError, OSError):
+            # Path normalization failed, fall back to string comparison
+            raw.add(event_path)
+
+
+def transcript_reads(cache_dir: Path, session_id: str, transcript_path: str) -> tuple:
+    """
+    Files Read according to the transcript, updated from the unread tail.
+
+    Returns:
+        (resolved_paths, raw_paths) - raw paths could not be resolved and
+        are compared as plain strings
+    """
+    path = index_path(cache_dir, session_id, transcript_path)
+    index = _load_index(path, transcript_path)
+    reads, raw = set(index['reads']), set(index['raw'])
+
+    try:
+        with open(transcript_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            offset = index['offset']
+            if (index['inode'] != stat.st_ino or stat.st_size < offset
+                    or _head_crc(f, offset) != index['head_crc']):
+                # Transcript replaced or rewritten: index it from scratch
+                offset = 0
+                reads, raw = set(), set()
+            f.seek(offset)
+            data = f.read()
+            # Only consume complete lines; a partial last line is parsed again next time
+            complete = data.rfind(b'\n') + 1
+            head_crc = _head_crc(f, offset + complete)
+    except OSError:
+        return reads, raw
+
+    _scan_tail(data[:complete], reads, raw)
+    pending_reads, pending_raw = set(), set()
+    if complete < len(data):
+        _scan_tail(data[complete:], pending_reads, pending_raw)
+
+    if (offset + complete, stat.st_ino, head_crc) != (index['offset'], index['inode'], index['head_crc']):
+        index = {
+            'transcript': transcript_path,
+            'inode': stat.st_ino,
+            'offset': offset + complete,
+            'head_crc': head_crc,
+            'reads': sorted(reads),
+            'raw': sorted(raw),
+        }
+        _save_index(path, index)
+    _memo[path] = index
+
+    return reads | pending_reads, raw | pending_raw
+
+
+def has_transcript_read(cache_dir: Path, session_id: str, transcript_path: str, file_path: str) -> bool:
+    """Check if the transcript shows a Read of file_path."""
+    reads, raw = transcript_reads(cache_dir, session_id, transcript_path)
+    try:
+        if str(Path(file_path).resolve()) in reads:
+            return True
+    except (ValueError, OSError):
+        pass
+    return file_path in raw
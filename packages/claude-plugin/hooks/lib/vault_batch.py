@@ -0,0 +1,170 @@
+"""
+Vault Batch Runner
+
+Runs a note fixer from one of the hook scripts over every note in a
+directory tree, for one-off clean-ups of imported vaults that the
+per-edit hooks would only reach one file at a time.
+
+A fixer is a hook module function fix(content) -> (new_content, fixes).
+Fixers that need more than the text (e.g. the vault's entity cache) are
+run with keyword options, and then also get the note's rel_path.
+Workers load the hook themselves (load_hook), so nothing but paths,
+options and results cross the process boundary. Each worker reads, fixes and writes
+its own notes; a write goes through a temp file in the same directory and
+os.replace, so a note is either fully old or fully new.
+
+Notes are read and written as exact UTF-8 text: line endings are kept,
+and files that are not valid UTF-8 are reported and left alone. Like the
+hooks, a fixer error only fails its own note: it is reported in that
+note's result and the run goes on.
+
+An interrupted write run can be resumed: BatchProgress records each
+finished note, and its done set is passed back to run_batch as skip.
+
+Used by:
+- syntax-validate.py --batch
+- wikilink-auto.py --batch
+
+Usage:
+    for result in run_batch(vault, 'syntax-validate', 'fix_content', dry_run=True):
+        print(result.rel_path, result.fixes, result.diff)
+"""
+
+import difflib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Collection, Iterator, List, NamedTuple, Optional
+
+from lib.hook_loader import load_hook
+from lib.vault_scan import scan_notes
+
+# Notes handed to a worker at a time
+CHUNK_SIZE = 16
+
+
+class BatchResult(NamedTuple):
+    rel_path: str
+    fixes: int  # Number of fixes applied (or that would be, in a dry run)
+    diff: str = ''  # Unified diff, dry runs only
+    error: Optional[str] = None
+
+
+def find_notes(root: Path) -> Iterator[Path]:
+    """Markdown files under root in sorted order, skipping dot folders and files."""
+    for rel_path in sorted(note.rel_path for note in scan_notes(root)):
+        yield root / rel_path
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Replace a note's content via a temp file, keeping its permissions."""
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        tmp.write_bytes(text.encode('utf-8'))
+        os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def note_diff(rel_path: str, old: str, new: str) -> str:
+    return ''.join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True),
+        fromfile=f'a/{rel_path}', tofile=f'b/{rel_path}',
+    ))
+
+
+def fix_note(hook: str, function: str, root: Path, path: Path, dry_run: bool,
+             options: Optional[dict] = None) -> BatchResult:
+    """Run one fixer over one note (worker entry point). Never raises."""
+    rel_path = path.relative_to(root).as_posix()
+    try:
+        content = path.read_bytes().decode('utf-8')
+        fixer = getattr(load_hook(hook), function)
+        if options is None:
+            fixed, fixes = fixer(content)
+        else:
+            fixed, fixes = fixer(content, rel_path=rel_path, **options)
+        if not fixes or fixed == content:
+            return BatchResult(rel_path, 0)
+        if dry_run:
+            return BatchResult(rel_path, len(fixes), note_diff(rel_path, content, fixed))
+        write_text_atomic(path, fixed)
+        return BatchResult(rel_path, len(fixes))
+    except Exception as e:
+        return BatchResult(rel_path, 0, error=f'{type(e).__name__}: {e}')
+
+
+def _fix_chunk(args) -> List[BatchResult]:
+    hook, function, root, paths, dry_run, options = args
+    return [fix_note(hook, function, root, path, dry_run, options) for path in paths]
+
+
+def _chunks(hook: str, function: str, root: Path, dry_run: bool,
+            options: Optional[dict], skip: Collection[str]):
+    chunk = []
+    for path in find_notes(root):
+        if skip and path.relative_to(root).as_posix() in skip:
+            continue
+        chunk.append(path)
+        if len(chunk) == CHUNK_SIZE:
+            yield hook, function, root, chunk, dry_run, options
+            chunk = []
+    if chunk:
+        yield hook, function, root, chunk, dry_run, options
+
+
+def run_batch(root: Path, hook: str, function: str, dry_run: bool = False,
+              workers: Optional[int] = None, options: Optional[dict] = None,
+              skip: Collection[str] = ()) -> Iterator[BatchResult]:
+    """
+    Fix every note under root, yielding one result per note in path order.
+
+    workers=1 runs in this process; otherwise a process pool of that many
+    workers (default: one per CPU) takes the notes in chunks. options are
+    passed to the fixer as keywords (with rel_path); notes whose rel_path
+    is in skip are not visited.
+    """
+    root = Path(root)
+    chunks = _chunks(hook, function, root, dry_run, options, skip)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _fix_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_fix_chunk, chunks):
+            yield from results
+
+
+class BatchProgress:
+    """
+    Notes finished by a write run, one rel_path per line in path. With
+    resume, the notes an interrupted run already finished are in done
+    and new ones are appended; otherwise the log starts empty.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.done = set()
+        if resume:
+            try:
+                self.done = set(self.path.read_text(encoding='utf-8').splitlines())
+            except OSError:
+                pass
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Line buffered: an interrupted run loses at most the note in flight
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8', buffering=1)
+
+    def record(self, rel_path: str) -> None:
+        self._file.write(rel_path + '\n')
+
+    def close(self, finished: bool = False) -> None:
+        """Close the log; a finished run removes it, so the next one starts over."""
+        self._file.close()
+        if finished:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
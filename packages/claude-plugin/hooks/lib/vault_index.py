@@ -0,0 +1,397 @@
+"""
+Vault Index
+
+Persistent SQLite index of the vault's notes for the Python hooks: paths,
+folders, stems, mtimes, frontmatter key/value rows, outgoing wikilinks and
+headings. Hooks answer questions about other notes with indexed queries
+instead of walking and re-parsing the vault on every call.
+
+Store: <vault>/.claude/vault-index.db, in WAL mode so one hook process can
+read while another writes. A schema change (SCHEMA_VERSION) or a corrupt
+file starts a fresh index, filled again by the next refresh. Outside a
+vault (the cwd fallback, or $HOME; see config.loader.is_state_root) the
+index is kept in memory for one connection and nothing is written.
+
+Kept current by:
+- refresh_folder()  : frontmatter-auto.py, before each folder query; only
+                      notes whose (mtime, size) changed are re-read
+- index_file()      : post-mutation.py, after the edited note is written back
+- refresh/rebuild() : vault-index.py, for the whole vault
+
+Notes are parsed with lib/markdown_document.py. Frontmatter values are
+stored as text: strings as they are, other values as JSON.
+
+Per-folder frontmatter counts (folder_totals, folder_fields) are kept up
+to date as notes are indexed and dropped, so folder_field_stats() reads
+a folder's aggregate rows instead of grouping its notes' fields. Rows are
+numbered as key/value pairs are first seen, so fields come back in the
+order the folder's notes introduced them (as a scan of the folder would
+find them), not sorted.
+
+Usage:
+    with VaultIndex.open(vault_path) as index:
+        index.refresh_folder('people')
+        total, fields = index.folder_field_stats('people', exclude='people/Ana.md')
+        index.backlinks('Ana')
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lib.hook_timing import current as current_timer
+from lib.markdown_document import MarkdownDocument
+from lib.vault_scan import list_directory, scan_notes
+from lib.wikilink_entities import relative_page_path
+
+INDEX_FILE = 'vault-index.db'
+
+# Bump when the tables change; older index files are replaced
+SCHEMA_VERSION = 3
+
+# How long a writer waits for another process's transaction
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = (
+    '''CREATE TABLE notes (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE,
+        folder TEXT NOT NULL,
+        stem TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL
+    )''',
+    'CREATE INDEX notes_folder ON notes (folder)',
+    'CREATE INDEX notes_stem ON notes (stem COLLATE NOCASE)',
+    '''CREATE TABLE fields (
+        note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL
+    )''',
+    'CREATE INDEX fields_note ON fields (note_id)',
+    'CREATE INDEX fields_key ON fields (key, value)',
+    '''CREATE TABLE links (
+        note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,
+        target TEXT NOT NULL
+    )''',
+    'CREATE INDEX links_note ON links (note_id)',
+    'CREATE INDEX links_target ON links (target COLLATE NOCASE)',
+    '''CREATE TABLE headings (
+        note_id INTEGER NOT NULL REFERENCES notes (id) ON DELETE CASCADE,
+        level INTEGER NOT NULL,
+        text TEXT NOT NULL
+    )''',
+    'CREATE INDEX headings_note ON headings (note_id)',
+    # Notes with frontmatter, per folder
+    '''CREATE TABLE folder_totals (
+        folder TEXT PRIMARY KEY,
+        notes INTEGER NOT NULL
+    )''',
+    # Notes per folder having each frontmatter key/value; id is first-seen order
+    '''CREATE TABLE folder_fields (
+        id INTEGER PRIMARY KEY,
+        folder TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        notes INTEGER NOT NULL,
+        UNIQUE (folder, key, value)
+    )''',
+)
+
+# (mtime_ns, size) a note was indexed at
+Stamp = Tuple[int, int]
+
+
+def index_path(vault_path: Path) -> Path:
+    return Path(vault_path) / '.claude' / INDEX_FILE
+
+
+def field_text(value) -> str:
+    """Stored form of a frontmatter value."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def read_note(path: Path) -> str:
+    """Text of a note being indexed ('' if unreadable, so it is not retried until it changes)."""
+    current_timer().count('files_read')
+    try:
+        return path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return ''
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_MS / 1000)
+    if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        conn.execute('PRAGMA journal_mode = WAL')
+        # Exclusive against another process creating the same index
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+                for (table,) in tables:
+                    conn.execute(f'DROP TABLE {table}')
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    conn.execute('PRAGMA foreign_keys = ON')
+    return conn
+
+
+class VaultIndex:
+    """Open connection to a vault's index."""
+
+    def __init__(self, vault_path: Path, conn: sqlite3.Connection):
+        self.vault_path = Path(vault_path)
+        self.conn = conn
+
+    @classmethod
+    def open(cls, vault_path: Path) -> 'VaultIndex':
+        """Open (creating if needed) the index of a vault."""
+        from config.loader import is_state_root
+        if not is_state_root(Path(vault_path)):
+            return cls(vault_path, _connect(':memory:'))
+
+        path = index_path(vault_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            conn = _connect(path)
+        except sqlite3.DatabaseError:
+            # Not a database (or damaged beyond use): start over
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.unlink(f'{path}{suffix}')
+                except OSError:
+                    pass
+            conn = _connect(path)
+        return cls(vault_path, conn)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'VaultIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def folder_key(self, folder_path: Path) -> str:
+        """Vault-relative '/'-separated folder ('' for the vault root)."""
+        try:
+            rel = Path(folder_path).resolve().relative_to(self.vault_path.resolve())
+        except (ValueError, OSError):
+            return Path(folder_path).as_posix()
+        return '' if rel == Path('.') else rel.as_posix()
+
+    # Updates
+
+    def _note_fields(self, rel_path: str) -> List[Tuple[str, str]]:
+        rows = self.conn.execute(
+            'SELECT fields.key, fields.value FROM fields JOIN notes ON notes.id = fields.note_id '
+            'WHERE notes.path = ?',
+            (rel_path,),
+        )
+        return rows.fetchall()
+
+    def _count_fields(self, folder: str, fields: List[Tuple[str, str]], delta: int) -> None:
+        """
+        Add delta notes having these fields to the folder aggregates. Rows
+        left at zero are kept until _prune(), so a note re-indexed with the
+        same fields keeps their place in first-seen order.
+        """
+        if not fields:
+            return
+        self.conn.execute(
+            'INSERT INTO folder_totals (folder, notes) VALUES (?, ?) '
+            'ON CONFLICT (folder) DO UPDATE SET notes = notes + excluded.notes',
+            (folder, delta),
+        )
+        self.conn.executemany(
+            'INSERT INTO folder_fields (folder, key, value, notes) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (folder, key, value) DO UPDATE SET notes = notes + excluded.notes',
+            [(folder, key, value, delta) for key, value in fields],
+        )
+
+    def _prune(self, folder: str) -> None:
+        """Drop aggregate rows no note in the folder has any more."""
+        self.conn.execute('DELETE FROM folder_totals WHERE folder = ? AND notes <= 0', (folder,))
+        self.conn.execute('DELETE FROM folder_fields WHERE folder = ? AND notes <= 0', (folder,))
+
+    def _remove_note(self, rel_path: str, prune: bool = True) -> None:
+        """Drop one note's rows and its share of the folder aggregates."""
+        folder = rel_path.rpartition('/')[0]
+        self._count_fields(folder, self._note_fields(rel_path), -1)
+        self.conn.execute('DELETE FROM notes WHERE path = ?', (rel_path,))
+        if prune:
+            self._prune(folder)
+
+    def _index_note(self, rel_path: str, content: str, stamp: Stamp) -> None:
+        """Replace one note's rows (inside the caller's transaction)."""
+        folder, _, name = rel_path.rpartition('/')
+        self._remove_note(rel_path, prune=False)
+        note_id = self.conn.execute(
+            'INSERT INTO notes (path, folder, stem, mtime_ns, size) VALUES (?, ?, ?, ?, ?)',
+            (rel_path, folder, name[:-3], stamp[0], stamp[1]),
+        ).lastrowid
+
+        document = MarkdownDocument(content)
+        fields = [(key, field_text(value)) for key, value in document.fields.items()]
+        self.conn.executemany(
+            'INSERT INTO fields (note_id, key, value) VALUES (?, ?, ?)',
+            [(note_id, key, value) for key, value in fields],
+        )
+        self._count_fields(folder, fields, 1)
+        self._prune(folder)
+        self.conn.executemany(
+            'INSERT INTO links (note_id, target) VALUES (?, ?)',
+            [(note_id, target) for target in sorted({link.target for link in document.wikilinks if link.target})],
+        )
+        self.conn.executemany(
+            'INSERT INTO headings (note_id, level, text) VALUES (?, ?, ?)',
+            [(note_id, heading.level, heading.text) for heading in document.headings],
+        )
+
+    def index_file(self, path: Path, content: Optional[str] = None) -> bool:
+        """
+        Index one note as it is on disk now (content, if given, is its
+        current text). Returns False for files the index does not hold
+        (outside the vault, in a dot folder, not markdown).
+        """
+        rel_path = relative_page_path(path, self.vault_path)
+        if rel_path is None:
+            return False
+        stat = os.stat(path)
+        if content is None:
+            content = read_note(Path(path))
+        with self.conn:
+            self._index_note(rel_path, content, (stat.st_mtime_ns, stat.st_size))
+        return True
+
+    def _sync(self, current: Dict[str, Tuple[Stamp, str]], indexed: Dict[str, Stamp],
+              skip: Iterable[str] = ()) -> int:
+        """Re-read changed notes and drop missing ones; returns the number of changes."""
+        skip = set(skip)
+        changes = 0
+        with self.conn:
+            for rel_path, (stamp, abs_path) in current.items():
+                if rel_path in skip or indexed.get(rel_path) == stamp:
+                    continue
+                self._index_note(rel_path, read_note(Path(abs_path)), stamp)
+                changes += 1
+            removed = indexed.keys() - current.keys()
+            for rel_path in removed:
+                self._remove_note(rel_path)
+        return changes + len(removed)
+
+    def _stamps(self, where: str = '', params: tuple = ()) -> Dict[str, Stamp]:
+        rows = self.conn.execute(f'SELECT path, mtime_ns, size FROM notes {where}', params)
+        return {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+
+    def refresh_folder(self, folder: str, skip_name: str = None) -> int:
+        """
+        Bring one folder's notes (not its subfolders) up to date. skip_name
+        is a note not to re-read now, e.g. one being edited.
+        """
+        prefix = f'{folder}/' if folder else ''
+        listing = list_directory(str(self.vault_path / folder if folder else self.vault_path), with_stat=True)
+        current = {
+            prefix + entry.name: ((entry.stat().st_mtime_ns, entry.stat().st_size), entry.path)
+            for entry in listing.files
+        }
+        skip = [prefix + skip_name] if skip_name else []
+        return self._sync(current, self._stamps('WHERE folder = ?', (folder,)), skip)
+
+    def refresh(self) -> int:
+        """Bring the whole vault up to date (dot folders are not indexed)."""
+        current = {
+            note.rel_path: ((note.stat.st_mtime_ns, note.stat.st_size), note.path)
+            for note in scan_notes(self.vault_path, with_stat=True)
+        }
+        return self._sync(current, self._stamps())
+
+    def rebuild(self) -> int:
+        """Re-read every note."""
+        with self.conn:
+            for table in ('notes', 'folder_totals', 'folder_fields'):
+                self.conn.execute(f'DELETE FROM {table}')
+        return self.refresh()
+
+    # Queries
+
+    def note_count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM notes').fetchone()[0]
+
+    def stems(self) -> List[str]:
+        return [stem for (stem,) in self.conn.execute('SELECT DISTINCT stem FROM notes ORDER BY stem')]
+
+    def folder_field_stats(self, folder: str, exclude: str = None,
+                           skip_keys: Iterable[str] = ()) -> Tuple[int, Dict[str, dict]]:
+        """
+        (notes with frontmatter, {field: {'count': n, 'values': {value: n}}})
+        for one folder's notes, leaving out the note at exclude and keys in
+        skip_keys (case-insensitive). Every note with frontmatter counts
+        towards the total, including notes with only skipped keys.
+
+        Read from the folder aggregates, with the excluded note's own
+        fields taken back out; the folder's other notes are not queried.
+        Fields and values are in first-seen order.
+        """
+        skip_keys = {key.lower() for key in skip_keys}
+        row = self.conn.execute('SELECT notes FROM folder_totals WHERE folder = ?', (folder,)).fetchone()
+        total = row[0] if row else 0
+        counts = {(key, value): notes for key, value, notes in self.conn.execute(
+            'SELECT key, value, notes FROM folder_fields WHERE folder = ? ORDER BY id', (folder,))}
+
+        excluded = self._note_fields(exclude) if exclude and exclude.rpartition('/')[0] == folder else []
+        if excluded:
+            total -= 1
+            for pair in excluded:
+                counts[pair] -= 1
+
+        fields = {}
+        for (key, value), count in counts.items():
+            if count <= 0 or key.lower() in skip_keys:
+                continue
+            stats = fields.setdefault(key, {'count': 0, 'values': {}})
+            stats['count'] += count
+            stats['values'][value] = count
+        return total, fields
+
+    def notes_with_field(self, key: str, value) -> List[str]:
+        rows = self.conn.execute(
+            'SELECT notes.path FROM fields JOIN notes ON notes.id = fields.note_id '
+            'WHERE fields.key = ? AND fields.value = ? ORDER BY notes.path',
+            (key, field_text(value)),
+        )
+        return [path for (path,) in rows]
+
+    def outgoing_links(self, rel_path: str) -> List[str]:
+        rows = self.conn.execute(
+            'SELECT links.target FROM links JOIN notes ON notes.id = links.note_id '
+            'WHERE notes.path = ? ORDER BY links.target',
+            (rel_path,),
+        )
+        return [target for (target,) in rows]
+
+    def backlinks(self, target: str) -> List[str]:
+        """Notes linking to a page name (case-insensitive, as Obsidian resolves links)."""
+        rows = self.conn.execute(
+            'SELECT DISTINCT notes.path FROM links JOIN notes ON notes.id = links.note_id '
+            'WHERE links.target = ? COLLATE NOCASE ORDER BY notes.path',
+            (target,),
+        )
+        return [path for (path,) in rows]
+
+    def headings(self, rel_path: str) -> List[Tuple[int, str]]:
+        rows = self.conn.execute(
+            'SELECT headings.level, headings.text FROM headings JOIN notes ON notes.id = headings.note_id '
+            'WHERE notes.path = ? ORDER BY headings.rowid',
+            (rel_path,),
+        )
+        return rows.fetchall()
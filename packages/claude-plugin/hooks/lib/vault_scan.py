@@ -0,0 +1,141 @@
+"""
+Vault Scan
+
+Parallel directory walk shared by the hooks and CLIs that enumerate a
+vault's notes. Directories are listed with os.scandir, whose entries
+carry the file type from the listing itself and cache their stat
+results, and dot folders (.git, .obsidian, .claude, .trash) are pruned
+before they are descended into. Listings are fanned out over a thread
+pool: os.scandir releases the GIL, so on network mounts and large vaults
+directory round-trips overlap instead of queueing.
+
+Results arrive in completion order, not path order; sort them where
+order matters.
+
+Used by:
+- wikilink-cache.py : walk_vault() with its mtime-aware visit
+- vault_index.py    : scan_notes(with_stat=True) for refresh()
+- vault_batch.py    : scan_notes() for find_notes()
+
+Usage:
+    for note in scan_notes(vault_path):
+        print(note.rel_path, note.path)
+"""
+
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+from lib.hook_timing import current as current_timer
+
+# Directory listings in flight at once; 1 walks in the calling thread
+SCAN_WORKERS = 8
+
+T = TypeVar('T')
+
+# visit(rel_dir, abs_dir) -> (result, subdirectory names), or None to skip
+Visit = Callable[[str, str], Optional[Tuple[T, Iterable[str]]]]
+
+
+class DirListing(NamedTuple):
+    files: List[os.DirEntry]  # .md files
+    subdirs: List[str]  # Names of subdirectories, dot folders excluded
+
+
+class VaultNote(NamedTuple):
+    rel_path: str  # 'folder/Note.md', '/'-separated
+    path: str  # Absolute path
+    stat: Optional[os.stat_result] = None  # scan_notes(with_stat=True) only
+
+
+def list_directory(path: str, with_stat: bool = False) -> DirListing:
+    """
+    The .md files and subdirectories of path, skipping dot entries.
+    with_stat stats each file now (cached on its entry), so the cost
+    falls on the listing thread. Raises OSError if path can't be listed.
+    """
+    files, subdirs = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.name.endswith('.md') and entry.is_file():
+                    if with_stat:
+                        entry.stat()
+                    files.append(entry)
+            except OSError:
+                continue
+    return DirListing(files, subdirs)
+
+
+def _child(rel_dir: str, name: str) -> str:
+    return f'{rel_dir}/{name}' if rel_dir else name
+
+
+def walk_vault(root: Union[str, Path], visit: Visit, workers: int = SCAN_WORKERS) -> Iterator[T]:
+    """
+    Call visit(rel_dir, abs_dir) for root ('') and each directory it
+    leads to, yielding the results as they complete. visit returns
+    (result, subdirectory names to descend into), or None to skip a
+    directory; it runs on worker threads and must not share state.
+    """
+    root = str(root)
+
+    if workers <= 1:
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            outcome = visit(rel_dir, os.path.join(root, rel_dir))
+            if outcome is None:
+                continue
+            result, subdirs = outcome
+            stack.extend(_child(rel_dir, name) for name in subdirs)
+            yield result
+        return
+
+    # Imported here: the hooks that only walk one folder don't pay for it
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = {pool.submit(visit, '', root): ''}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel_dir = pending.pop(future)
+                outcome = future.result()
+                if outcome is None:
+                    continue
+                result, subdirs = outcome
+                # Queue the subdirectories before handing back, so workers
+                # keep listing while the caller consumes the result
+                for name in subdirs:
+                    child = _child(rel_dir, name)
+                    pending[pool.submit(visit, child, os.path.join(root, child))] = child
+                yield result
+    finally:
+        # Generator closed early (or visit raised): drop queued listings
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+
+def scan_notes(root: Union[str, Path], with_stat: bool = False,
+               workers: int = SCAN_WORKERS) -> Iterator[VaultNote]:
+    """Every .md note under root outside dot folders, in completion order."""
+    def visit(rel_dir: str, abs_dir: str):
+        try:
+            listing = list_directory(abs_dir, with_stat)
+        except OSError:
+            return None
+        return (rel_dir, listing.files), listing.subdirs
+
+    timer = current_timer()
+    for rel_dir, files in walk_vault(root, visit, workers):
+        timer.count('files_scanned', len(files))
+        for entry in files:
+            yield VaultNote(_child(rel_dir, entry.name), entry.path,
+                            entry.stat() if with_stat else None)
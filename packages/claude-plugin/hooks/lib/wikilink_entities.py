@@ -0,0 +1,254 @@
+"""
+Wikilink Entity Cache Library
+
+Shared rules and file handling for .claude/wikilink-entities.json (and its
+binary form wikilink-entities.bin, see lib/entity_table.py), used by:
+- wikilink-cache.py : full / incremental rebuild (SessionStart or background)
+- wikilink-auto.py  : single-page upsert after a Write, background build
+                      when the cache is missing
+
+Both paths decide which page names are entities and how they are
+categorized with the same functions, so an upserted page lands exactly
+where a rebuild would put it.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from lib.entity_table import encode_entity_table
+
+# Tech keywords for categorization
+TECH_KEYWORDS = [
+    'databricks', 'api', 'code', 'azure', 'sql', 'git',
+    'node', 'react', 'powerbi', 'excel', 'copilot',
+    'fabric', 'apim', 'endpoint', 'synology', 'tailscale',
+    'obsidian', 'claude', 'powershell',
+    'adf', 'adb', 'net', 'python', 'javascript'
+]
+
+# Pages that are never entities
+EXCLUDE_PATTERNS = [
+    r'^\d{4}-\d{2}-\d{2}$',           # ISO dates like 2025-01-01
+    r'^\d{1,2}/\d{1,2}/\d{4}$',       # UK dates like 1/10/2024
+    r'^\d{4}-W\d{2}$',                 # Week dates like 2025-W17
+    r'^\d{4}-\d{2}$',                  # Month format like 2025-01
+    r'^\d{4}-Q\d$',                    # Quarter dates like 2025-Q4
+    r'^\d+$',                          # Pure numbers
+    r'^@',                             # Twitter handles
+    r'^<',                             # XML/HTML tags
+    r'^\{\{',                          # Template placeholders
+    r'\\$',                            # Paths ending in backslash
+    r'\.(?:md|js|py|json|jpg|png|pdf|csv)$',  # File extensions
+    r'^[a-z0-9_-]+\.[a-z]+$',          # File names with extensions
+]
+
+CACHE_FILE = 'wikilink-entities.json'
+
+# Binary table written alongside the JSON; what wikilink-auto.py reads
+TABLE_FILE = 'wikilink-entities.bin'
+
+# Held while the entity cache is rebuilt or upserted into (one writer per vault)
+BUILD_LOCK_FILE = 'wikilink-cache.lock'
+
+# Seconds after which a build lock is assumed abandoned
+BUILD_LOCK_STALE = 300
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+
+_exclusions = {}
+
+
+def compile_exclusions(periodic_folders: List[str]):
+    """Combine the exclusion patterns (plus periodic folders) into one regex."""
+    key = tuple(periodic_folders)
+    pattern = _exclusions.get(key)
+    if pattern is None:
+        patterns = EXCLUDE_PATTERNS + [f'^{re.escape(folder)}/' for folder in periodic_folders]
+        pattern = re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+        _exclusions[key] = pattern
+    return pattern
+
+
+def is_valid_entity(page: str, exclude_re) -> bool:
+    """Check a page name against the exclusion rules."""
+    # Skip very short names (likely abbreviations or common words)
+    if len(page) < 2:
+        return False
+    return not exclude_re.match(page)
+
+
+def categorize_entity(link: str) -> str:
+    """Pick the cache category for an entity."""
+    if any(tech in link.lower() for tech in TECH_KEYWORDS):
+        return 'technologies'
+    elif link.isupper() and 2 <= len(link) <= 6:
+        return 'acronyms'
+    elif ' ' in link and len(link.split()) == 2:
+        return 'people'
+    elif ' ' in link:
+        return 'projects'
+    return 'other'
+
+
+def page_names(rel_file: str) -> tuple:
+    """Link targets for a vault-relative .md path: (stem, path without extension)."""
+    rel_no_ext = rel_file[:-3]
+    return rel_no_ext.rsplit('/', 1)[-1], rel_no_ext
+
+
+def relative_page_path(file_path: Path, vault_path: Path) -> Optional[str]:
+    """
+    Vault-relative '/'-separated path of a page, or None if a rebuild
+    would not index it (outside the vault, hidden folder, not .md).
+    """
+    try:
+        rel_path = Path(file_path).resolve().relative_to(Path(vault_path).resolve())
+    except (ValueError, OSError):
+        return None
+    if not rel_path.parts or rel_path.suffix != '.md':
+        return None
+    if any(part.startswith('.') for part in rel_path.parts):
+        return None
+    return '/'.join(rel_path.parts)
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write compact JSON atomically."""
+    write_bytes_atomic(path, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+
+def write_entity_cache(cache_file: Path, cache: dict) -> None:
+    """
+    Write the entity cache: the JSON export, then the binary table. The
+    table is written second so it is never older than the JSON it mirrors.
+    """
+    write_json_atomic(cache_file, cache)
+    write_bytes_atomic(cache_file.with_name(TABLE_FILE), encode_entity_table(cache))
+
+
+def upsert_page(vault_path: Path, rel_file: str, periodic_folders: List[str]) -> List[str]:
+    """
+    Add one page to an existing entity cache.
+
+    Only touches the cache if the page adds an entity. A missing or
+    unreadable cache is left for the next build. The read-modify-write
+    holds the build lock; while a build holds it the upsert is skipped,
+    since the build (or the next one, as the page's folder changed)
+    picks the page up and would otherwise overwrite it.
+
+    Returns:
+        Entity names that were added
+    """
+    cache_file = Path(vault_path) / '.claude' / CACHE_FILE
+    if not cache_file.exists() or not acquire_build_lock(vault_path):
+        return []
+    try:
+        return _upsert_page(cache_file, rel_file, periodic_folders)
+    finally:
+        release_build_lock(vault_path)
+
+
+def _upsert_page(cache_file: Path, rel_file: str, periodic_folders: List[str]) -> List[str]:
+    try:
+        cache = json.loads(cache_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return []
+    if not isinstance(cache, dict):
+        return []
+
+    known = {e for k, v in cache.items() if k != '_metadata' for e in v}
+    exclude_re = compile_exclusions(periodic_folders)
+    added = [
+        page for page in dict.fromkeys(page_names(rel_file))
+        if page not in known and is_valid_entity(page, exclude_re)
+    ]
+    if not added:
+        return []
+
+    for page in added:
+        category = categorize_entity(page)
+        cache[category] = sorted(set(cache.get(category, [])) | {page})
+
+    metadata = cache.setdefault('_metadata', {})
+    metadata['total_entities'] = metadata.get('total_entities', len(known)) + len(added)
+
+    try:
+        write_entity_cache(cache_file, cache)
+    except (OSError, ValueError):
+        return []
+    return added
+
+
+def acquire_build_lock(vault_path: Path) -> bool:
+    """
+    Take the vault's build lock. Locks older than BUILD_LOCK_STALE are
+    retaken. Returns False if another process holds it (or .claude is
+    not writable).
+    """
+    lock_file = Path(vault_path) / '.claude' / BUILD_LOCK_FILE
+    try:
+        lock_file.parent.mkdir(parents=True, exist_ok=True)
+        if lock_file.exists() and time.time() - lock_file.stat().st_mtime > BUILD_LOCK_STALE:
+            lock_file.unlink()
+        fd = os.open(str(lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except OSError:
+        return False
+    os.close(fd)
+    return True
+
+
+def start_background_build(vault_path: Path) -> bool:
+    """
+    Start wikilink-cache.py for this vault as a detached, low-priority process.
+
+    At most one build runs per vault: the caller takes the build lock and
+    the build removes it when done.
+
+    Returns:
+        True if a build was started
+    """
+    if not acquire_build_lock(vault_path):
+        return False  # Build already running
+
+    kwargs = {}
+    if sys.platform != 'win32':
+        kwargs['start_new_session'] = True
+    try:
+        subprocess.Popen(
+            [sys.executable, str(HOOKS_DIR / 'wikilink-cache.py'), '--background'],
+            cwd=str(vault_path),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            **kwargs
+        )
+        return True
+    except OSError:
+        release_build_lock(vault_path)
+        return False
+
+
+def release_build_lock(vault_path: Path) -> None:
+    try:
+        (Path(vault_path) / '.claude' / BUILD_LOCK_FILE).unlink()
+    except OSError:
+        pass
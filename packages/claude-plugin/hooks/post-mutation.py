@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Post-Mutation Dispatcher (post-mutation.py)
+
+Single PostToolUse entry point for Edit/Write. Runs every post-mutation
+stage in one interpreter instead of starting a python3 process per hook:
+
+1. verify-mutation.py    - Gate 6 frontmatter/wikilink validation
+2. syntax-validate.py    - Obsidian syntax auto-fixes
+3. wikilink-auto.py      - Auto-apply wikilinks
+4. frontmatter-auto.py   - Auto-add frontmatter from folder conventions
+5. achievement-detect.py - Detect achievements in daily notes
+
+Stages share one HookContext: stdin is parsed once, the edited file is read
+once, vault root and config are resolved once, and modified content is
+written back at most once after the last stage. Stage output is combined
+and emitted together. Stages that already processed the note's current
+content are skipped (content digests in .claude/content-digests/).
+
+After write-back the note is re-indexed in the vault index
+(.claude/vault-index.db), if the vault has one.
+
+Each stage script still works standalone with the same stdin protocol.
+
+Exit codes:
+- 0: Always (informational only, never blocks)
+"""
+
+import os
+import sys
+
+# Reject calls this hook would ignore before the heavier imports below
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('post-mutation')
+
+from pathlib import Path
+
+# Configure UTF-8 output for Windows console
+try:
+    sys.stdout.reconfigure(encoding='utf-8')
+except AttributeError:
+    pass
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_context import HookContext, read_hook_input, run_stages
+from lib.hook_loader import load_hook
+from lib.hook_timing import current as current_timer
+
+# Stage order matches the order the hooks were registered in hooks.json
+STAGES = (
+    'verify-mutation',
+    'syntax-validate',
+    'wikilink-auto',
+    'frontmatter-auto',
+    'achievement-detect',
+)
+
+HOOK_LABEL = 'Post-mutation'
+
+
+def dispatch(hook_input: dict, stages: tuple = STAGES) -> HookContext:
+    """Run all stages against one shared context and write back once."""
+    ctx = HookContext(hook_input)
+
+    # Nothing to do for other tools - avoid importing the stages at all
+    if ctx.tool_name not in ['Edit', 'Write']:
+        return ctx
+
+    loaded = []
+    for name in stages:
+        try:
+            module = load_hook(name)
+        except Exception as e:
+            ctx.print(f"[flywheel] {HOOK_LABEL}: Cannot load {name} - {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        loaded.append((module.process, module.HOOK_LABEL))
+
+    run_stages(ctx, loaded, HOOK_LABEL)
+    update_vault_index(ctx)
+    return ctx
+
+
+def update_vault_index(ctx: HookContext) -> None:
+    """Re-index the note as written back, if the vault has an index."""
+    if not ctx.file_path.endswith('.md') or not ctx.exists:
+        return
+    try:
+        from lib.vault_index import VaultIndex, index_path
+        if not index_path(ctx.vault_path).exists():
+            return  # Created by frontmatter-auto or vault-index.py, never here
+        with current_timer().stage('vault_index'):
+            with VaultIndex.open(ctx.vault_path) as index:
+                index.index_file(ctx.path, ctx.content)
+    except Exception as e:
+        ctx.print(f"[flywheel] {HOOK_LABEL}: Vault index not updated - {type(e).__name__}: {e}", file=sys.stderr)
+
+
+def main():
+    hook_input = read_hook_input()
+    if hook_input is None:
+        sys.exit(0)
+
+    ctx = dispatch(hook_input)
+    ctx.flush()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
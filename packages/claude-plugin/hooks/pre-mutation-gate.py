@@ -13,12 +13,21 @@ Exit codes:
 Session Read Cache:
 Gate 1 uses transcript to find prior Read events, but transcript is lost
 when context is summarized. To fix this, we also maintain a session-scoped
-cache file that persists reads across summarization.
+read journal (written by read-cache.py) that persists reads across
+summarization. The transcript is indexed incrementally (only the newly
+appended tail is parsed per check, see lib/transcript_index.py).
 """
 
-import json
 import os
 import sys
+
+# Reject calls this hook would ignore before the heavier imports below
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('pre-mutation-gate')
+
+import json
 from pathlib import Path
 
 # Configure UTF-8 output for Windows console
@@ -27,30 +36,26 @@ try:
 except AttributeError:
     pass
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_timing import current as current_timer
+from lib.read_journal import load_reads
+from lib.transcript_index import has_transcript_read
+
 # Session read cache - persists across context summarization
 # Uses session_id from hook input to scope the cache
 CACHE_DIR = Path(os.environ.get('CLAUDE_LOCAL_STATE_DIR', Path.home() / '.claude'))
 
 
-def get_session_cache_path(session_id: str) -> Path:
-    """Get the cache file path for this session."""
-    cache_dir = CACHE_DIR / 'gate1-reads'
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir / f'{session_id}.json'
+def get_session_cache_dir() -> Path:
+    """Get the directory holding per-session read journals."""
+    return CACHE_DIR / 'gate1-reads'
 
 
 def load_session_reads(session_id: str) -> set:
     """Load the set of read file paths for this session."""
     if not session_id:
         return set()
-    cache_path = get_session_cache_path(session_id)
-    try:
-        if cache_path.exists():
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return set(json.load(f))
-    except (json.JSONDecodeError, PermissionError, OSError):
-        pass
-    return set()
+    return load_reads(get_session_cache_dir(), session_id)
 
 
 def has_session_read(session_id: str, file_path: str) -> bool:
@@ -58,47 +63,16 @@ def has_session_read(session_id: str, file_path: str) -> bool:
     if not session_id:
         return False
     reads = load_session_reads(session_id)
+    current_timer().count('journal_reads', len(reads))
     normalized = str(Path(file_path).resolve())
     return normalized in reads
 
 
-def load_transcript(transcript_path):
-    """Parse conversation history to find prior tool uses."""
-    events = []
-    try:
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    events.append(json.loads(line))
-    except (FileNotFoundError, json.JSONDecodeError, PermissionError):
-        return []
-    return events
-
-
-def has_prior_read(events, file_path):
-    """Check if file was Read in this session."""
-    # Normalize the file path for comparison
-    normalized_target = Path(file_path).resolve()
-
-    for event in events:
-        # Check for tool_use events with Read tool
-        if event.get('type') == 'tool_use' and event.get('name') == 'Read':
-            event_path = event.get('input', {}).get('file_path', '')
-            if event_path:
-                try:
-                    normalized_event = Path(event_path).resolve()
-                    if normalized_event == normalized_target:
-                        return True
-                except (ValueError, OSError):
-                    # Path normalization failed, try string comparison
-                    if event_path == file_path:
-                        return True
-    return False
-
-
 def main():
+    timer = current_timer()
     try:
-        hook_input = json.load(sys.stdin)
+        with timer.stage('stdin'):
+            hook_input = json.load(sys.stdin)
     except json.JSONDecodeError:
         sys.exit(0)  # Invalid input, don't block
 
@@ -140,15 +114,16 @@ def main():
         session_id = hook_input.get('session_id', '')
         transcript_path = hook_input.get('transcript_path', '')
 
-        # Check BOTH transcript AND session cache (cache survives context summarization)
-        found_in_transcript = False
-        found_in_cache = has_session_read(session_id, file_path)
+        # Check session cache first (survives context summarization), then
+        # the transcript - only its newly appended tail is parsed
+        with timer.stage('journal'):
+            found = has_session_read(session_id, file_path)
 
-        if transcript_path:
-            events = load_transcript(transcript_path)
-            found_in_transcript = has_prior_read(events, file_path)
+        if not found and transcript_path:
+            with timer.stage('transcript'):
+                found = has_transcript_read(get_session_cache_dir(), session_id, transcript_path, file_path)
 
-        if not found_in_transcript and not found_in_cache:
+        if not found:
             action = "overwriting" if tool_name == 'Write' else "editing"
             output = {
                 "hookSpecificOutput": {
@@ -9,15 +9,20 @@ transcript is truncated.
 
 Part of the Six Gates Safety Framework.
 
-IMPORTANT: Uses file locking to handle parallel Read operations safely.
-When Claude reads multiple files in parallel, each hook instance must
-acquire a lock before modifying the cache.
+Reads are appended to a per-session journal (lib/read_journal.py) with a
+single O_APPEND write, so parallel Read hooks need no locking.
 """
 
-import json
 import os
 import sys
-import time
+
+# Reject calls this hook would ignore before the heavier imports below
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('read-cache')
+
+import json
 from pathlib import Path
 
 # Configure UTF-8 output for Windows console
@@ -26,126 +31,35 @@ try:
 except AttributeError:
     pass
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_timing import current as current_timer
+from lib.read_journal import append_read
+
 # Session read cache - must match pre-mutation-gate.py
 CACHE_DIR = Path(os.environ.get('CLAUDE_LOCAL_STATE_DIR', Path.home() / '.claude'))
 
-# Cross-platform file locking
-IS_WINDOWS = sys.platform == 'win32'
-
-if IS_WINDOWS:
-    import msvcrt
-
-    def lock_file(f):
-        """Acquire exclusive lock on file (Windows)."""
-        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
-
-    def unlock_file(f):
-        """Release lock on file (Windows)."""
-        f.seek(0)
-        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
-else:
-    import fcntl
-
-    def lock_file(f):
-        """Acquire exclusive lock on file (Unix)."""
-        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-
-    def unlock_file(f):
-        """Release lock on file (Unix)."""
-        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-
-
-def get_session_cache_path(session_id: str) -> Path:
-    """Get the cache file path for this session."""
-    cache_dir = CACHE_DIR / 'gate1-reads'
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir / f'{session_id}.json'
-
-
-def get_lock_path(session_id: str) -> Path:
-    """Get the lock file path for this session."""
-    cache_dir = CACHE_DIR / 'gate1-reads'
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir / f'{session_id}.lock'
+def get_session_cache_dir() -> Path:
+    """Get the directory holding per-session read journals."""
+    return CACHE_DIR / 'gate1-reads'
 
 
 def record_read(session_id: str, file_path: str) -> None:
-    """
-    Record that a file was read in this session.
-
-    Uses file locking to safely handle parallel Read operations.
-    """
+    """Record that a file was read in this session (one atomic append)."""
     if not session_id or not file_path:
         return
 
     normalized = str(Path(file_path).resolve())
-    cache_path = get_session_cache_path(session_id)
-    lock_path = get_lock_path(session_id)
-
-    # Retry with backoff for lock acquisition
-    max_retries = 5
-    for attempt in range(max_retries):
-        try:
-            # Use a lock file to ensure atomic read-modify-write
-            with open(lock_path, 'w') as lf:
-                try:
-                    lock_file(lf)
-
-                    # Load existing reads while holding lock
-                    reads = set()
-                    if cache_path.exists():
-                        try:
-                            with open(cache_path, 'r', encoding='utf-8') as f:
-                                reads = set(json.load(f))
-                        except (json.JSONDecodeError, PermissionError, OSError):
-                            pass
-
-                    # Add new read
-                    reads.add(normalized)
-
-                    # Save while still holding lock
-                    with open(cache_path, 'w', encoding='utf-8') as f:
-                        json.dump(list(reads), f)
-
-                    return  # Success
-
-                finally:
-                    try:
-                        unlock_file(lf)
-                    except (OSError, IOError):
-                        pass
-
-        except (PermissionError, OSError, IOError) as e:
-            # Lock acquisition failed, retry with backoff
-            if attempt < max_retries - 1:
-                time.sleep(0.05 * (attempt + 1))  # 50ms, 100ms, 150ms, 200ms
-            else:
-                # Final attempt failed, try without lock (best effort)
-                _record_read_no_lock(normalized, cache_path)
-
-
-def _record_read_no_lock(normalized: str, cache_path: Path) -> None:
-    """Fallback when locking fails - best effort, may lose writes in race."""
     try:
-        reads = set()
-        if cache_path.exists():
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    reads = set(json.load(f))
-            except (json.JSONDecodeError, PermissionError, OSError):
-                pass
-
-        reads.add(normalized)
-
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(list(reads), f)
+        with current_timer().stage('append'):
+            append_read(get_session_cache_dir(), session_id, normalized)
     except (PermissionError, OSError):
         pass
 
 
 def main():
     try:
-        hook_input = json.load(sys.stdin)
+        with current_timer().stage('stdin'):
+            hook_input = json.load(sys.stdin)
     except json.JSONDecodeError:
         sys.exit(0)
 
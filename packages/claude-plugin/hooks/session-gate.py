@@ -10,6 +10,10 @@ Runs at SessionStart, before other session hooks.
 """
 import json
 import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_timing import timed_hook
 
 # Configure UTF-8 output for Windows console
 try:
@@ -50,4 +54,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with timed_hook('session-gate'):
+        main()
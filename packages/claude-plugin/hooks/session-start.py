@@ -7,6 +7,9 @@ import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_timing import timed_hook
+
 # Configure UTF-8 output for Windows console
 try:
     sys.stdout.reconfigure(encoding='utf-8')
@@ -58,4 +61,5 @@ Run health_check for vault status."""
 
 
 if __name__ == "__main__":
-    main()
+    with timed_hook('session-start'):
+        main()
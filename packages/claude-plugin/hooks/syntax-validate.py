@@ -7,12 +7,29 @@ Fixes:
 1. Angle brackets outside code blocks (breaks wikilinks) → converts to parentheses
 2. Wrapped wikilinks like **[[Link]]** → unwraps to [[Link]]
 
+Batch mode applies the same fixes to every note under a directory (for
+imported vaults), with a process pool and atomic per-file writes:
+
+    python3 syntax-validate.py --batch <dir> [--dry-run] [--workers N]
+
+--dry-run prints a unified diff per note instead of writing.
+
 Exit codes:
 - 0: No issues found, or issues fixed successfully
+- 1: Batch mode could not read or write some notes
 """
 
-import json
+import os
 import sys
+
+# Reject calls this hook would ignore before the heavier imports below
+# (hook calls only; batch mode takes arguments and no stdin)
+if __name__ == '__main__' and len(sys.argv) == 1:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('syntax-validate')
+
+import argparse
 import re
 from pathlib import Path
 
@@ -22,61 +39,59 @@ try:
 except AttributeError:
     pass
 
+# Shared hook context (stage entry point for post-mutation.py)
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_context import HookContext, run_standalone
+from lib.hook_timing import current as current_timer
+from lib.protected_zones import CODE_KINDS, ZoneIndex, apply_edits, scan_protected_zones
 
-def protect_code_blocks(content: str) -> tuple[str, list]:
-    """Extract and protect code blocks, return (content_with_placeholders, code_blocks)."""
-    code_blocks = []
+HOOK_LABEL = 'Syntax validator'
 
-    # Protect fenced code blocks
-    def save_fenced(match):
-        code_blocks.append(('fenced', match.group(0)))
-        return f'___CODE_BLOCK_{len(code_blocks)-1}___'
 
-    content = re.sub(r'```[\s\S]*?```', save_fenced, content)
+def sub_outside_zones(pattern: str, content: str, zones: ZoneIndex, replace) -> str:
+    """
+    Rewrite matches of pattern outside protected zones.
 
-    # Protect inline code
-    def save_inline(match):
-        code_blocks.append(('inline', match.group(0)))
-        return f'___INLINE_CODE_{len(code_blocks)-1}___'
+    Matching runs on a masked copy (zone characters replaced), so a match
+    may enclose code but never starts or ends inside it. replace(match, content) returns edits in
+    content offsets; they must not touch zone characters. zones is shifted
+    to stay valid for the returned content.
+    """
+    current_timer().count('regex_passes')
+    edits = []
+    for match in re.finditer(pattern, zones.mask(content)):
+        edits.extend(replace(match, content))
 
-    content = re.sub(r'`[^`]+`', save_inline, content)
+    if not edits:
+        return content
 
-    return content, code_blocks
+    zones.shift(edits)
+    return apply_edits(content, edits)
 
 
-def restore_code_blocks(content: str, code_blocks: list) -> str:
-    """Restore protected code blocks."""
-    for i, (block_type, block_content) in enumerate(code_blocks):
-        if block_type == 'fenced':
-            content = content.replace(f'___CODE_BLOCK_{i}___', block_content)
-        elif block_type == 'inline':
-            content = content.replace(f'___INLINE_CODE_{i}___', block_content)
-    return content
-
-
-def fix_angle_brackets(content: str) -> tuple[str, list]:
+def fix_angle_brackets(content: str, zones: ZoneIndex) -> tuple[str, list]:
     """Fix angle brackets by converting them to parentheses."""
     fixes = []
 
     # Find and fix angle brackets
     angle_pattern = r'<([^>]+)>'
 
-    def replace_angle(match):
-        original = match.group(0)
-        inner = match.group(1)
-        replacement = f'({inner})'
+    def replace_angle(match, text):
+        start, end = match.span()
+        inner = text[match.start(1):match.end(1)]
         fixes.append({
             'type': 'angle_bracket',
-            'original': original,
-            'fixed': replacement
+            'original': text[start:end],
+            'fixed': f'({inner})'
         })
-        return replacement
+        # Only the brackets change; code inside them stays in place
+        return [(start, start + 1, '('), (end - 1, end, ')')]
 
-    fixed_content = re.sub(angle_pattern, replace_angle, content)
+    fixed_content = sub_outside_zones(angle_pattern, content, zones, replace_angle)
     return fixed_content, fixes
 
 
-def fix_wrapped_wikilinks(content: str) -> tuple[str, list]:
+def fix_wrapped_wikilinks(content: str, zones: ZoneIndex) -> tuple[str, list]:
     """Fix wrapped wikilinks by removing the wrapping."""
     fixes = []
 
@@ -88,108 +103,127 @@ def fix_wrapped_wikilinks(content: str) -> tuple[str, list]:
     ]
 
     for pattern, wrap_type in patterns:
-        def replace_wrapped(match):
-            original = match.group(0)
-            wikilink = match.group(1)
+        def replace_wrapped(match, text):
+            start, end = match.span()
+            link_start, link_end = match.span(1)
+            wikilink = text[link_start:link_end]
             fixes.append({
                 'type': 'wrapped_wikilink',
                 'wrap_type': wrap_type,
-                'original': original,
+                'original': text[start:end],
                 'fixed': wikilink
             })
-            return wikilink
+            # Drop the wrapping on both sides
+            return [(start, link_start, ''), (link_end, end, '')]
 
-        content = re.sub(pattern, replace_wrapped, content)
+        content = sub_outside_zones(pattern, content, zones, replace_wrapped)
 
     return content, fixes
 
 
+def fix_content(content: str, zones: ZoneIndex = None) -> tuple[str, list]:
+    """
+    Apply every fix outside code. zones (code zones of content) is
+    shifted along with the edits; scanned here if not given.
+    """
+    if zones is None:
+        zones = scan_protected_zones(content, CODE_KINDS)
+    content, angle_fixes = fix_angle_brackets(content, zones)
+    content, wikilink_fixes = fix_wrapped_wikilinks(content, zones)
+    return content, angle_fixes + wikilink_fixes
+
+
+def process(ctx: HookContext) -> None:
+    """Fix Obsidian syntax issues in the edited file (stage entry point)."""
+    # CRITICAL: Only run auto-fixes on Edit/Write, not Read
+    if ctx.tool_name not in ['Edit', 'Write']:
+        return
+
+    # Only check markdown files
+    if not ctx.file_path.endswith('.md'):
+        return
+
+    # Check if file exists
+    if not ctx.exists:
+        return
+
+    content = ctx.content
+    original_content = content
+
+    # Fix issues, leaving code blocks untouched (only around the edit if it can be located)
+    region = ctx.edit_region
+    if region is not None:
+        fixed, all_fixes = fix_content(region.text(content))
+        content = region.splice(content, fixed)
+    else:
+        content, all_fixes = fix_content(content, ctx.document.zones(CODE_KINDS))
+
+    # If fixes were made, hand content back for write-back and report
+    if all_fixes and content != original_content:
+        ctx.content = content
+
+        ctx.print(f"\n✓ Auto-Fixed Obsidian Syntax Issues in {ctx.path.name}:")
+        ctx.print("-" * 60)
+
+        # Group fixes by type
+        angle_bracket_fixes = [f for f in all_fixes if f['type'] == 'angle_bracket']
+        wikilink_fixes = [f for f in all_fixes if f['type'] == 'wrapped_wikilink']
+
+        if angle_bracket_fixes:
+            ctx.print(f"Angle Brackets ({len(angle_bracket_fixes)} fixed):")
+            for fix in angle_bracket_fixes[:5]:  # Show max 5
+                ctx.print(f"  {fix['original']} → {fix['fixed']}")
+            if len(angle_bracket_fixes) > 5:
+                ctx.print(f"  ... and {len(angle_bracket_fixes) - 5} more")
+
+        if wikilink_fixes:
+            ctx.print(f"\nWrapped Wikilinks ({len(wikilink_fixes)} fixed):")
+            for fix in wikilink_fixes[:5]:  # Show max 5
+                ctx.print(f"  {fix['original']} → {fix['fixed']}")
+            if len(wikilink_fixes) > 5:
+                ctx.print(f"  ... and {len(wikilink_fixes) - 5} more")
+
+        ctx.print("-" * 60)
+        ctx.print("")
+
+
+def run_batch_mode(argv: list) -> int:
+    """Fix every note under a directory; returns the exit code."""
+    from lib.vault_batch import run_batch
+
+    parser = argparse.ArgumentParser(prog='syntax-validate.py', description='Fix Obsidian syntax across a vault')
+    parser.add_argument('--batch', type=Path, required=True, metavar='DIR', help='Directory tree to fix')
+    parser.add_argument('--dry-run', action='store_true', help='Print diffs instead of writing')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    if not args.batch.is_dir():
+        print(f"Not a directory: {args.batch}", file=sys.stderr)
+        return 1
+
+    scanned = changed = total_fixes = errors = 0
+    for result in run_batch(args.batch, 'syntax-validate', 'fix_content', args.dry_run, args.workers):
+        scanned += 1
+        if result.error:
+            errors += 1
+            print(f"{result.rel_path}: {result.error}", file=sys.stderr)
+        elif result.fixes:
+            changed += 1
+            total_fixes += result.fixes
+            if args.dry_run:
+                print(result.diff, end='')
+            else:
+                print(f"{result.rel_path}: {result.fixes} fixed")
+
+    verb = 'Would fix' if args.dry_run else 'Fixed'
+    print(f"{verb} {total_fixes} issues in {changed} of {scanned} notes", file=sys.stderr if args.dry_run else sys.stdout)
+    return 1 if errors else 0
+
+
 def main():
-    try:
-        # Read hook input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # CRITICAL: Only run auto-fixes on Edit/Write, not Read
-        tool_name = hook_input.get('tool_name', '')
-        if tool_name not in ['Edit', 'Write']:
-            sys.exit(0)
-
-        # Get the file path from tool input
-        tool_input = hook_input.get('tool_input', {})
-        file_path = tool_input.get('file_path', '')
-
-        # Only check markdown files
-        if not file_path.endswith('.md'):
-            sys.exit(0)
-
-        # Check if file exists
-        path = Path(file_path)
-        if not path.exists():
-            sys.exit(0)
-
-        # Read file content
-        content = path.read_text(encoding='utf-8')
-        original_content = content
-
-        # Protect code blocks from modification
-        content, code_blocks = protect_code_blocks(content)
-
-        # Fix issues
-        all_fixes = []
-
-        # Fix angle brackets
-        content, angle_fixes = fix_angle_brackets(content)
-        all_fixes.extend(angle_fixes)
-
-        # Fix wrapped wikilinks
-        content, wikilink_fixes = fix_wrapped_wikilinks(content)
-        all_fixes.extend(wikilink_fixes)
-
-        # Restore code blocks
-        content = restore_code_blocks(content, code_blocks)
-
-        # If fixes were made, write back to file and report
-        if all_fixes and content != original_content:
-            path.write_text(content, encoding='utf-8')
-
-            print(f"\n✓ Auto-Fixed Obsidian Syntax Issues in {path.name}:")
-            print("-" * 60)
-
-            # Group fixes by type
-            angle_bracket_fixes = [f for f in all_fixes if f['type'] == 'angle_bracket']
-            wikilink_fixes = [f for f in all_fixes if f['type'] == 'wrapped_wikilink']
-
-            if angle_bracket_fixes:
-                print(f"Angle Brackets ({len(angle_bracket_fixes)} fixed):")
-                for fix in angle_bracket_fixes[:5]:  # Show max 5
-                    print(f"  {fix['original']} → {fix['fixed']}")
-                if len(angle_bracket_fixes) > 5:
-                    print(f"  ... and {len(angle_bracket_fixes) - 5} more")
-
-            if wikilink_fixes:
-                print(f"\nWrapped Wikilinks ({len(wikilink_fixes)} fixed):")
-                for fix in wikilink_fixes[:5]:  # Show max 5
-                    print(f"  {fix['original']} → {fix['fixed']}")
-                if len(wikilink_fixes) > 5:
-                    print(f"  ... and {len(wikilink_fixes) - 5} more")
-
-            print("-" * 60)
-            print("")
-
-        sys.exit(0)
-
-    except json.JSONDecodeError:
-        # No input or invalid JSON - skip silently
-        sys.exit(0)
-    except FileNotFoundError as e:
-        print(f"[flywheel] Syntax validator: File not found - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except PermissionError as e:
-        print(f"[flywheel] Syntax validator: Permission denied - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except Exception as e:
-        print(f"[flywheel] Syntax validator error: {type(e).__name__}: {e}", file=sys.stderr)
-        sys.exit(0)
+    if len(sys.argv) > 1:
+        sys.exit(run_batch_mode(sys.argv[1:]))
+    run_standalone(process, HOOK_LABEL)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,166 @@
+"""
+Achievement Detector Tests
+
+Tests for lib/achievement_detector.py:
+- check_for_achievements: every log line is classified in one pass
+  against the combined keyword alternation
+- write_achievements_to_file: duplicate checks against a fingerprint
+  index, and in-place inserts into the month section
+"""
+
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import achievement_detector
+from lib.achievement_detector import ACHIEVEMENT_KEYWORDS, check_for_achievements, write_achievements_to_file
+
+CONFIG = {'sections': {'log': '## Log'}}
+
+
+def per_keyword_scan(content: str) -> list:
+    """Reference: one re.finditer pass per keyword, first record per line wins."""
+    log_match = re.search(r'## Log\s*\n([\s\S]*?)(?=\n## |\n# |\Z)', content)
+    search_content = log_match.group(1) if log_match else content
+    achievements = []
+    for pattern in ACHIEVEMENT_KEYWORDS:
+        for match in re.finditer(pattern, search_content, re.IGNORECASE):
+            line_start = search_content.rfind('\n', 0, match.start()) + 1
+            line_end = search_content.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(search_content)
+            full_line = re.sub(r'^[-*]\s*', '', search_content[line_start:line_end].strip())
+            if len(full_line) > 10:
+                achievements.append({'keyword': match.group(), 'line': full_line, 'context': pattern})
+    seen = set()
+    return [a for a in achievements if not (a['line'] in seen or seen.add(a['line']))]
+
+
+def daily_note(*log_lines: str) -> str:
+    return "# 2026-01-05\n\n## Log\n" + "\n".join(log_lines) + "\n\n## Food\n- shipped pizza to the office\n"
+
+
+class TestCheckForAchievements:
+
+    def test_first_keyword_in_list_order_wins(self):
+        results = check_for_achievements(daily_note("- 10:15 Deployed the fix after we debugged it"), CONFIG)
+        # 'debugged' precedes 'deployed' in ACHIEVEMENT_KEYWORDS
+        assert results == [{'keyword': 'debugged',
+                            'line': '10:15 Deployed the fix after we debugged it',
+                            'context': 'debugged'}]
+
+    def test_keyword_inside_longer_match_is_found(self):
+        # 'PR\s*merged' matches first at its position, but 'merged' comes earlier in the list
+        results = check_for_achievements(daily_note("- 11:00 PR merged for the sync job"), CONFIG)
+        assert [(r['keyword'], r['context']) for r in results] == [('merged', 'merged')]
+
+    def test_only_log_section_and_long_lines(self):
+        results = check_for_achievements(daily_note("- done", "- 09:00 Wrote the design doc"), CONFIG)
+        assert [r['line'] for r in results] == ['09:00 Wrote the design doc']
+
+    def test_bold_does_not_span_lines(self):
+        results = check_for_achievements(daily_note("- **started on the", "- migration** today ok"), CONFIG)
+        assert all('\n' not in r['line'] for r in results)
+        assert [r['context'] for r in results] == ['started']
+
+    def test_case_changing_lowercase_line(self):
+        # 'İ' lowercases to two characters; such lines are matched as-is
+        results = check_for_achievements(daily_note("- İstanbul office: Shipped v2.0"), CONFIG)
+        assert [(r['keyword'], r['context']) for r in results] == [('Shipped', 'shipped')]
+
+    def test_matches_per_keyword_scan(self):
+        note = daily_note(
+            "- 08:30 Finally figured out the flaky test ✅",
+            "- 09:10 reviewed and approved the API changes",
+            "- 12:00 lunch with the team",
+            "- 14:45 Successfully deployed to production 🚀",
+            "- 23:10 JIRA 4411 closed, all tests pass",
+            "- 15:00 Reviewed and approved the API changes",
+            "* **Big milestone reached for Q1**",
+            "- 16:20 v1.9 released, zero downtime",
+        )
+        assert check_for_achievements(note, CONFIG) == per_keyword_scan(note)
+
+
+YEAR = datetime.now().strftime('%Y')
+
+
+@pytest.fixture
+def achievements_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(achievement_detector, "_index_memo", {})
+    path = tmp_path / "Achievements.md"
+    path.write_text(
+        f"# Achievements\n\n## {YEAR}\n\n### March {YEAR}\n- Shipped the billing export\n\n"
+        f"### February {YEAR}\n- Wrote the onboarding guide\n",
+        encoding='utf-8'
+    )
+    return path
+
+
+def entries(*lines: str) -> list:
+    return [{'keyword': '', 'line': line, 'context': ''} for line in lines]
+
+
+class TestWriteAchievements:
+
+    def test_inserts_into_month_section(self, achievements_file, tmp_path):
+        index_file = tmp_path / ".claude" / "achievements-index.json"
+        written = write_achievements_to_file(
+            entries("Fixed the sync timeout", "**Shipped** the billing export"),
+            achievements_file, target_month=f"March {YEAR}", index_file=index_file)
+
+        assert written == 1  # the second is a duplicate once normalized
+        assert achievements_file.read_text(encoding='utf-8') == (
+            f"# Achievements\n\n## {YEAR}\n\n### March {YEAR}\n- Shipped the billing export\n\n"
+            f"- Fixed the sync timeout\n\n### February {YEAR}\n- Wrote the onboarding guide\n"
+        )
+        assert index_file.exists()
+
+    def test_new_month_section_at_top_of_year(self, achievements_file):
+        write_achievements_to_file(entries("Fixed the sync timeout"), achievements_file,
+                                   target_month=f"April {YEAR}")
+        write_achievements_to_file(entries("Wrote the release notes"), achievements_file,
+                                   target_month=f"April {YEAR}")
+
+        content = achievements_file.read_text(encoding='utf-8')
+        assert content.startswith(
+            f"# Achievements\n\n## {YEAR}\n\n\n### April {YEAR}\n- Fixed the sync timeout\n\n"
+            f"- Wrote the release notes\n\n### March {YEAR}\n"
+        )
+
+    def test_sidecar_index_avoids_rereading_file(self, achievements_file, tmp_path, monkeypatch):
+        index_file = tmp_path / ".claude" / "achievements-index.json"
+        write_achievements_to_file(entries("Fixed the sync timeout"), achievements_file,
+                                   target_month=f"March {YEAR}", index_file=index_file)
+
+        # A fresh process: only the sidecar index is available
+        monkeypatch.setattr(achievement_detector, "_index_memo", {})
+        monkeypatch.setattr(achievement_detector, "build_achievements_index",
+                            lambda data: pytest.fail("Achievements.md was re-indexed"))
+        assert write_achievements_to_file(entries("Fixed the sync timeout"), achievements_file,
+                                          target_month=f"March {YEAR}", index_file=index_file) == 0
+        assert write_achievements_to_file(entries("Wrote the release notes"), achievements_file,
+                                          target_month=f"March {YEAR}", index_file=index_file) == 1
+
+    def test_hand_edit_is_reindexed(self, achievements_file, tmp_path):
+        index_file = tmp_path / ".claude" / "achievements-index.json"
+        write_achievements_to_file(entries("Fixed the sync timeout"), achievements_file,
+                                   target_month=f"March {YEAR}", index_file=index_file)
+
+        with open(achievements_file, 'a', encoding='utf-8') as f:
+            f.write("- Presented the roadmap to leadership\n")
+        assert write_achievements_to_file(entries("Presented the roadmap to leadership"), achievements_file,
+                                          target_month=f"March {YEAR}", index_file=index_file) == 0
+
+    def test_crlf_file_keeps_line_endings(self, achievements_file):
+        achievements_file.write_bytes(achievements_file.read_bytes().replace(b'\n', b'\r\n'))
+        write_achievements_to_file(entries("Fixed the sync timeout"), achievements_file,
+                                   target_month=f"March {YEAR}")
+
+        data = achievements_file.read_bytes()
+        assert b"- Shipped the billing export\r\n\r\n- Fixed the sync timeout\r\n\r\n### February" in data
+        assert data.count(b'\n') == data.count(b'\r\n')
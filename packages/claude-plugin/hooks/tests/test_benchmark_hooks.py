@@ -0,0 +1,95 @@
+"""
+Hook Benchmark Tests
+
+Smoke tests for scripts/benchmark-hooks.py: synthetic vault generation,
+one in-process round over every hook, and the threshold checks.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "benchmark-hooks.py"
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("flywheel_benchmark_hooks", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def vault_spec(bench):
+    return bench.VaultSpec(notes=40, fanout=2, entity_density=0.1, note_words=30,
+                           transcript_events=50, seed=3)
+
+
+class TestVaultGeneration:
+
+    def test_deterministic_and_reused(self, bench, vault_spec, tmp_path):
+        vault = bench.generate_vault(tmp_path / "a", vault_spec)
+        other = bench.generate_vault(tmp_path / "b", vault_spec)
+
+        notes = sorted(p.relative_to(vault).as_posix() for p in vault.rglob("*.md"))
+        assert len(notes) == 40
+        assert len({p.split("/")[0] for p in notes}) == 2
+        assert notes == sorted(p.relative_to(other).as_posix() for p in other.rglob("*.md"))
+        first = vault / notes[0]
+        assert first.read_text(encoding='utf-8') == (other / notes[0]).read_text(encoding='utf-8')
+        assert first.read_text(encoding='utf-8').startswith("---\ntype: area-")
+
+        first.write_text("changed", encoding='utf-8')
+        assert bench.generate_vault(tmp_path / "a", vault_spec) == vault
+        assert first.read_text(encoding='utf-8') == "changed"
+
+    def test_entity_names_unique(self, bench):
+        names = {bench.entity_name(i) for i in range(100000)}
+        assert len(names) == 100000
+
+
+class TestRunBenchmarks:
+
+    def test_inprocess_round(self, bench, vault_spec, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLAUDE_LOCAL_STATE_DIR", str(tmp_path / "unchanged"))
+        document = bench.run_benchmarks(tmp_path, [vault_spec], bench.HOOKS, ("inprocess",), runs=2,
+                                        log=lambda line: None)
+
+        results = document["results"]
+        assert [r["hook"] for r in results] == list(bench.HOOKS)
+        for result in results:
+            assert result["notes"] == 40 and result["runs"] == 2
+            assert 0 < result["median_ms"] <= result["max_ms"]
+
+        # The vault is left as generated, and the environment restored
+        vault = tmp_path / vault_spec.dir_name
+        assert not list(vault.rglob("Bench Scratch*"))
+        target = vault / vault_spec.note_path(vault_spec.notes // 2)
+        assert "call 1" not in target.read_text(encoding='utf-8')
+        assert (vault / ".claude" / "wikilink-entities.json").exists()
+        assert bench.os.environ["CLAUDE_LOCAL_STATE_DIR"] == str(tmp_path / "unchanged")
+
+
+class TestThresholds:
+
+    def result(self, median_ms):
+        return {"hook": "post-mutation", "mode": "inprocess", "notes": 1000, "median_ms": median_ms}
+
+    def test_budgets(self, bench):
+        budgets = {"post-mutation:inprocess:1000": 20}
+        assert bench.check_budgets([self.result(19.0)], budgets) == []
+        assert bench.check_budgets([self.result(25.0)], {}) == []
+        [failure] = bench.check_budgets([self.result(25.0)], budgets)
+        assert failure.startswith("post-mutation:inprocess:1000")
+
+    def test_regressions(self, bench):
+        baseline = [self.result(100.0)]
+        assert bench.check_regressions([self.result(120.0)], baseline, 0.25) == []
+        assert len(bench.check_regressions([self.result(130.0)], baseline, 0.25)) == 1
+        # Small absolute changes are noise
+        assert bench.check_regressions([self.result(1.5)], [self.result(1.0)], 0.25) == []
@@ -0,0 +1,89 @@
+"""
+Hook Bootstrap Tests
+
+Tests for lib/bootstrap.py, the fast rejection of calls a hook would
+ignore, done before any heavy import by hook-client.py and by each hook
+script run directly.
+"""
+
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.bootstrap import could_be_eligible, is_eligible, prefilter, should_run
+
+
+def call(tool_name: str, file_path: str) -> dict:
+    return {"tool_name": tool_name, "tool_input": {"file_path": file_path}}
+
+
+def imported_modules(hooks_dir: Path, args: list, hook_input: dict) -> set:
+    """Modules imported by a hook run (from python -X importtime)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=str(hooks_dir),
+                            input=json.dumps(hook_input), capture_output=True, text=True, timeout=10)
+    assert result.returncode == 0
+    return {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines()
+            if line.startswith("import time:")}
+
+
+class TestRules:
+
+    @pytest.mark.parametrize("hook, hook_input, expected", [
+        ("post-mutation", call("Edit", "/v/notes/a.md"), True),
+        ("post-mutation", call("Edit", "/v/.obsidian/a.md"), True),  # syntax-validate fixes these
+        ("post-mutation", call("Edit", "/v/script.py"), False),
+        ("post-mutation", call("Read", "/v/a.md"), False),
+        ("wikilink-auto", call("Write", "/v/.trash/a.md"), False),
+        ("wikilink-auto", call("Write", "../v/a.md"), True),
+        ("frontmatter-auto", call("Edit", "C:\\v\\.git\\a.md"), False),
+        ("verify-mutation", call("Edit", "/v/.claude/a.md"), False),
+        ("pre-mutation-gate", call("Write", "/v/script.py"), True),  # Gates 2 and 4 apply to every file
+        ("pre-mutation-gate", call("Edit", "/v/.claude/x.json"), False),
+        ("read-cache", call("Read", "/v/a.md"), True),
+        ("read-cache", call("Read", "/v/a.txt"), False),
+        ("unknown-hook", call("Read", "/v/a.txt"), True),
+    ])
+    def test_eligibility(self, hook, hook_input, expected):
+        assert is_eligible(hook, hook_input) is expected
+        assert should_run(hook, json.dumps(hook_input)) is expected
+
+    def test_malformed_input(self):
+        assert not should_run("post-mutation", "not json .md Edit")
+        assert not should_run("post-mutation", '[".md", "Edit"]')
+        assert not is_eligible("post-mutation", {"tool_name": "Edit", "tool_input": "a.md"})
+
+    def test_substring_test_rejects_without_parsing(self):
+        assert not could_be_eligible("post-mutation", json.dumps(call("Edit", "/v/a.py")))
+        assert not could_be_eligible("read-cache", json.dumps(call("Edit", "/v/a.md")))
+        assert could_be_eligible("post-mutation", json.dumps(call("Edit", "/v/a.md")))
+
+    def test_prefilter_puts_input_back(self, monkeypatch):
+        raw = json.dumps(call("Edit", "/v/a.md"))
+        monkeypatch.setattr(sys, "stdin", io.StringIO(raw))
+        prefilter("syntax-validate")
+        assert sys.stdin.read() == raw
+
+        monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps(call("Edit", "/v/a.py"))))
+        with pytest.raises(SystemExit) as exc:
+            prefilter("syntax-validate")
+        assert exc.value.code == 0
+
+
+class TestRejectedBeforeImports:
+
+    HEAVY = {"json", "socket", "pathlib", "re", "config.loader", "lib.hook_server", "lib.hook_context"}
+
+    def test_hook_client(self, hooks_dir):
+        modules = imported_modules(hooks_dir, ["hook-client.py", "post-mutation"], call("Edit", "/v/a.py"))
+        assert "lib.bootstrap" in modules
+        assert not modules & self.HEAVY
+
+    @pytest.mark.parametrize("script", ["wikilink-auto.py", "frontmatter-auto.py", "verify-mutation.py"])
+    def test_hook_script(self, hooks_dir, script):
+        modules = imported_modules(hooks_dir, [script], call("Write", "/v/data.csv"))
+        assert not modules & self.HEAVY
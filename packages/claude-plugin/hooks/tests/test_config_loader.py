@@ -0,0 +1,189 @@
+"""
+Config Loader Tests
+
+Tests for config/loader.py:
+- vault-root discovery, remembered per resolved start directory, and the
+  merged config, reused until .flywheel.json changes
+- get_config(): a read-only view that loads nothing until it is read
+  and never writes
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PLUGIN_DIR = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PLUGIN_DIR))
+from config import loader
+from config.loader import (
+    DEFAULTS, ensure_achievements_file, find_vault_root, get_config, is_state_root, load_config
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    """Each test starts like a new hook process: no in-memory memos."""
+    monkeypatch.setattr(loader, "_config_memo", {})
+    monkeypatch.setattr(loader, "_root_memo", {})
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / ".obsidian").mkdir(parents=True)
+    (vault / "Achievements.md").write_text("# Achievements\n", encoding='utf-8')
+    (vault / ".flywheel.json").write_text(json.dumps({"paths": {"daily_notes": "journal"}}), encoding='utf-8')
+    return vault
+
+
+class TestFindVaultRoot:
+
+    def test_remembers_root(self, vault, monkeypatch):
+        note_dir = vault / "a" / "b"
+        note_dir.mkdir(parents=True)
+        assert find_vault_root(note_dir) == vault
+
+        calls = []
+        real = loader.is_vault_root
+        monkeypatch.setattr(loader, "is_vault_root", lambda p: calls.append(p) or real(p))
+        assert find_vault_root(note_dir) == vault
+        assert calls == [vault]
+
+    def test_forgets_root_that_stopped_being_a_vault(self, tmp_path):
+        outer, inner = tmp_path / "outer", tmp_path / "outer" / "inner"
+        (outer / ".claude").mkdir(parents=True)
+        (inner / ".obsidian").mkdir(parents=True)
+        assert find_vault_root(inner) == inner
+
+        (inner / ".obsidian").rmdir()
+        assert find_vault_root(inner) == outer
+
+    def test_spellings_of_a_path_share_one_entry(self, vault, monkeypatch):
+        (vault / "people").mkdir()
+        monkeypatch.chdir(vault.parent)
+        assert find_vault_root(Path("vault")) == vault
+        assert find_vault_root(vault / "people" / "..") == vault
+        assert find_vault_root(vault) == vault
+        assert list(loader._root_memo) == [vault]
+
+    def test_memo_is_bounded(self, vault, monkeypatch):
+        monkeypatch.setattr(loader, "ROOT_MEMO_SIZE", 3)
+        folders = [vault / f"f{n}" for n in range(5)]
+        for folder in folders:
+            folder.mkdir()
+            find_vault_root(folder)
+        find_vault_root(folders[2])  # Used again: kept over older entries
+
+        assert list(loader._root_memo) == [folders[3], folders[4], folders[2]]
+
+
+class TestStateRoot:
+
+    def test_vault_folders(self, vault, tmp_path):
+        assert is_state_root(vault)
+        (tmp_path / "claude-only" / ".claude").mkdir(parents=True)
+        assert is_state_root(tmp_path / "claude-only")
+        assert not is_state_root(tmp_path)
+
+    def test_home_marked_only_by_user_claude(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        (home / ".claude").mkdir(parents=True)
+        monkeypatch.setenv("HOME", str(home))
+        assert not is_state_root(home)
+
+        (home / ".obsidian").mkdir()
+        assert is_state_root(home)
+
+
+class TestMergedConfig:
+
+    def test_merged_over_defaults(self, vault):
+        config = load_config(vault)
+
+        assert config["paths"]["daily_notes"] == "journal"
+        assert config["paths"]["weekly_notes"] == "weekly-notes"
+        assert config["paths"]["achievements"] == "Achievements.md"
+
+    def test_reused_until_flywheel_json_changes(self, vault, monkeypatch):
+        load_config(vault)
+        with monkeypatch.context() as patched:
+            patched.setattr(loader, "deep_merge", lambda *a: pytest.fail(".flywheel.json was merged again"))
+            assert load_config(vault)["paths"]["daily_notes"] == "journal"
+
+        config_file = vault / ".flywheel.json"
+        config_file.write_text(json.dumps({"paths": {"daily_notes": "days"}}), encoding='utf-8')
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_config(vault)["paths"]["daily_notes"] == "days"
+
+    def test_outside_a_vault(self, tmp_path, monkeypatch):
+        plain = tmp_path / "plain"
+        plain.mkdir()
+        monkeypatch.chdir(plain)
+
+        assert load_config()["paths"]["daily_notes"] == "daily-notes"
+        assert list(plain.iterdir()) == []
+
+    def test_callers_get_copies(self, vault):
+        config = load_config(vault)
+        config["paths"]["daily_notes"] = "changed"
+
+        assert load_config(vault)["paths"]["daily_notes"] == "journal"
+        assert get_config(vault)["paths"]["daily_notes"] == "journal"
+        assert DEFAULTS["paths"]["achievements"] == "Achievements.md"
+
+
+class TestConfigView:
+
+    def test_creating_a_view_does_no_io(self, monkeypatch):
+        monkeypatch.setattr(loader, "find_vault_root", lambda *a: pytest.fail("vault root looked up"))
+        monkeypatch.setattr(loader, "_load_merged", lambda *a: pytest.fail("config loaded"))
+        get_config()
+
+    def test_read_only(self, vault):
+        config = get_config(vault)
+
+        assert config["paths"]["daily_notes"] == "journal"
+        assert config.get("sections", {}).get("log") == "Log"
+        with pytest.raises(TypeError):
+            config["paths"]["daily_notes"] = "changed"
+        assert isinstance(config["folders"]["protected"], tuple)
+        assert config.to_dict()["folders"]["protected"] == [".obsidian", ".git", ".claude"]
+
+    def test_paths_resolved_against_vault(self, vault):
+        config = get_config(vault)
+        assert config.path("daily_notes") == vault / "journal"
+        assert config.path("achievements") == vault / "Achievements.md"
+
+    def test_import_stays_light(self):
+        # typing alone costs more than the rest of the loader
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys; import config.loader; print('typing' in sys.modules)"],
+            cwd=str(PLUGIN_DIR), capture_output=True, text=True, timeout=10)
+        assert result.stdout.strip() == "False"
+
+
+class TestAchievementsFile:
+
+    def test_loading_config_writes_nothing(self, vault):
+        (vault / "Achievements.md").unlink()
+
+        load_config(vault)
+        get_config(vault).load()
+        assert not (vault / "Achievements.md").exists()
+        assert not (vault / ".claude").exists()
+
+    def test_created_by_a_writing_caller(self, vault):
+        (vault / "Achievements.md").unlink()
+
+        assert ensure_achievements_file(vault, get_config(vault))
+        assert (vault / "Achievements.md").read_text(encoding='utf-8').startswith("# Achievements")
+
+    def test_configured_path_not_created(self, vault):
+        config = {"paths": {"achievements": "wins/Wins.md"}}
+        assert not ensure_achievements_file(vault, config)
+        assert not (vault / "wins").exists()
@@ -0,0 +1,194 @@
+"""
+Edit Region Tests
+
+Tests for lib/edit_region.py and the diff-scoped stages: on Edit, the
+PostToolUse stages analyze only the region around new_string (plus a
+margin) and fall back to the whole note when it cannot be located.
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.achievement_detector import check_for_achievements
+from lib.edit_region import find_edit_span, locate_edit_region
+from lib.hook_context import HookContext
+from lib.hook_loader import load_hook
+from lib.protected_zones import scan_protected_zones
+
+LINES = "".join(f"line {n}\n" for n in range(1, 21))
+
+
+def region_text(content, tool_input, margin=0):
+    region = locate_edit_region(content, tool_input, margin)
+    return region.text(content) if region is not None else None
+
+
+class TestLocateEditRegion:
+
+    def test_whole_lines_plus_margin(self):
+        region = locate_edit_region(LINES, {"new_string": "ne 10"}, margin=2)
+        assert region.text(LINES) == "line 8\nline 9\nline 10\nline 11\nline 12\n"
+        assert region.first_line == 8
+
+    def test_margin_clipped_at_edges(self):
+        assert region_text(LINES, {"new_string": "line 1\n"}, 3) == "line 1\nline 2\nline 3\nline 4\n"
+        assert region_text(LINES, {"new_string": "line 20"}, 2) == "line 18\nline 19\nline 20\n"
+
+    @pytest.mark.parametrize("tool_input", [
+        {"new_string": "not in the note"},
+        {"new_string": "line 1"},  # Also in line 10..19
+        {"new_string": "   "},
+        {"new_string": ""},
+        {},
+    ])
+    def test_not_located(self, tool_input):
+        assert locate_edit_region(LINES, tool_input) is None
+
+    def test_replace_all_spans_every_occurrence(self):
+        content = "a\nTODO x\nb\nc\nTODO y\nd\n"
+        assert find_edit_span(content, {"new_string": "TODO", "replace_all": True}) == (2, 17)
+        assert region_text(content, {"new_string": "TODO", "replace_all": True}) == "TODO x\nb\nc\nTODO y\n"
+
+    def test_includes_frontmatter_it_touches(self):
+        content = "---\ntype: note\n---\nEdited line\nrest\n"
+        assert region_text(content, {"new_string": "Edited"}, 1) == "---\ntype: note\n---\nEdited line\nrest\n"
+
+    def test_never_splits_code_block(self):
+        content = "intro\n```\ncode\nEDIT\nmore\n```\nafter\n"
+        assert region_text(content, {"new_string": "EDIT"}) == "```\ncode\nEDIT\nmore\n```\n"
+
+    def test_edit_opening_code_block_takes_whole_block(self):
+        content = "a\nEDIT %%\nhidden\n%%\nb\n"
+        assert region_text(content, {"new_string": "EDIT"}) == "EDIT %%\nhidden\n%%\n"
+
+    def test_unclosed_delimiter_is_not_a_zone(self):
+        content = "a\n$$\nEDIT\nb\n"
+        assert region_text(content, {"new_string": "EDIT"}) == "EDIT\n"
+
+    @pytest.mark.parametrize("content, expected", [
+        ("a\nrun `deploy\nEDIT` now\nb\n", "run `deploy\nEDIT` now\n"),
+        ("a\ncost $x +\nEDIT$ here\nb\n", "cost $x +\nEDIT$ here\n"),
+        ("a\n<span\nEDIT>\nb\n", "<span\nEDIT>\n"),
+        ("a\nsee [[Long\nEDIT]]\nb\n", "see [[Long\nEDIT]]\n"),
+        ("a\nEDIT `opens\ncloses` b\nc\n", "EDIT `opens\ncloses` b\n"),
+    ])
+    def test_inline_zones_across_lines(self, content, expected):
+        assert region_text(content, {"new_string": "EDIT"}) == expected
+
+    def test_rule_pair_not_read_as_frontmatter(self):
+        content = "intro\n---\nEDIT\n---\nafter\n"
+        assert region_text(content, {"new_string": "EDIT"}, 1) == "intro\n---\nEDIT\n---\n"
+
+    def test_region_tokenizes_like_whole_note(self):
+        rng = random.Random(21)
+        pieces = ["word ", "\n", "\n", "`", "```", "$", "$$", "%%", "<", ">", "[[", "]]", "[", "](", ")",
+                  "#tag ", "---\n", "http://x.io ", "Sarah Chen "]
+        for _ in range(500):
+            body = [rng.choice(pieces) for _ in range(rng.randint(0, 40))]
+            body.insert(rng.randint(0, len(body)), "EDIT")
+            content = "".join(body)
+            region = locate_edit_region(content, {"new_string": "EDIT"}, rng.randint(0, 2))
+            whole = [(start - region.start, end - region.start, kind)
+                     for start, end, kind in scan_protected_zones(content)
+                     if region.start <= start < region.end]
+            assert list(scan_protected_zones(region.text(content))) == whole, content
+
+
+def edit_context(path: Path, new_string: str, tool_name: str = "Edit"):
+    return HookContext({"tool_name": tool_name, "tool_input": {
+        "file_path": str(path), "old_string": "x", "new_string": new_string,
+    }})
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / ".claude").mkdir()
+    (tmp_path / ".claude" / "wikilink-entities.json").write_text(
+        json.dumps({"people": ["Sarah Chen"], "_metadata": {}}), encoding="utf-8")
+    (tmp_path / "notes").mkdir()
+    return tmp_path
+
+
+def long_note(edited_line: str) -> str:
+    """Issues far above the edit, then filler, then the edited line."""
+    return "Old <a> with Sarah Chen and [[open\n" + "filler\n" * 50 + edited_line + "\n" + "tail\n" * 5
+
+
+class TestScopedStages:
+
+    def test_syntax_fixes_only_region(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("New <b> here"), encoding="utf-8")
+        ctx = edit_context(note, "New <b> here")
+        load_hook("syntax-validate").process(ctx)
+        assert "New (b) here" in ctx.content
+        assert "Old <a>" in ctx.content
+
+    def test_syntax_falls_back_to_whole_note(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("New <b> here"), encoding="utf-8")
+        ctx = edit_context(note, "text that is not in the note")
+        load_hook("syntax-validate").process(ctx)
+        assert "Old (a)" in ctx.content and "New (b)" in ctx.content
+
+    def test_wikilinks_only_region(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("met Sarah Chen today"), encoding="utf-8")
+        ctx = edit_context(note, "met Sarah Chen today")
+        load_hook("wikilink-auto").process(ctx)
+        assert "met [[Sarah Chen]] today" in ctx.content
+        assert ctx.content.startswith("Old <a> with Sarah Chen and")
+
+    def test_wikilinks_skip_inline_code_opened_above_margin(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("`deploy\n  --env prod\n  --region eu\n  --owner\nSarah Chen` ran"),
+                        encoding="utf-8")
+        ctx = edit_context(note, "Sarah Chen` ran")
+        load_hook("wikilink-auto").process(ctx)
+        assert "[[Sarah Chen]]" not in ctx.content
+
+    def test_verify_reports_region_lines(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("See [[broken"), encoding="utf-8")
+        ctx = edit_context(note, "See [[broken")
+        load_hook("verify-mutation").process(ctx)
+        output = "".join(ctx.stdout)
+        assert "Line 52, column 5" in output
+        assert "Line 1," not in output
+
+    def test_write_analyzes_whole_note(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("See [[broken"), encoding="utf-8")
+        ctx = edit_context(note, "See [[broken", tool_name="Write")
+        assert ctx.edit_region is None
+        load_hook("verify-mutation").process(ctx)
+        assert "Line 1, column" in "".join(ctx.stdout)
+
+    def test_region_follows_content_changes(self, vault):
+        note = vault / "notes" / "log.md"
+        note.write_text(long_note("New <b> here"), encoding="utf-8")
+        ctx = edit_context(note, "New <b> here")
+        assert ctx.edit_region is not None
+        ctx.content = ctx.content.replace("New <b> here", "New (b) here")
+        assert ctx.edit_region is None
+
+
+class TestScopedAchievements:
+
+    CONFIG = {"sections": {"log": "## Log"}}
+    NOTE = "## Log\n- 09:00 Shipped the old release\n- 10:00 filler line here\n- 11:00 Deployed the new service\n## Notes\n- Shipped elsewhere entirely\n"
+
+    def test_span_limits_scan(self):
+        start = self.NOTE.index("- 11:00")
+        end = self.NOTE.index("## Notes")
+        lines = [a["line"] for a in check_for_achievements(self.NOTE, self.CONFIG, span=(start, end))]
+        assert lines == ["11:00 Deployed the new service"]
+
+    def test_span_outside_log_finds_nothing(self):
+        start = self.NOTE.index("- Shipped elsewhere")
+        assert check_for_achievements(self.NOTE, self.CONFIG, span=(start, len(self.NOTE))) == []
@@ -0,0 +1,138 @@
+"""
+Entity Matcher Tests
+
+Tests for lib/entity_matcher.py and its use in wikilink-auto.py. The
+automaton must find exactly what the per-entity regexes used to find.
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.entity_matcher import EntityMatcher
+from lib.entity_table import EntityTable
+from lib.hook_loader import load_hook
+from lib.protected_zones import scan_protected_zones
+
+
+@pytest.fixture(scope="module")
+def wikilink_auto():
+    return load_hook("wikilink-auto")
+
+
+def regex_occurrences(entities, text):
+    """Reference: the per-entity word-bounded, case-insensitive regex."""
+    found = set()
+    for entity in entities:
+        pattern = r'\b' + re.escape(entity) + r'\b'
+        for m in re.finditer(pattern, text, re.IGNORECASE):
+            found.add((m.start(), m.end(), entity))
+    return found
+
+
+def legacy_apply_wikilinks(content, entities, skip_zones):
+    """Reference: the previous regex-per-entity linking loop."""
+    new_content = content
+    links_added = 0
+    skip_zones = list(skip_zones)
+    for entity in sorted(set(entities), key=len, reverse=True):
+        pattern = r'\b' + re.escape(entity) + r'\b'
+        for match in re.finditer(pattern, new_content, re.IGNORECASE):
+            start, end = match.start(), match.end()
+            if not any(s <= start < e or s < end <= e for s, e in skip_zones):
+                new_content = new_content[:start] + f'[[{entity}]]' + new_content[end:]
+                links_added += 1
+                offset = len(f'[[{entity}]]') - (end - start)
+                skip_zones = [(s + offset if s > start else s, e + offset if e > start else e)
+                              for s, e in skip_zones]
+                skip_zones.append((start, start + len(f'[[{entity}]]')))
+                break
+    return new_content, links_added
+
+
+class TestEntityMatcher:
+    """Tests for the Aho-Corasick matcher."""
+
+    def test_finds_all_entities_in_one_pass(self):
+        matcher = EntityMatcher(['Sarah Chen', 'Acme Corp', 'Python'])
+        text = "Sarah Chen joined Acme Corp to write python."
+        assert matcher.entities_in(text) == {'Sarah Chen', 'Acme Corp', 'Python'}
+
+    def test_case_insensitive(self):
+        matcher = EntityMatcher(['TypeScript'])
+        assert matcher.find_all("we use TYPESCRIPT daily") == [(7, 17, 'TypeScript')]
+
+    def test_requires_word_boundaries(self):
+        matcher = EntityMatcher(['Java', 'API'])
+        assert matcher.find_all("JavaScript APIs and Java_x") == []
+        assert matcher.entities_in("Java, then API.") == {'Java', 'API'}
+
+    def test_overlapping_and_nested_entities(self):
+        matcher = EntityMatcher(['Acme', 'Acme Corp', 'Corp'])
+        found = set(matcher.find_all("Acme Corp"))
+        assert found == {(0, 4, 'Acme'), (0, 9, 'Acme Corp'), (5, 9, 'Corp')}
+
+    def test_entities_with_punctuation(self):
+        matcher = EntityMatcher(['C++', 'Node.js'])
+        # Same \b semantics as the regex: no boundary after a trailing '+'
+        assert regex_occurrences(['C++', 'Node.js'], "C++ and Node.js") == set(
+            matcher.find_all("C++ and Node.js")
+        )
+
+    def test_empty_inputs(self):
+        assert EntityMatcher([]).find_all("text") == []
+        assert EntityMatcher(['x']).find_all("") == []
+        assert len(EntityMatcher(['', 'a', 'a'])) == 1
+
+    def test_matches_regex_on_random_text(self):
+        rng = random.Random(7)
+        words = ['ab', 'abc', 'bc', 'b', 'Ab C', 'c_d', 'é', 'Éa', 'x.y', 'ς']
+        alphabet = 'abcABCdxy _.,éÉςσ-\n'
+        for _ in range(200):
+            entities = rng.sample(words, rng.randint(1, len(words)))
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            assert set(EntityMatcher(entities).find_all(text)) == regex_occurrences(entities, text)
+
+
+class TestApplyWikilinks:
+    """apply_wikilinks gives the same result as the regex loop it replaced."""
+
+    def test_links_first_occurrence_longest_first(self, wikilink_auto):
+        content = "Acme Corp met Acme. Acme Corp again."
+        result, count = wikilink_auto.apply_wikilinks(content, ['Acme', 'Acme Corp'])
+        assert result == "[[Acme Corp]] met [[Acme]]. Acme Corp again."
+        assert count == 2
+
+    def test_skips_protected_zones(self, wikilink_auto):
+        content = "`Sarah Chen` and [[Sarah Chen]] then Sarah Chen."
+        result, count = wikilink_auto.apply_wikilinks(content, ['Sarah Chen'])
+        assert result == "`Sarah Chen` and [[Sarah Chen]] then [[Sarah Chen]]."
+        assert count == 1
+
+    def test_matches_legacy_loop(self, wikilink_auto):
+        rng = random.Random(11)
+        words = ['Ann', 'Ann Lee', 'Lee', 'Bo', 'Bob', 'x', 'Lee Bo']
+        tokens = ['Ann', 'Lee', 'Bo', 'Bob', 'x', ' ', ' ', '.', '`', '[[', ']]', '#', '\n']
+        for _ in range(300):
+            entities = rng.sample(words, rng.randint(1, len(words)))
+            content = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 25)))
+
+            # Both implementations start from the same protected zones
+            zones = [(start, end) for start, end, _ in scan_protected_zones(content)]
+
+            expected = legacy_apply_wikilinks(content, entities, zones)
+            assert wikilink_auto.apply_wikilinks(content, entities) == expected, content
+
+
+class TestLinkableCandidates:
+    """Pattern 3 of find_linkable_candidates searches the entity table."""
+
+    def test_existing_entities_mixed_case_only(self, wikilink_auto):
+        existing = EntityTable.from_cache({'other': ['TypeScript', 'python', 'API', 'GitHub']})
+        content = "Ported the API from typescript, hosted on github with python."
+        candidates = wikilink_auto.find_linkable_candidates(content, existing)
+        assert sorted(candidates.get('Existing Entities', [])) == ['GitHub', 'TypeScript']
@@ -0,0 +1,142 @@
+"""
+Entity Table Tests
+
+Tests for lib/entity_table.py (the mmap-able binary entity cache) and
+how wikilink-cache.py writes it and wikilink-auto.py loads it.
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.entity_matcher import EntityMatcher
+from lib.entity_table import (
+    FORMAT_VERSION, HEADER, MAGIC, MIXED_CASE, EntityTable, encode_entity_table
+)
+from lib.hook_loader import load_hook
+from lib.wikilink_entities import TABLE_FILE, upsert_page
+
+CACHE = {
+    "people": ["Sarah Chen", "Mike Jones"],
+    "technologies": ["Python", "TypeScript", "GitHub"],
+    "acronyms": ["API", "Api"],
+    "other": ["éclair", "Zoë"],
+    "_metadata": {"total_entities": 9},
+}
+
+
+@pytest.fixture
+def table():
+    return EntityTable.from_cache(CACHE)
+
+
+class TestEntityTable:
+
+    def test_names_and_categories(self, table):
+        assert len(table) == 9
+        assert set(table) == {n for k, v in CACHE.items() if k != "_metadata" for n in v}
+        assert table.categories == ["acronyms", "other", "people", "technologies"]
+
+    def test_exact_membership(self, table):
+        assert "Sarah Chen" in table
+        assert "sarah chen" not in table
+        assert "API" in table and "Api" in table and "api" not in table
+        assert "Zoë" in table
+        assert "Sarah" not in table
+        assert None not in table
+
+    def test_lookup_is_case_insensitive(self, table):
+        assert sorted(name for name, _ in table.lookup("api")) == ["API", "Api"]
+        [(name, flags)] = table.lookup("GITHUB")
+        assert name == "GitHub"
+        assert flags & MIXED_CASE
+        assert flags & (1 << table.categories.index("technologies"))
+
+    def test_find_all_mixed_case_only(self, table):
+        text = "Ported the API from typescript, hosted on github with python."
+        assert table.entities_in(text, MIXED_CASE) == {"TypeScript", "GitHub", "Python", "Api"}
+        assert table.entities_in(text) == {"TypeScript", "GitHub", "Python", "API", "Api"}
+
+    def test_find_all_overlapping(self):
+        table = EntityTable.from_cache({"other": ["Acme", "Acme Corp", "Corp"]})
+        assert set(table.find_all("Acme Corp")) == {(0, 4, "Acme"), (0, 9, "Acme Corp"), (5, 9, "Corp")}
+
+    def test_find_all_matches_automaton_on_random_text(self):
+        rng = random.Random(7)
+        words = ["ab", "abc", "bc", "b", "Ab C", "c_d", "é", "Éa", "x.y", "ς", "C++", "Node.js"]
+        alphabet = "abcABCdxy _.+,éÉςσ-\n"
+        for _ in range(300):
+            entities = rng.sample(words, rng.randint(1, len(words)))
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            table = EntityTable.from_cache({"other": entities})
+            assert set(table.find_all(text)) == set(EntityMatcher(entities).find_all(text)), text
+
+    def test_empty(self):
+        table = EntityTable.from_cache({})
+        assert len(table) == 0
+        assert "x" not in table
+        assert table.find_all("text") == []
+
+    def test_rejects_other_versions_and_truncation(self):
+        data = encode_entity_table(CACHE)
+        with pytest.raises(ValueError):
+            EntityTable(HEADER.pack(MAGIC, FORMAT_VERSION + 1, 0, 0, 0))
+        with pytest.raises(ValueError):
+            EntityTable(data[:HEADER.size + 20])
+        with pytest.raises(ValueError):
+            EntityTable(b"{}")
+
+    def test_load_maps_file(self, tmp_path, table):
+        path = tmp_path / TABLE_FILE
+        path.write_bytes(encode_entity_table(CACHE))
+        loaded = EntityTable.load(path)
+        assert set(loaded) == set(table)
+        assert "Mike Jones" in loaded
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / "people").mkdir()
+    (tmp_path / "people" / "Sarah Chen.md").write_text("", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestCacheFiles:
+
+    def test_rebuild_writes_table(self, vault):
+        load_hook("wikilink-cache").rebuild_wikilink_cache()
+        table = EntityTable.load(vault / ".claude" / TABLE_FILE)
+        assert "Sarah Chen" in table and "people/Sarah Chen" in table
+
+    def test_upsert_updates_table(self, vault):
+        load_hook("wikilink-cache").rebuild_wikilink_cache()
+        assert upsert_page(vault, "projects/Zephyr.md", []) == ["Zephyr", "projects/Zephyr"]
+        assert "Zephyr" in EntityTable.load(vault / ".claude" / TABLE_FILE)
+
+    def test_auto_reads_table_without_parsing_json(self, vault, monkeypatch):
+        load_hook("wikilink-cache").rebuild_wikilink_cache()
+        wikilink_auto = load_hook("wikilink-auto")
+        monkeypatch.setattr(wikilink_auto.json, "loads", lambda *a, **k: pytest.fail("JSON parsed"))
+        assert "Sarah Chen" in wikilink_auto.load_wikilinks_from_cache(vault)
+
+    def test_auto_falls_back_to_newer_json(self, vault):
+        cache_file = vault / ".claude" / "wikilink-entities.json"
+        table_file = vault / ".claude" / TABLE_FILE
+        load_hook("wikilink-cache").rebuild_wikilink_cache()
+
+        # JSON-only cache (hand edited, or written by an older version)
+        cache_file.write_text(json.dumps({"people": ["Mike Jones"]}), encoding="utf-8")
+        future = time.time_ns() + 10_000_000_000
+        os.utime(cache_file, ns=(future, future))
+
+        table = load_hook("wikilink-auto").load_wikilinks_from_cache(vault)
+        assert set(table) == {"Mike Jones"}
+        assert set(EntityTable.load(table_file)) == {"Mike Jones"}  # Written for next time
@@ -0,0 +1,175 @@
+"""
+Frontmatter Convention Tests
+
+Tests for frontmatter-auto.py folder conventions, queried from the vault
+index (lib/vault_index.py), which re-reads only notes that changed.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import vault_index
+from lib.hook_loader import load_hook
+from lib.markdown_document import MarkdownDocument
+
+
+@pytest.fixture
+def frontmatter_auto():
+    return load_hook("frontmatter-auto")
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    people = vault / "people"
+    people.mkdir(parents=True)
+    (vault / ".obsidian").mkdir()
+    for name, role in [("Ana", "engineer"), ("Ben", "engineer"), ("Cy", "manager"), ("Di", "engineer")]:
+        (people / f"{name}.md").write_text(
+            f"---\ntype: person\nrole: {role}\nactive: true\n---\n# {name}\n", encoding='utf-8')
+    (people / "Notes.md").write_text("No frontmatter here\n", encoding='utf-8')
+    return vault
+
+
+def full_scan(frontmatter_auto, folder: Path, exclude_file: Path = None) -> dict:
+    """Reference: read every note and compute conventions from scratch."""
+    total, fields = 0, {}
+    for note in sorted(folder.glob("*.md")):
+        if exclude_file and note.name == exclude_file.name:
+            continue
+        frontmatter = MarkdownDocument(note.read_text(encoding='utf-8')).fields
+        counted = {key: vault_index.field_text(value) for key, value in frontmatter.items()
+                   if key.lower() not in frontmatter_auto.SKIP_FIELDS}
+        total += bool(frontmatter)  # Every note with frontmatter, as the original scan did
+        for key, value in counted.items():
+            stats = fields.setdefault(key, {'count': 0, 'values': {}})
+            stats['count'] += 1
+            stats['values'][value] = stats['values'].get(value, 0) + 1
+    return frontmatter_auto.conventions_from_stats(total, fields)
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Names of the notes the index reads."""
+    names = []
+    real = vault_index.read_note
+    monkeypatch.setattr(vault_index, "read_note", lambda p: names.append(p.name) or real(p))
+    return names
+
+
+class TestFolderConventions:
+
+    def test_infers_common_fields(self, frontmatter_auto, vault):
+        folder = vault / "people"
+        conventions = frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+
+        assert conventions["type"]["common_value"] == "person"
+        assert conventions["role"]["common_value"] == "engineer"
+        assert conventions["active"]["common_value"] == "true"
+        # The edited note is left out: 3 notes with frontmatter remain
+        assert conventions["type"]["frequency"] == 1.0
+        assert (vault / ".claude" / "vault-index.db").is_file()
+
+    def test_only_changed_notes_are_read(self, frontmatter_auto, vault, reads):
+        folder = vault / "people"
+        frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+        assert sorted(reads) == ["Ana.md", "Ben.md", "Cy.md", "Notes.md"]
+
+        reads.clear()
+        frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+        assert reads == []
+
+        (folder / "Ben.md").write_text("---\ntype: person\nrole: manager\nactive: true\n---\n", encoding='utf-8')
+        (folder / "Eve.md").write_text("---\ntype: person\nrole: manager\n---\n", encoding='utf-8')
+        conventions = frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+
+        assert sorted(reads) == ["Ben.md", "Eve.md"]
+        assert conventions["role"]["common_value"] == "manager"
+        # 'active' is now in 3 of 4 notes
+        assert "active" not in conventions
+
+    def test_removed_notes_are_subtracted(self, frontmatter_auto, vault):
+        folder = vault / "people"
+        frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+
+        (folder / "Ana.md").unlink()
+        (folder / "Ben.md").unlink()
+        assert frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault) == {}
+
+    def test_persisted_across_processes(self, frontmatter_auto, vault, reads):
+        folder = vault / "people"
+        first = frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+
+        # Every call opens the index file afresh; nothing is kept in memory
+        reads.clear()
+        assert frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault) == first
+        assert reads == []
+
+    def test_corrupt_index_is_replaced(self, frontmatter_auto, vault):
+        folder = vault / "people"
+        (vault / ".claude").mkdir()
+        (vault / ".claude" / "vault-index.db").write_bytes(b"not a database" * 100)
+        assert frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)["type"]["common_value"] == "person"
+
+    def test_matches_full_scan_after_edits(self, frontmatter_auto, vault):
+        folder = vault / "people"
+        frontmatter_auto.scan_folder_conventions(folder, folder / "Ana.md", vault)
+
+        (folder / "Cy.md").write_text("---\ntype: person\nrole: engineer\nteam: core\n---\n", encoding='utf-8')
+        (folder / "Notes.md").write_text("---\ntype: person\nteam: core\n---\n", encoding='utf-8')
+        (folder / "Ben.md").unlink()
+
+        for edited in ["Ana.md", "Cy.md", "Di.md", "Notes.md"]:
+            assert (frontmatter_auto.scan_folder_conventions(folder, folder / edited, vault)
+                    == full_scan(frontmatter_auto, folder, folder / edited))
+
+    def test_notes_with_only_skipped_fields_count(self, frontmatter_auto, tmp_path):
+        vault = tmp_path / "mixed"
+        folder = vault / "people"
+        folder.mkdir(parents=True)
+        (vault / ".obsidian").mkdir()
+        for n in range(3):
+            (folder / f"Person {n}.md").write_text("---\ntype: person\n---\n", encoding='utf-8')
+        for n in range(7):
+            (folder / f"Tagged {n}.md").write_text("---\ntags: [people]\n---\n", encoding='utf-8')
+
+        # 'type' is in 3 of 10 notes with frontmatter, well under MIN_FREQUENCY
+        conventions = frontmatter_auto.scan_folder_conventions(folder, folder / "New.md", vault)
+        assert conventions == {} == full_scan(frontmatter_auto, folder, folder / "New.md")
+
+    def test_no_index_written_outside_a_vault(self, frontmatter_auto, vault):
+        (vault / ".obsidian").rmdir()
+        folder = vault / "people"
+        conventions = frontmatter_auto.scan_folder_conventions(folder, folder / "Di.md", vault)
+
+        assert conventions["type"]["common_value"] == "person"
+        assert not (vault / ".claude").exists()
+
+    def test_fields_added_in_first_seen_order(self, frontmatter_auto, tmp_path):
+        vault = tmp_path / "ordered"
+        folder = vault / "projects"
+        folder.mkdir(parents=True)
+        (vault / ".obsidian").mkdir()
+        for name in ("Alpha", "Beta", "Gamma"):
+            (folder / f"{name}.md").write_text("---\ntype: project\nstatus: active\n---\n", encoding='utf-8')
+        new_note = folder / "Delta.md"
+        new_note.write_text("# Delta\n", encoding='utf-8')
+
+        load_hook("post-mutation").dispatch(
+            {"tool_name": "Write", "tool_input": {"file_path": str(new_note)}})
+
+        assert new_note.read_text(encoding='utf-8').startswith("---\ntype: project\nstatus: active\n---\n")
+
+    def test_post_mutation_adds_missing_fields(self, frontmatter_auto, vault):
+        new_note = vault / "people" / "Fay.md"
+        new_note.write_text("---\nrole: engineer\n---\n# Fay\n", encoding='utf-8')
+
+        load_hook("post-mutation").dispatch(
+            {"tool_name": "Write", "tool_input": {"file_path": str(new_note)}})
+
+        content = new_note.read_text(encoding='utf-8')
+        assert "type: person" in content
+        assert "active: true" in content
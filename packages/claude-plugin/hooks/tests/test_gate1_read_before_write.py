@@ -6,6 +6,7 @@ Gate 1 checks both transcript history AND session cache (for context summarizati
 """
 
 import json
+import sys
 from pathlib import Path
 
 import pytest
@@ -19,6 +20,9 @@ from .helpers import (
     assert_ask,
 )
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import transcript_index as transcript_index_module
+
 
 class TestGate1ReadBeforeWrite:
     """Tests for Gate 1: Read Before Write enforcement."""
@@ -319,3 +323,60 @@ class TestGate1EdgeCases:
 
         # Should be blocked (file B not read)
         assert_deny(result, "Must Read")
+
+
+class TestTranscriptIndex:
+    """Gate 1 indexes the transcript incrementally (lib/transcript_index.py)."""
+
+    @pytest.fixture
+    def transcript_index(self):
+        transcript_index_module._memo.clear()
+        return transcript_index_module
+
+    def test_only_new_tail_is_parsed(self, transcript_index, tmp_path, temp_transcript, monkeypatch):
+        first, second = str(tmp_path / "a.md"), str(tmp_path / "b.md")
+        write_transcript_events(temp_transcript, [
+            {"type": "text", "text": "hello"},
+            make_read_event(first),
+        ])
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), first)
+
+        decoded = []
+        real_loads = json.loads
+        monkeypatch.setattr(transcript_index.json, "loads", lambda b: decoded.append(b) or real_loads(b))
+
+        with open(temp_transcript, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "text", "text": "no tool use"}) + "\n")
+            f.write(json.dumps(make_read_event(second)) + "\n")
+
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), second)
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), first)
+        # Only the appended Read line was decoded (the index is memoized in-process)
+        assert len(decoded) == 1
+
+    def test_index_persists_between_processes(self, transcript_index, tmp_path, temp_transcript):
+        file_path = str(tmp_path / "a.md")
+        write_transcript_events(temp_transcript, [make_read_event(file_path)])
+        transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), file_path)
+
+        index = json.loads((tmp_path / "s.transcript.json").read_text(encoding="utf-8"))
+        assert index["offset"] == temp_transcript.stat().st_size
+        assert index["reads"] == [str(Path(file_path).resolve())]
+
+        transcript_index._memo.clear()
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), file_path)
+
+    def test_rewritten_transcript_is_reindexed(self, transcript_index, tmp_path, temp_transcript):
+        old, new = str(tmp_path / "old.md"), str(tmp_path / "new.md")
+        write_transcript_events(temp_transcript, [make_read_event(old)])
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), old)
+
+        # Same length, different content
+        write_transcript_events(temp_transcript, [make_read_event(new)])
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), new)
+        assert not transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), old)
+
+    def test_unterminated_last_line(self, transcript_index, tmp_path, temp_transcript):
+        file_path = str(tmp_path / "a.md")
+        temp_transcript.write_text(json.dumps(make_read_event(file_path)), encoding="utf-8")
+        assert transcript_index.has_transcript_read(tmp_path, "s", str(temp_transcript), file_path)
@@ -11,10 +11,18 @@ This is a "soft" gate - it warns but doesn't block or auto-fix.
 
 import subprocess
 import json
+import sys
+import time
 from pathlib import Path
 
 import pytest
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.hook_loader import load_hook
+
+# Upper bound for validating a 1 MB note (the scan is linear; this is slack)
+WIKILINK_BUDGET_MS = 1000
+
 
 class TestGate6PostValidation:
     """Gate 6: Post-execution validation of file mutations."""
@@ -295,3 +303,51 @@ Normal text with [[valid link]].
 
         # Should not crash
         assert exit_code == 0
+
+
+class TestWikilinkValidation:
+    """validate_wikilinks: per-line tokenization with line/column reporting."""
+
+    @pytest.fixture
+    def validate(self):
+        return load_hook("verify-mutation").validate_wikilinks
+
+    def located(self, issues):
+        return [(issue['type'], issue['line'], issue['column']) for issue in issues]
+
+    @pytest.mark.parametrize("content, expected", [
+        ("# Test\n\nSee [[broken link here\n", [('wikilink_unclosed', 3, 5)]),
+        ("[[a [[b]] c]] x", [('wikilink_nested', 1, 1)]),
+        ("[[ok]] [[b [[c]] d]]", [('wikilink_nested', 1, 8)]),
+        ("[[a [[b]]", [('wikilink_unclosed', 1, 1)]),
+        ("See [[valid]] and [[other|alias]].", []),
+        ("]] stray close [[fine]]", []),
+    ])
+    def test_reports_line_and_column(self, validate, content, expected):
+        assert self.located(validate(content)) == expected
+
+    def test_skips_code(self, validate):
+        content = "```\n[[not a link\n```\n`[[code` and ``a ` [[b`` then [[real]]\n"
+        assert validate(content) == []
+
+    def test_unmatched_backtick_is_literal(self, validate):
+        assert self.located(validate("x ` [[open")) == [('wikilink_unclosed', 1, 5)]
+
+    def test_nested_excerpt_keeps_code(self, validate):
+        issue, = validate("[[a `[[b` [[c]] d]]")
+        assert "`[[b`" in issue['message']
+
+    def test_nested_excerpt_is_bounded(self, validate):
+        issue, = validate("[[" + "a" * 200 + " [[b]] c]]")
+        assert issue['message'].endswith("...")
+        assert len(issue['message']) < 120
+
+    @pytest.mark.parametrize("content", [
+        pytest.param("Met [[Alice]] about `deploy` for [[Project X|X]]; see [[Notes\n" * 12000, id="note"),
+        pytest.param("[[a " * 250000, id="unclosed-line"),  # Was quadratic
+        pytest.param("`x` [[a [[b]] " * 75000, id="code-and-nesting"),
+    ])
+    def test_one_megabyte_within_budget(self, validate, content):
+        start = time.perf_counter()
+        validate(content)
+        assert (time.perf_counter() - start) * 1000 < WIKILINK_BUDGET_MS
@@ -0,0 +1,198 @@
+"""
+Hook Server Tests
+
+Tests for hook-server.py / hook-client.py: forwarding hook calls to a
+long-lived server over a Unix socket, and in-process fallback when no
+server is running.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from .helpers import assert_ask, assert_deny, make_edit_input, run_hook
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import hook_server
+from lib.hook_loader import load_hook
+
+requires_unix_socket = pytest.mark.skipif(
+    not hasattr(socket, 'AF_UNIX'), reason="Unix sockets not available"
+)
+
+
+def run_client(hooks_dir, hook, hook_input, cwd=None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(hooks_dir / "hook-client.py"), hook],
+        input=json.dumps(hook_input),
+        capture_output=True,
+        text=True,
+        timeout=10,
+        encoding='utf-8',
+        cwd=cwd
+    )
+
+
+@pytest.fixture
+def running_server(hooks_dir, gate1_cache_dir):
+    """Start hook-server.py in the foreground process of a child."""
+    proc = subprocess.Popen(
+        [sys.executable, str(hooks_dir / "hook-server.py"), "serve"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        if hook_server.send_request({'command': 'ping'}):
+            break
+        time.sleep(0.05)
+    else:
+        proc.kill()
+        pytest.fail("hook server did not start")
+
+    yield proc
+
+    hook_server.send_request({'command': 'shutdown'})
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+class TestHookClientFallback:
+    """Without a server the client runs the hook in-process."""
+
+    def test_fallback_runs_pre_mutation_gate(self, hooks_dir, temp_vault, session_id, gate1_cache_dir):
+        """Gate 1 still blocks an unread edit when no server is running."""
+        file_path = str(temp_vault / "existing.md")
+        result = run_client(hooks_dir, "pre-mutation-gate", make_edit_input(file_path, session_id))
+
+        assert result.returncode == 0
+        assert_deny(json.loads(result.stdout), "GATE 1")
+
+    def test_unknown_hook_is_ignored(self, hooks_dir):
+        result = run_client(hooks_dir, "not-a-hook", {})
+        assert result.returncode == 0
+        assert result.stdout == ""
+
+    def test_fallback_matches_direct_hook(self, hooks_dir, temp_vault, session_id, gate1_cache_dir):
+        """Client output is identical to running the hook script directly."""
+        file_path = str(temp_vault / "new-note.md")
+        hook_input = {
+            "tool_name": "Write",
+            "tool_input": {"file_path": file_path, "content": "x"},
+            "session_id": session_id
+        }
+
+        direct = run_hook(hooks_dir / "pre-mutation-gate.py", hook_input)
+        via_client = json.loads(run_client(hooks_dir, "pre-mutation-gate", hook_input).stdout)
+
+        assert via_client == direct
+
+
+@pytest.fixture
+def silent_server(gate1_cache_dir):
+    """A socket that accepts connections but never answers (a busy or hung server)."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(hook_server.socket_path())
+    server.listen(16)
+    yield server
+    server.close()
+    os.unlink(hook_server.socket_path())
+
+
+@requires_unix_socket
+class TestServerTimeout:
+    """A server that does not answer never lets the gate fail open."""
+
+    def test_gate_runs_in_process(self, hooks_dir, temp_vault, session_id, silent_server):
+        file_path = str(temp_vault / "existing.md")
+        started = time.monotonic()
+        result = run_client(hooks_dir, "pre-mutation-gate", make_edit_input(file_path, session_id))
+
+        assert result.returncode == 0
+        assert_deny(json.loads(result.stdout), "GATE 1")
+        assert time.monotonic() - started < hook_server.RESPONSE_TIMEOUT
+
+    def test_post_mutation_is_not_run_twice(self, hooks_dir, tmp_path, silent_server):
+        note = tmp_path / "note.md"
+        note.write_text("Use <angle> brackets.\n", encoding='utf-8')
+        result = run_client(hooks_dir, "post-mutation",
+                            {"tool_name": "Write", "tool_input": {"file_path": str(note)}})
+
+        assert result.returncode == 0
+        assert "timed out" in result.stderr
+        assert note.read_text(encoding='utf-8') == "Use <angle> brackets.\n"
+
+
+@requires_unix_socket
+class TestHookServer:
+    """Hook calls forwarded to a running server."""
+
+    def test_server_answers_gate_checks(self, hooks_dir, temp_vault, session_id, running_server):
+        # Read goes through the server, then the Edit is allowed to ask
+        file_path = str(temp_vault / "existing.md")
+        run_client(hooks_dir, "read-cache", {
+            "tool_name": "Read",
+            "tool_input": {"file_path": file_path},
+            "session_id": session_id
+        })
+
+        result = run_client(hooks_dir, "pre-mutation-gate", make_edit_input(file_path, session_id))
+        assert_ask(json.loads(result.stdout), "GATE 4")
+
+    def test_server_runs_post_mutation_in_caller_cwd(self, hooks_dir, tmp_path, running_server):
+        vault = tmp_path / "vault"
+        (vault / ".claude").mkdir(parents=True)
+        (vault / ".claude" / "wikilink-entities.json").write_text(
+            json.dumps({"people": ["Sarah Chen"]}), encoding='utf-8'
+        )
+        note = vault / "note.md"
+        note.write_text("Call with Sarah Chen.\n", encoding='utf-8')
+
+        result = run_client(hooks_dir, "post-mutation", {
+            "tool_name": "Edit",
+            "tool_input": {"file_path": str(note)}
+        }, cwd=vault)
+
+        assert result.returncode == 0
+        assert "Auto-Applied 1 Wikilinks" in result.stdout
+        assert note.read_text(encoding='utf-8') == "Call with [[Sarah Chen]].\n"
+
+    def test_status_and_stop(self, hooks_dir, running_server):
+        status = subprocess.run(
+            [sys.executable, str(hooks_dir / "hook-server.py"), "status"],
+            capture_output=True, text=True, timeout=10
+        )
+        assert status.returncode == 0
+        assert "running" in status.stdout
+
+        stop = subprocess.run(
+            [sys.executable, str(hooks_dir / "hook-server.py"), "stop"],
+            capture_output=True, text=True, timeout=10
+        )
+        assert stop.returncode == 0
+        running_server.wait(timeout=5)
+        assert hook_server.send_request({'command': 'ping'}) is None
+
+
+class TestWarmCaches:
+    """Caches reused across calls in a long-lived process."""
+
+    def test_entity_cache_reused_until_file_changes(self, tmp_path):
+        wikilink_auto = load_hook("wikilink-auto")
+        cache_file = tmp_path / ".claude" / "wikilink-entities.json"
+        cache_file.parent.mkdir()
+        cache_file.write_text(json.dumps({"people": ["Sarah Chen"]}), encoding='utf-8')
+
+        first = wikilink_auto.load_wikilinks_from_cache(tmp_path)
+        assert wikilink_auto.load_wikilinks_from_cache(tmp_path) is first
+
+        cache_file.write_text(json.dumps({"people": ["Sarah Chen", "Mike Jones"]}), encoding='utf-8')
+        os.utime(cache_file, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+        assert set(wikilink_auto.load_wikilinks_from_cache(tmp_path)) == {"Sarah Chen", "Mike Jones"}
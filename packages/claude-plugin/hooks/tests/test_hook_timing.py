@@ -0,0 +1,174 @@
+"""
+Hook Timing Tests
+
+Tests for lib/hook_timing.py and hook-timing.py:
+- nothing is recorded unless FLYWHEEL_HOOK_TIMING=1
+- one JSONL record per hook call, with per-stage wall time and counts
+- log rotation and the p50/p95/p99 summary
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import hook_timing
+from lib.hook_server import run_hook_main
+from lib.hook_timing import current, load_records, percentile, summarize, timed_hook
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    state = tmp_path / "state"
+    monkeypatch.setenv("CLAUDE_LOCAL_STATE_DIR", str(state))
+    monkeypatch.delenv("FLYWHEEL_HOOK_TIMING", raising=False)
+    return state
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / ".claude").mkdir(parents=True)
+    (vault / ".claude" / "wikilink-entities.json").write_text(
+        json.dumps({"people": ["Sarah Chen"], "_metadata": {}}), encoding='utf-8')
+    (vault / "Sarah Chen.md").write_text("# Sarah Chen\n", encoding='utf-8')
+    return vault
+
+
+def edit_input(note: Path) -> str:
+    return json.dumps({"tool_name": "Edit", "tool_input": {"file_path": str(note)}})
+
+
+class TestTimedHook:
+
+    def test_disabled_by_default(self, state_dir):
+        with timed_hook("post-mutation") as timer:
+            with timer.stage("read"):
+                pass
+            timer.count("entities", 3)
+        assert timer is hook_timing.NULL_TIMER
+        assert not (state_dir / hook_timing.LOG_FILE).exists()
+
+    def test_record_per_call(self, state_dir, monkeypatch):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        with pytest.raises(SystemExit):
+            with timed_hook("read-cache", served=True):
+                with current().stage("stdin"):
+                    current().count("entities", 2)
+                    current().count("entities", 3)
+                sys.exit(0)
+
+        [record] = load_records()
+        assert record["hook"] == "read-cache"
+        assert record["served"] is True
+        assert set(record["stages"]) == {"stdin"}
+        assert record["counts"] == {"entities": 5}
+        assert record["total_ms"] >= record["stages"]["stdin"]
+        assert current() is hook_timing.NULL_TIMER
+
+    def test_nested_calls_share_record(self, state_dir, monkeypatch):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        with timed_hook("post-mutation") as outer:
+            with timed_hook("wikilink-auto") as inner:
+                assert inner is outer
+        assert [r["hook"] for r in load_records()] == ["post-mutation"]
+
+    def test_rotation(self, state_dir, monkeypatch):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        monkeypatch.setattr(hook_timing, "MAX_LOG_BYTES", 200)
+        for _ in range(10):
+            with timed_hook("read-cache"):
+                pass
+
+        log = state_dir / hook_timing.LOG_FILE
+        assert log.with_name(log.name + ".1").exists()
+        assert log.stat().st_size < 400
+        assert 0 < len(load_records()) < 10
+
+
+class TestInstrumentedHooks:
+
+    def test_post_mutation_stages(self, state_dir, monkeypatch, vault):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        note = vault / "note.md"
+        note.write_text("Met with Sarah Chen about <stuff>.\n", encoding='utf-8')
+
+        result = run_hook_main("post-mutation", edit_input(note))
+
+        assert result["exit_code"] == 0
+        [record] = load_records()
+        assert record["hook"] == "post-mutation"
+        assert record["served"] is False
+        for stage in ("stdin", "read", "vault_root", "config", "syntax-validate",
+                      "wikilink-auto", "frontmatter-auto", "write_back"):
+            assert stage in record["stages"], stage
+        assert record["counts"]["entities"] == 1
+        assert record["counts"]["regex_passes"] > 0
+
+    def test_pre_mutation_gate_stages(self, state_dir, monkeypatch, tmp_path):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        note = tmp_path / "note.md"
+        note.write_text("# Note\n", encoding='utf-8')
+        hook_input = {"tool_name": "Edit", "session_id": "timing-test",
+                      "tool_input": {"file_path": str(note)}}
+
+        run_hook_main("pre-mutation-gate", json.dumps(hook_input))
+
+        [record] = load_records()
+        assert {"stdin", "journal"} <= set(record["stages"])
+
+    def test_session_start_hooks(self, hooks_dir, state_dir, monkeypatch, vault):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        (vault / "people").mkdir()
+        (vault / "people" / "Ana.md").write_text("", encoding='utf-8')
+        for hook in ("session-gate", "session-start", "wikilink-cache", "wikilink-cache"):
+            subprocess.run([sys.executable, str(hooks_dir / f"{hook}.py")], cwd=str(vault),
+                           input="{}", capture_output=True, text=True, timeout=30)
+
+        records = load_records()
+        assert [r["hook"] for r in records] == ["session-gate", "session-start", "wikilink-cache", "wikilink-cache"]
+        full, incremental = records[2], records[3]
+        assert full["counts"]["files_scanned"] == 2
+        assert {"scan", "write"} <= set(full["stages"])
+        assert full["background"] is False
+        assert incremental["counts"].get("files_scanned", 0) <= 2
+        assert incremental["counts"]["dirs_listed"] + incremental["counts"]["dirs_unchanged"] == 2
+
+
+class TestSummary:
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([7.0], 99) == 7.0
+
+    def test_summarize(self):
+        records = [{"hook": "read-cache", "total_ms": float(ms), "stages": {"stdin": ms / 10},
+                    "counts": {"entities": 4}} for ms in range(1, 21)]
+        summary = summarize(records)["read-cache"]
+        assert summary["calls"] == 20
+        assert summary["total"] == {50: 10.0, 95: 19.0, 99: 20.0}
+        assert summary["stages"]["stdin"][50] == 1.0
+        assert summary["counts"] == {"entities": 4}
+
+    def test_cli_summary(self, hooks_dir, state_dir, monkeypatch):
+        monkeypatch.setenv("FLYWHEEL_HOOK_TIMING", "1")
+        for _ in range(3):
+            with timed_hook("read-cache"):
+                with current().stage("append"):
+                    pass
+
+        result = subprocess.run([sys.executable, str(hooks_dir / "hook-timing.py"), "summary"],
+                                capture_output=True, text=True, timeout=10)
+        assert result.returncode == 0
+        assert "read-cache  (3 calls)" in result.stdout
+        assert "append" in result.stdout
+
+        result = subprocess.run([sys.executable, str(hooks_dir / "hook-timing.py"), "summary", "post-mutation"],
+                                capture_output=True, text=True, timeout=10)
+        assert result.returncode == 1
@@ -0,0 +1,134 @@
+"""
+Markdown Document Tests
+
+Tests for lib/markdown_document.py, the single parse of a note shared by
+the post-mutation stages through ctx.document.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.hook_context import HookContext
+from lib.hook_loader import load_hook
+from lib.markdown_document import MarkdownDocument, parse_document
+from lib.protected_zones import CODE_KINDS
+
+
+@pytest.fixture(scope="module")
+def frontmatter_auto():
+    return load_hook("frontmatter-auto")
+
+
+class TestFrontmatter:
+
+    @pytest.mark.parametrize("content, fields, body", [
+        ("---\ntype: person\nstatus: active\n---\nBody\n", {"type": "person", "status": "active"}, "Body\n"),
+        ("---\ntitle: x\n---", {"title": "x"}, ""),  # Closing line without a newline
+        ("---\n---\nBody", {}, "Body"),
+        ("No frontmatter\n", {}, "No frontmatter\n"),
+        ("---\ntitle: x\nnever closed\n", {}, "---\ntitle: x\nnever closed\n"),
+    ])
+    def test_fields_and_body(self, content, fields, body):
+        document = MarkdownDocument(content)
+        assert document.fields == fields
+        assert document.body == body
+
+    def test_value_types(self):
+        document = MarkdownDocument(
+            "---\nname: \"Quoted: yes\"\ntags: [\"a\", \"b\"]\ndraft: true\nn: 3\nx: 1.5\n---\n"
+        )
+        assert document.fields == {
+            "name": "Quoted: yes", "tags": ["a", "b"], "draft": True, "n": 3, "x": 1.5,
+        }
+
+    def test_unclosed(self):
+        assert MarkdownDocument("---\ntitle: x\n").frontmatter_unclosed
+        assert not MarkdownDocument("---\ntitle: x\n---\n").frontmatter_unclosed
+        assert not MarkdownDocument("plain").frontmatter_unclosed
+
+    def test_frontmatter_text(self):
+        document = MarkdownDocument("---\na: 1\nb: 2\n---\nBody")
+        assert document.frontmatter_lines == ["a: 1", "b: 2"]
+        assert document.frontmatter_text == "a: 1\nb: 2"
+
+    def test_parse_frontmatter_unchanged(self, frontmatter_auto):
+        content = "---\ntype: person\n---\nBody\n"
+        assert frontmatter_auto.parse_frontmatter(content) == ({"type": "person"}, "Body\n", 21)
+        assert frontmatter_auto.parse_frontmatter("Body") == ({}, "Body", 0)
+
+
+class TestZonesAndLinks:
+
+    CONTENT = "Intro [[Alice|Al]] and [site](http://a.b)\n```\n[[Not a link]]\n```\n`[[Code]]` [[Bob#Work]]\n"
+
+    def test_zones_are_private_copies(self):
+        document = MarkdownDocument(self.CONTENT)
+        zones = document.zones()
+        zones.add(0, 3, "wikilink")
+        assert len(document.zones()) == len(zones) - 1
+
+    def test_zones_per_kind_set(self):
+        document = MarkdownDocument(self.CONTENT)
+        assert {kind for _, _, kind in document.zones(CODE_KINDS)} <= set(CODE_KINDS)
+        assert any(kind == "wikilink" for _, _, kind in document.zones())
+
+    def test_links_outside_code(self):
+        document = MarkdownDocument(self.CONTENT)
+        assert [link.target for link in document.wikilinks] == ["Alice", "Bob"]
+        assert [link.target for link in document.markdown_links] == ["http://a.b"]
+        first = document.wikilinks[0]
+        assert self.CONTENT[first.start:first.end] == "[[Alice|Al]]"
+
+
+class TestHeadings:
+
+    CONTENT = "---\ntitle: x\n---\n# Top\ntext\n## Log\n- one\n```\n# not a heading\n```\n## Next\n# Other\n"
+
+    def test_headings_outside_code(self):
+        document = MarkdownDocument(self.CONTENT)
+        assert [(h.level, h.text) for h in document.headings] == [(1, "Top"), (2, "Log"), (2, "Next"), (1, "Other")]
+
+    def test_sections(self):
+        document = MarkdownDocument(self.CONTENT)
+        log = document.section("log")
+        assert self.CONTENT[log.heading.start:log.end].startswith("## Log\n- one\n")
+        assert self.CONTENT[log.end:].startswith("## Next")
+        top = document.section("Top")
+        assert self.CONTENT[top.end:] == "# Other\n"
+        assert document.section("Missing") is None
+
+
+class TestOffsets:
+
+    def test_line_col(self):
+        document = MarkdownDocument("ab\ncd\n\nef")
+        assert document.line_col(0) == (1, 1)
+        assert document.line_col(4) == (2, 2)
+        assert document.line_col(7) == (4, 1)
+
+    def test_byte_offset(self):
+        document = MarkdownDocument("é[[x]]")
+        assert document.byte_offset(1) == 2
+
+
+class TestSharedDocument:
+
+    def test_same_content_same_document(self):
+        content = "# Shared\n[[Link]]\n"
+        assert parse_document(content) is parse_document(content)
+        assert parse_document(content + "more") is not parse_document(content)
+
+    def test_context_document_follows_content(self, tmp_path):
+        (tmp_path / ".obsidian").mkdir()
+        note = tmp_path / "note.md"
+        note.write_text("---\ntype: a\n---\n", encoding="utf-8")
+        ctx = HookContext({"tool_name": "Edit", "tool_input": {"file_path": str(note)}})
+        first = ctx.document
+        assert first.fields == {"type": "a"}
+        assert ctx.document is first
+
+        ctx.content = "---\ntype: b\n---\n"
+        assert ctx.document.fields == {"type": "b"}
@@ -0,0 +1,300 @@
+"""
+Post-Mutation Dispatcher Tests
+
+Tests for post-mutation.py, the single PostToolUse Edit/Write entry point
+that runs verify-mutation, syntax-validate, wikilink-auto, frontmatter-auto
+and achievement-detect in one interpreter.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.hook_loader import load_hook
+
+
+def run_dispatcher(hooks_dir, hook_input, cwd=None) -> tuple:
+    """Run post-mutation.py and return (stdout, stderr, exit_code)."""
+    result = subprocess.run(
+        [sys.executable, str(hooks_dir / "post-mutation.py")],
+        input=json.dumps(hook_input) if not isinstance(hook_input, str) else hook_input,
+        capture_output=True,
+        text=True,
+        timeout=10,
+        encoding='utf-8',
+        cwd=cwd
+    )
+    return result.stdout, result.stderr, result.returncode
+
+
+@pytest.fixture
+def vault(tmp_path):
+    """Vault with an entity cache and a note to edit."""
+    vault = tmp_path / "vault"
+    (vault / ".claude").mkdir(parents=True)
+    (vault / ".claude" / "wikilink-entities.json").write_text(
+        json.dumps({"people": ["Sarah Chen"], "_metadata": {}}),
+        encoding='utf-8'
+    )
+    (vault / "Sarah Chen.md").write_text("# Sarah Chen\n", encoding='utf-8')
+    return vault
+
+
+class TestPostMutationDispatcher:
+    """Tests for the combined PostToolUse dispatcher."""
+
+    def test_runs_all_stages_in_one_pass(self, hooks_dir, vault):
+        """Syntax fixes and wikilinks are both applied to the same file."""
+        note = vault / "note.md"
+        note.write_text("Met with Sarah Chen about <stuff>.\n", encoding='utf-8')
+
+        stdout, _, code = run_dispatcher(hooks_dir, {
+            "tool_name": "Edit",
+            "tool_input": {"file_path": str(note)}
+        }, cwd=vault)
+
+        assert code == 0
+        content = note.read_text(encoding='utf-8')
+        assert "[[Sarah Chen]]" in content
+        assert "(stuff)" in content
+        assert "Auto-Fixed Obsidian Syntax Issues" in stdout
+        assert "Auto-Applied 1 Wikilinks" in stdout
+
+    def test_reports_verification_issues(self, hooks_dir, vault):
+        """Gate 6 warnings from verify-mutation are part of combined output."""
+        note = vault / "broken.md"
+        note.write_text("---\ntitle: test\nno closing marker", encoding='utf-8')
+
+        stdout, _, code = run_dispatcher(hooks_dir, {
+            "tool_name": "Write",
+            "tool_input": {"file_path": str(note)}
+        }, cwd=vault)
+
+        assert code == 0
+        assert "never closed" in stdout
+
+    def test_ignores_other_tools(self, hooks_dir, vault):
+        """Non Edit/Write tools produce no output and no changes."""
+        note = vault / "note.md"
+        note.write_text("Met with Sarah Chen.\n", encoding='utf-8')
+
+        stdout, stderr, code = run_dispatcher(hooks_dir, {
+            "tool_name": "Read",
+            "tool_input": {"file_path": str(note)}
+        }, cwd=vault)
+
+        assert code == 0
+        assert stdout == ""
+        assert note.read_text(encoding='utf-8') == "Met with Sarah Chen.\n"
+
+    def test_handles_invalid_input_gracefully(self, hooks_dir):
+        """Invalid JSON exits 0 without output."""
+        stdout, _, code = run_dispatcher(hooks_dir, "not valid json")
+        assert code == 0
+        assert stdout == ""
+
+    def test_writes_back_at_most_once(self, vault, monkeypatch):
+        """Modified content from every stage is written in a single write."""
+        note = vault / "note.md"
+        note.write_text("Met with Sarah Chen about <stuff>.\n", encoding='utf-8')
+        monkeypatch.chdir(vault)
+
+        writes = []
+        original_write_text = Path.write_text
+
+        def counting_write_text(self, data, *args, **kwargs):
+            if self == note:
+                writes.append(data)
+            return original_write_text(self, data, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "write_text", counting_write_text)
+
+        dispatcher = load_hook("post-mutation")
+        ctx = dispatcher.dispatch({
+            "tool_name": "Edit",
+            "tool_input": {"file_path": str(note)}
+        })
+
+        assert len(writes) == 1
+        assert "[[Sarah Chen]]" in writes[0] and "(stuff)" in writes[0]
+        assert not ctx.stderr
+
+    def test_stage_scripts_still_run_standalone(self, hooks_dir, vault):
+        """Individual stage scripts keep working with the stdin protocol."""
+        note = vault / "note.md"
+        note.write_text("Use <angle> brackets.\n", encoding='utf-8')
+
+        result = subprocess.run(
+            [sys.executable, str(hooks_dir / "syntax-validate.py")],
+            input=json.dumps({"tool_name": "Edit", "tool_input": {"file_path": str(note)}}),
+            capture_output=True,
+            text=True,
+            timeout=10,
+            encoding='utf-8'
+        )
+
+        assert result.returncode == 0
+        assert note.read_text(encoding='utf-8') == "Use (angle) brackets.\n"
+
+
+class TestContentDigests:
+    """Stages are skipped for content they already processed."""
+
+    def run(self, note, stages):
+        from lib.hook_context import HookContext, run_stages
+        ctx = HookContext({"tool_name": "Edit", "tool_input": {"file_path": str(note)}})
+        run_stages(ctx, stages, "Test")
+        return ctx
+
+    def test_unchanged_content_skips_stage(self, vault):
+        note = vault / "note.md"
+        note.write_text("Plain note.\n", encoding='utf-8')
+        calls = []
+
+        def stage(ctx):
+            calls.append(ctx.content)
+
+        self.run(note, [(stage, "Stage")])
+        self.run(note, [(stage, "Stage")])
+        assert len(calls) == 1
+
+        # Trailing whitespace does not count as a change
+        note.write_text("Plain note.   \n\n", encoding='utf-8')
+        self.run(note, [(stage, "Stage")])
+        assert len(calls) == 1
+
+        note.write_text("Plain note, edited.\n", encoding='utf-8')
+        self.run(note, [(stage, "Stage")])
+        assert len(calls) == 2
+
+    def test_failed_stage_runs_again(self, vault):
+        note = vault / "note.md"
+        note.write_text("Plain note.\n", encoding='utf-8')
+        calls = []
+
+        def failing(ctx):
+            calls.append(1)
+            raise ValueError("boom")
+
+        assert self.run(note, [(failing, "Failing")]).stderr
+        self.run(note, [(failing, "Failing")])
+        assert len(calls) == 2
+
+    def test_stages_recorded_only_for_content_they_processed(self, vault, monkeypatch):
+        note = vault / "note.md"
+        note.write_text("Met with Sarah Chen about <stuff>.\n", encoding='utf-8')
+        monkeypatch.chdir(vault)
+        dispatcher = load_hook("post-mutation")
+        event = {"tool_name": "Edit", "tool_input": {"file_path": str(note)}}
+
+        first = dispatcher.dispatch(event)
+        assert "Auto-Applied 1 Wikilinks" in "".join(first.stdout)
+
+        linked = note.read_text(encoding='utf-8')
+        from lib import hook_context
+        ran = []
+        real_run_stage = hook_context.run_stage
+        monkeypatch.setattr(hook_context, "run_stage",
+                            lambda ctx, process, label: ran.append(label) or real_run_stage(ctx, process, label))
+        second = dispatcher.dispatch(event)
+
+        # Stages up to the last change had not seen the linked content; the rest had
+        assert ran == ["Verify mutation", "Syntax validator", "Wikilink suggest", "Post-mutation"]
+        assert second.stdout == [] and not second.stderr
+        assert note.read_text(encoding='utf-8') == linked
+
+        ran.clear()
+        dispatcher.dispatch(event)
+        assert ran == ["Post-mutation"]  # only the (no-op) write-back
+
+    def test_region_run_does_not_count_for_the_whole_note(self, vault, monkeypatch):
+        note = vault / "note.md"
+        note.write_text("Talked with Sarah Chen today.\n" + "".join(f"line {i}.\n" for i in range(20)), encoding='utf-8')
+        monkeypatch.chdir(vault)
+        load_hook("wikilink-cache").rebuild_wikilink_cache()  # So no build starts between the runs
+        wikilink_auto = load_hook("wikilink-auto")
+        stages = [(wikilink_auto.process, wikilink_auto.HOOK_LABEL)]
+        from lib.hook_context import HookContext, run_stages
+
+        # An Edit far from the mention: wikilink-auto only looks at its region
+        edit = HookContext({"tool_name": "Edit", "tool_input": {
+            "file_path": str(note), "old_string": "line 15.", "new_string": "line 15."}})
+        run_stages(edit, stages, "Test")
+        assert "[[" not in note.read_text(encoding='utf-8')
+
+        # The same content written whole is still processed whole
+        write = HookContext({"tool_name": "Write", "tool_input": {"file_path": str(note)}})
+        run_stages(write, stages, "Test")
+        assert note.read_text(encoding='utf-8').startswith("Talked with [[Sarah Chen]] today.\n")
+
+    def test_no_store_outside_a_vault(self, tmp_path, monkeypatch):
+        plain, home = tmp_path / "plain", tmp_path / "home"
+        (home / ".claude").mkdir(parents=True)
+        plain.mkdir()
+        monkeypatch.setenv("HOME", str(home))
+        calls = []
+
+        def stage(ctx):
+            calls.append(1)
+
+        # The cwd fallback, and $HOME found through the user-level ~/.claude
+        for folder in (plain, home / "notes"):
+            folder.mkdir(exist_ok=True)
+            monkeypatch.chdir(folder)
+            note = folder / "note.md"
+            note.write_text("Plain note.\n", encoding='utf-8')
+            self.run(note, [(stage, "Stage")])
+            self.run(note, [(stage, "Stage")])
+
+        assert len(calls) == 4
+        assert not (plain / ".claude").exists()
+        assert list((home / ".claude").iterdir()) == []
+
+    def test_shared_code_change_runs_stages_again(self, vault, monkeypatch, tmp_path):
+        from lib import content_digest
+        lib_dir = tmp_path / "lib"
+        lib_dir.mkdir()
+        (lib_dir / "helper.py").write_text("X = 1\n", encoding='utf-8')
+        monkeypatch.setattr(content_digest, "SHARED_CODE_DIRS", (lib_dir,))
+        note = vault / "note.md"
+        note.write_text("Plain note.\n", encoding='utf-8')
+        calls = []
+
+        def stage(ctx):
+            calls.append(1)
+
+        self.run(note, [(stage, "Stage")])
+        self.run(note, [(stage, "Stage")])
+        (lib_dir / "helper.py").write_text("X = 22\n", encoding='utf-8')
+        self.run(note, [(stage, "Stage")])
+        assert len(calls) == 2
+
+    def test_entity_cache_change_reruns_wikilinks(self, vault, monkeypatch):
+        note = vault / "note.md"
+        note.write_text("Shipped the zephyr release.\n", encoding='utf-8')
+        monkeypatch.chdir(vault)
+        wikilink_auto = load_hook("wikilink-auto")
+        self.run(note, [(wikilink_auto.process, wikilink_auto.HOOK_LABEL)])
+        assert "[[" not in note.read_text(encoding='utf-8')
+
+        (vault / ".claude" / "wikilink-entities.json").write_text(
+            json.dumps({"people": ["Sarah Chen"], "projects": ["Zephyr"], "_metadata": {}}), encoding='utf-8')
+        self.run(note, [(wikilink_auto.process, wikilink_auto.HOOK_LABEL)])
+        assert note.read_text(encoding='utf-8') == "Shipped the [[Zephyr]] release.\n"
+
+    def test_config_change_runs_stages_again(self, vault):
+        note = vault / "note.md"
+        note.write_text("Plain note.\n", encoding='utf-8')
+        calls = []
+
+        def stage(ctx):
+            calls.append(1)
+
+        self.run(note, [(stage, "Stage")])
+        (vault / ".flywheel.json").write_text(json.dumps({"paths": {"daily_notes": "journal"}}), encoding='utf-8')
+        self.run(note, [(stage, "Stage")])
+        assert len(calls) == 2
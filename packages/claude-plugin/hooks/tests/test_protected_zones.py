@@ -0,0 +1,131 @@
+"""
+Protected Zones Tests
+
+Tests for lib/protected_zones.py (single-pass tokenizer and zone index) and
+for syntax-validate.py, which now fixes content around code via the index.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.hook_loader import load_hook
+from lib.protected_zones import (
+    CODE_KINDS, ZoneIndex, apply_edits, find_frontmatter_end, scan_protected_zones
+)
+
+
+@pytest.fixture(scope="module")
+def syntax_validate():
+    return load_hook("syntax-validate")
+
+
+def kinds_of(zones, content):
+    return [(kind, content[start:end]) for start, end, kind in zones]
+
+
+class TestScanProtectedZones:
+    """One tokenizer pass over the document."""
+
+    def test_finds_every_zone_kind(self):
+        content = (
+            "---\ntitle: x\n---\n"
+            "```\ncode\n``` and `inline` [[Link]] [md](http://a.b)\n"
+            "https://example.com #tag <b> %%note%% $x$\n"
+        )
+        assert kinds_of(scan_protected_zones(content), content) == [
+            ('frontmatter', "---\ntitle: x\n---\n"),
+            ('fenced_code', "```\ncode\n```"),
+            ('inline_code', "`inline`"),
+            ('wikilink', "[[Link]]"),
+            ('markdown_link', "[md](http://a.b)"),
+            ('url', "https://example.com"),
+            ('hashtag', "#tag"),
+            ('html_tag', "<b>"),
+            ('comment', "%%note%%"),
+            ('math', "$x$"),
+        ]
+
+    def test_zones_do_not_overlap(self):
+        # The tag inside the fence and the URL inside the link are not separate zones
+        content = "```\n#tag\n``` [site](https://x.y)"
+        assert kinds_of(scan_protected_zones(content), content) == [
+            ('fenced_code', "```\n#tag\n```"),
+            ('markdown_link', "[site](https://x.y)"),
+        ]
+
+    def test_kinds_filter(self):
+        content = "Use <b> and `<i>`"
+        zones = scan_protected_zones(content, CODE_KINDS)
+        assert kinds_of(zones, content) == [('inline_code', "`<i>`")]
+
+    def test_frontmatter_end(self):
+        assert find_frontmatter_end("---\na: 1\n---\nbody") == len("---\na: 1\n---\n")
+        assert find_frontmatter_end("---\na: 1\nbody") == 0
+        assert find_frontmatter_end("no frontmatter") == 0
+        assert find_frontmatter_end("---") == 0
+
+
+class TestZoneIndex:
+    """Lookups and edits on the sorted index."""
+
+    def test_lookup(self):
+        zones = ZoneIndex([(10, 20, 'a'), (30, 40, 'b')])
+        assert zones.contains(10) and zones.contains(19)
+        assert not zones.contains(20) and not zones.contains(5)
+        assert zones.zone_at(35) == (30, 40, 'b')
+        assert zones.overlaps(15, 25)
+        assert zones.overlaps(5, 45)
+        assert not zones.overlaps(20, 30)
+        assert not zones.overlaps(0, 10)
+
+    def test_merges_overlapping_input(self):
+        zones = ZoneIndex([(0, 5, 'a'), (3, 8, 'b'), (8, 9, 'c')])
+        assert list(zones) == [(0, 8, 'a'), (8, 9, 'c')]
+
+    def test_add_keeps_order(self):
+        zones = ZoneIndex([(0, 5, 'a'), (20, 25, 'b')])
+        zones.add(10, 12, 'wikilink')
+        assert [z[0] for z in zones] == [0, 10, 20]
+        with pytest.raises(ValueError):
+            zones.add(11, 15, 'wikilink')
+
+    def test_shift_follows_edits(self):
+        text = "aa `x` bb `y` cc"
+        zones = scan_protected_zones(text)
+        edits = [(0, 2, 'AAAA'), (7, 9, ''), (14, 16, 'C')]
+        new_text = apply_edits(text, edits)
+        zones.shift(edits)
+        assert [new_text[s:e] for s, e, _ in zones] == ['`x`', '`y`']
+
+    def test_mask_and_strip(self):
+        text = "a `b` c"
+        zones = scan_protected_zones(text)
+        assert zones.mask(text) == "a \x00\x00\x00 c"
+        assert zones.strip(text) == "a  c"
+
+
+class TestSyntaxValidateZones:
+    """syntax-validate fixes text around code without touching code."""
+
+    def test_code_untouched(self, syntax_validate):
+        content = "Use <x> but not `<y>` or\n```\n<z>\n```\n"
+        fixed, fixes = syntax_validate.fix_angle_brackets(content, scan_protected_zones(content, CODE_KINDS))
+        assert fixed == "Use (x) but not `<y>` or\n```\n<z>\n```\n"
+        assert [f['original'] for f in fixes] == ['<x>']
+
+    def test_bracket_spanning_code(self, syntax_validate):
+        content = "<a `>` b>"
+        fixed, _ = syntax_validate.fix_angle_brackets(content, scan_protected_zones(content, CODE_KINDS))
+        assert fixed == "(a `>` b)"
+
+    def test_wrapped_wikilink_next_to_code(self, syntax_validate):
+        content = "`code`_[[Link]]_ and **[[Other]]**"
+        zones = scan_protected_zones(content, CODE_KINDS)
+        fixed, fixes = syntax_validate.fix_wrapped_wikilinks(content, zones)
+        assert fixed == "`code`[[Link]] and [[Other]]"
+        assert {f['wrap_type'] for f in fixes} == {'underscore', 'bold'}
+        # Index still points at the code after the edits
+        assert [fixed[s:e] for s, e, _ in zones] == ['`code`']
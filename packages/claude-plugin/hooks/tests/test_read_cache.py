@@ -6,12 +6,24 @@ to enable Gate 1 enforcement across context summarization.
 """
 
 import json
+import os
+import sys
+import threading
 from pathlib import Path
 
 import pytest
 
 from .helpers import run_hook
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import read_journal
+
+
+def journal_lines(gate1_cache_dir, session_id) -> list:
+    """Paths recorded in the session's read journal, one per line."""
+    journal = gate1_cache_dir / "gate1-reads" / f"{session_id}.log"
+    return [json.loads(line) for line in journal.read_text(encoding='utf-8').splitlines()]
+
 
 class TestReadCache:
     """Tests for the read-cache.py hook."""
@@ -29,10 +41,10 @@ class TestReadCache:
         run_hook(hooks_dir / "read-cache.py", hook_input)
 
         # Check cache was written
-        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.json"
+        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.log"
         assert cache_path.exists(), "Cache file should be created"
 
-        cached = json.loads(cache_path.read_text())
+        cached = journal_lines(gate1_cache_dir, session_id)
         resolved_path = str(Path(file_path).resolve())
         assert resolved_path in cached, f"Expected {resolved_path} in cache: {cached}"
 
@@ -50,10 +62,10 @@ class TestReadCache:
 
         run_hook(hooks_dir / "read-cache.py", hook_input)
 
-        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.json"
+        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.log"
 
         if cache_path.exists():
-            cached = json.loads(cache_path.read_text())
+            cached = journal_lines(gate1_cache_dir, session_id)
             assert "script.py" not in str(cached), "Non-.md files should not be cached"
         # If cache doesn't exist, that's also correct
 
@@ -73,10 +85,10 @@ class TestReadCache:
 
         run_hook(hooks_dir / "read-cache.py", hook_input)
 
-        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.json"
+        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.log"
 
         if cache_path.exists():
-            cached = json.loads(cache_path.read_text())
+            cached = journal_lines(gate1_cache_dir, session_id)
             assert ".claude" not in str(cached), ".claude files should not be cached"
 
     def test_accumulates_reads(self, hooks_dir, temp_vault, session_id, gate1_cache_dir):
@@ -98,10 +110,10 @@ class TestReadCache:
             "session_id": session_id
         })
 
-        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.json"
+        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.log"
         assert cache_path.exists()
 
-        cached = json.loads(cache_path.read_text())
+        cached = journal_lines(gate1_cache_dir, session_id)
 
         # Both files should be in cache
         assert len(cached) == 2, f"Expected 2 files in cache, got {len(cached)}"
@@ -145,11 +157,11 @@ class TestReadCache:
 
         run_hook(hooks_dir / "read-cache.py", hook_input)
 
-        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.json"
+        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.log"
 
         # Cache should not be created for non-Read tools
         if cache_path.exists():
-            cached = json.loads(cache_path.read_text())
+            cached = journal_lines(gate1_cache_dir, session_id)
             assert len(cached) == 0, "Edit tool should not create cache entries"
 
     def test_deduplicates_reads(self, hooks_dir, temp_vault, session_id, gate1_cache_dir):
@@ -164,10 +176,8 @@ class TestReadCache:
                 "session_id": session_id
             })
 
-        cache_path = gate1_cache_dir / "gate1-reads" / f"{session_id}.json"
-        cached = json.loads(cache_path.read_text())
-
-        # Should only have one entry (set behavior)
+        # Journal is append-only; the loaded set has only one entry
+        cached = read_journal.load_reads(gate1_cache_dir / "gate1-reads", session_id)
         assert len(cached) == 1, f"Expected 1 entry, got {len(cached)}: {cached}"
 
     def test_different_sessions_isolated(self, hooks_dir, temp_vault, gate1_cache_dir):
@@ -184,9 +194,159 @@ class TestReadCache:
         }, env={"CLAUDE_LOCAL_STATE_DIR": str(gate1_cache_dir)})
 
         # Session 2 should have empty cache
-        cache2_path = gate1_cache_dir / "gate1-reads" / f"{session2}.json"
+        cache2_path = gate1_cache_dir / "gate1-reads" / f"{session2}.log"
         assert not cache2_path.exists(), "Session 2 should not have cache from session 1"
 
         # Session 1 should have the read
-        cache1_path = gate1_cache_dir / "gate1-reads" / f"{session1}.json"
+        cache1_path = gate1_cache_dir / "gate1-reads" / f"{session1}.log"
         assert cache1_path.exists()
+
+
+class TestReadJournal:
+    """Tests for lib/read_journal.py."""
+
+    def test_parallel_appends_are_not_lost(self, tmp_path):
+        paths = [f"/vault/note-{i}.md" for i in range(200)]
+        threads = [
+            threading.Thread(target=read_journal.append_read, args=(tmp_path, "s", p))
+            for p in paths
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert read_journal.load_reads(tmp_path, "s") == set(paths)
+
+    def test_reads_legacy_json_cache(self, tmp_path):
+        (tmp_path / "s.json").write_text(json.dumps(["/vault/old.md"]), encoding='utf-8')
+        read_journal.append_read(tmp_path, "s", "/vault/new.md")
+        assert read_journal.load_reads(tmp_path, "s") == {"/vault/old.md", "/vault/new.md"}
+
+    def test_incremental_load_and_torn_line(self, tmp_path):
+        read_journal.append_read(tmp_path, "s", "/vault/a.md")
+        assert read_journal.load_reads(tmp_path, "s") == {"/vault/a.md"}
+
+        journal = tmp_path / "s.log"
+        with open(journal, 'ab') as f:
+            f.write(b'"/vault/b.md"\n"/vault/partial')
+        assert read_journal.load_reads(tmp_path, "s") == {"/vault/a.md", "/vault/b.md"}
+
+        with open(journal, 'ab') as f:
+            f.write(b'.md"\n')
+        assert "/vault/partial.md" in read_journal.load_reads(tmp_path, "s")
+
+    def test_compaction_folds_duplicates(self, tmp_path):
+        for i in range(read_journal.COMPACT_MIN_LINES):
+            read_journal.append_read(tmp_path, "s", f"/vault/{i % 3}.md")
+
+        reads = read_journal.load_reads(tmp_path, "s")
+        assert reads == {"/vault/0.md", "/vault/1.md", "/vault/2.md"}
+
+        lines = (tmp_path / "s.log").read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 3
+
+        read_journal.append_read(tmp_path, "s", "/vault/3.md")
+        assert "/vault/3.md" in read_journal.load_reads(tmp_path, "s")
+        assert list(tmp_path.glob("s.log.*")) == []
+
+    def test_appends_racing_compaction_are_kept(self, tmp_path, monkeypatch):
+        for i in range(read_journal.COMPACT_MIN_LINES):
+            read_journal.append_read(tmp_path, "s", f"/vault/{i % 3}.md")
+        journal = tmp_path / "s.log"
+        real_replace = read_journal.os.replace
+
+        def racing_replace(src, dst):
+            # One Read lands before the swap; another opened the old journal and writes after it
+            read_journal.append_read(tmp_path, "s", "/vault/before.md")
+            fd = os.open(str(journal), os.O_WRONLY | os.O_APPEND)
+            real_replace(src, dst)
+            # Readers never find the journal missing or emptied mid-compaction
+            assert {"/vault/0.md", "/vault/1.md", "/vault/2.md"} <= read_journal._parse(journal.read_bytes())[0]
+            os.write(fd, b'"/vault/after.md"\n')
+            os.close(fd)
+
+        monkeypatch.setattr(read_journal.os, "replace", racing_replace)
+        read_journal.compact(tmp_path, "s")
+        monkeypatch.undo()
+
+        expected = {"/vault/0.md", "/vault/1.md", "/vault/2.md", "/vault/before.md", "/vault/after.md"}
+        assert read_journal._parse(journal.read_bytes())[0] == expected
+        assert read_journal.load_reads(tmp_path, "s") == expected
+
+    def test_concurrent_compactions_keep_appends(self, tmp_path, monkeypatch):
+        for i in range(read_journal.COMPACT_MIN_LINES):
+            read_journal.append_read(tmp_path, "s", f"/vault/{i % 3}.md")
+        journal = tmp_path / "s.log"
+        real_replace = read_journal.os.replace
+        pids = iter(range(1, 10))
+        swaps = []
+
+        def land_first_swap_then_append(first_tmp):
+            real_replace(first_tmp, journal)
+            read_journal.append_read(tmp_path, "s", "/vault/between.md")
+
+        def racing_replace(src, dst):
+            swaps.append(src)
+            if len(swaps) == 1:
+                # A second compactor opens the journal before the first one swaps
+                read_journal.compact(tmp_path, "s")
+                if len(swaps) == 1:
+                    land_first_swap_then_append(src)
+            else:
+                # ...and swaps after an append reached the first one's journal
+                land_first_swap_then_append(swaps[0])
+                real_replace(src, dst)
+
+        monkeypatch.setattr(read_journal.os, "getpid", lambda: next(pids))
+        monkeypatch.setattr(read_journal.os, "replace", racing_replace)
+        read_journal.compact(tmp_path, "s")
+        monkeypatch.undo()
+
+        assert read_journal.load_reads(tmp_path, "s") == {
+            "/vault/0.md", "/vault/1.md", "/vault/2.md", "/vault/between.md"}
+        assert len(swaps) == 1  # The second compactor found the lock held
+        assert not (tmp_path / "s.log.lock").exists()
+
+    def test_abandoned_compaction_lock_is_retaken(self, tmp_path):
+        for i in range(read_journal.COMPACT_MIN_LINES):
+            read_journal.append_read(tmp_path, "s", f"/vault/{i % 3}.md")
+        lock = tmp_path / "s.log.lock"
+        lock.write_bytes(b"")
+
+        read_journal.compact(tmp_path, "s")
+        assert len((tmp_path / "s.log").read_bytes().splitlines()) == read_journal.COMPACT_MIN_LINES
+
+        stale = os.stat(lock).st_mtime - read_journal.COMPACT_LOCK_STALE - 1
+        os.utime(lock, (stale, stale))
+        read_journal.compact(tmp_path, "s")
+        assert len((tmp_path / "s.log").read_bytes().splitlines()) == 3
+        assert not lock.exists()
+
+    def test_reads_interleaved_with_compaction(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(read_journal, "COMPACT_MIN_LINES", 8)
+        paths = [f"/vault/note-{i % 40}.md" for i in range(400)]
+        done = threading.Event()
+        shrunk = []
+
+        def reader():
+            seen = set()
+            while not done.is_set():
+                reads = read_journal.load_reads(tmp_path, "s")
+                read_journal.compact(tmp_path, "s")
+                if not seen <= reads:
+                    shrunk.append(seen - reads)
+                seen = reads
+
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        for t in readers:
+            t.start()
+        for p in paths:
+            read_journal.append_read(tmp_path, "s", p)
+        done.set()
+        for t in readers:
+            t.join()
+
+        assert shrunk == []
+        assert read_journal.load_reads(tmp_path, "s") == set(paths)
+        assert list(tmp_path.glob("s.log.*")) == []
@@ -0,0 +1,134 @@
+"""
+Vault Batch Tests
+
+Tests for lib/vault_batch.py and the batch mode of syntax-validate.py,
+which fixes every note under a directory with a process pool.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import vault_batch
+from lib.hook_loader import load_hook
+from lib.vault_batch import find_notes, run_batch, write_text_atomic
+
+BROKEN = "See <Alice> and **[[Bob]]**\r\n`<code>` stays\r\n"
+FIXED = "See (Alice) and [[Bob]]\r\n`<code>` stays\r\n"
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / ".trash").mkdir()
+    (tmp_path / ".trash" / "old.md").write_text("<hidden>\n", encoding="utf-8")
+    (tmp_path / "people" / "team").mkdir(parents=True)
+    (tmp_path / "people" / "broken.md").write_bytes(BROKEN.encode("utf-8"))
+    (tmp_path / "people" / "team" / "clean.md").write_text("Nothing to fix\n", encoding="utf-8")
+    (tmp_path / "a.md").write_text("# A <b>\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("<not a note>\n", encoding="utf-8")
+    return tmp_path
+
+
+def results_by_path(results):
+    return {result.rel_path: result for result in results}
+
+
+class TestFindNotes:
+
+    def test_sorted_and_skips_dot_folders(self, vault):
+        assert [p.relative_to(vault).as_posix() for p in find_notes(vault)] == [
+            "a.md", "people/broken.md", "people/team/clean.md",
+        ]
+
+
+class TestRunBatch:
+
+    def test_dry_run_reports_diff_without_writing(self, vault):
+        results = results_by_path(run_batch(vault, "syntax-validate", "fix_content", dry_run=True, workers=1))
+        broken = results["people/broken.md"]
+        assert broken.fixes == 2
+        assert "-See <Alice> and **[[Bob]]**" in broken.diff
+        assert "+See (Alice) and [[Bob]]" in broken.diff
+        assert results["people/team/clean.md"].fixes == 0
+        assert (vault / "people" / "broken.md").read_bytes() == BROKEN.encode("utf-8")
+
+    def test_writes_keep_line_endings_and_mode(self, vault):
+        note = vault / "people" / "broken.md"
+        os.chmod(note, 0o640)
+        results = results_by_path(run_batch(vault, "syntax-validate", "fix_content", workers=1))
+        assert results["people/broken.md"].fixes == 2
+        assert results["people/broken.md"].diff == ""
+        assert note.read_bytes() == FIXED.encode("utf-8")
+        assert os.stat(note).st_mode & 0o777 == 0o640
+        assert (vault / ".trash" / "old.md").read_text(encoding="utf-8") == "<hidden>\n"
+        assert not [p for p in note.parent.iterdir() if p.name.endswith(".tmp")]
+
+    def test_process_pool_matches_in_process(self, vault):
+        serial = list(run_batch(vault, "syntax-validate", "fix_content", dry_run=True, workers=1))
+        pooled = list(run_batch(vault, "syntax-validate", "fix_content", dry_run=True, workers=2))
+        assert pooled == serial
+
+    def test_undecodable_note_is_left_alone(self, vault):
+        (vault / "latin1.md").write_bytes(b"caf\xe9 <x>\n")
+        results = results_by_path(run_batch(vault, "syntax-validate", "fix_content", workers=1))
+        assert "UnicodeDecodeError" in results["latin1.md"].error
+        assert (vault / "latin1.md").read_bytes() == b"caf\xe9 <x>\n"
+
+
+    def test_fixer_error_fails_only_its_note(self, vault, monkeypatch):
+        syntax_validate = load_hook("syntax-validate")
+
+        def fix_content(content):
+            if content.startswith("See"):
+                raise ValueError("bad note")
+            return syntax_validate.fix_content(content)
+
+        monkeypatch.setattr(vault_batch, "load_hook", lambda hook: type("Hook", (), {"fix_content": fix_content}))
+        results = results_by_path(run_batch(vault, "syntax-validate", "fix_content", workers=1))
+        assert results["people/broken.md"].error == "ValueError: bad note"
+        assert results["a.md"].fixes == 1
+        assert (vault / "a.md").read_text(encoding="utf-8") == "# A (b)\n"
+
+    def test_fixer_errors_do_not_stop_the_pool(self, vault):
+        results = list(run_batch(vault, "syntax-validate", "no_such_fixer", dry_run=True, workers=2))
+        assert len(results) == 3
+        assert all(result.error.startswith("AttributeError") for result in results)
+
+
+class TestWriteTextAtomic:
+
+    def test_replaces_content(self, tmp_path):
+        note = tmp_path / "n.md"
+        note.write_text("old", encoding="utf-8")
+        write_text_atomic(note, "new\r\n")
+        assert note.read_bytes() == b"new\r\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["n.md"]
+
+
+class TestSyntaxValidateBatchMode:
+
+    def run(self, hooks_dir, *args):
+        return subprocess.run([sys.executable, str(hooks_dir / "syntax-validate.py"), *args],
+                              capture_output=True, text=True, timeout=30)
+
+    def test_dry_run_prints_diff(self, hooks_dir, vault):
+        result = self.run(hooks_dir, "--batch", str(vault), "--dry-run", "--workers", "2")
+        assert result.returncode == 0
+        assert "+++ b/people/broken.md" in result.stdout
+        assert "Would fix 3 issues in 2 of 3 notes" in result.stderr
+        assert (vault / "a.md").read_text(encoding="utf-8") == "# A <b>\n"
+
+    def test_fixes_vault(self, hooks_dir, vault):
+        result = self.run(hooks_dir, "--batch", str(vault))
+        assert result.returncode == 0
+        assert "people/broken.md: 2 fixed" in result.stdout
+        assert (vault / "a.md").read_text(encoding="utf-8") == "# A (b)\n"
+
+    def test_missing_directory(self, hooks_dir, tmp_path):
+        result = self.run(hooks_dir, "--batch", str(tmp_path / "missing"))
+        assert result.returncode == 1
@@ -0,0 +1,219 @@
+"""
+Vault Index Tests
+
+Tests for lib/vault_index.py (the SQLite index of notes, frontmatter,
+links and headings under .claude/), its update after post-mutation
+write-back and the vault-index.py CLI.
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from lib import vault_index
+from lib.hook_loader import load_hook
+from lib.vault_index import SCHEMA_VERSION, VaultIndex, index_path
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / ".trash").mkdir()
+    (tmp_path / ".trash" / "Old.md").write_text("[[Ana]]\n", encoding="utf-8")
+    (tmp_path / "people").mkdir()
+    (tmp_path / "people" / "Ana.md").write_text(
+        "---\ntype: person\nactive: true\n---\n# Ana\nWorks with [[Ben|B]] on [[Flywheel#Plan]].\n"
+        "```\n# not a heading [[Nope]]\n```\n## Projects\n", encoding="utf-8")
+    (tmp_path / "people" / "Ben.md").write_text("---\ntype: person\n---\nSee [[ana]].\n", encoding="utf-8")
+    (tmp_path / "Flywheel.md").write_text("# Flywheel\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def index(vault):
+    with VaultIndex.open(vault) as index:
+        index.refresh()
+        yield index
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    names = []
+    real = vault_index.read_note
+    monkeypatch.setattr(vault_index, "read_note", lambda p: names.append(p.name) or real(p))
+    return names
+
+
+class TestQueries:
+
+    def test_notes_skip_dot_folders(self, index):
+        assert index.note_count() == 3
+        assert index.stems() == ["Ana", "Ben", "Flywheel"]
+
+    def test_links_and_backlinks(self, index):
+        assert index.outgoing_links("people/Ana.md") == ["Ben", "Flywheel"]
+        assert index.backlinks("Ana") == ["people/Ben.md"]  # Case-insensitive, .trash ignored
+
+    def test_headings_outside_code(self, index):
+        assert index.headings("people/Ana.md") == [(1, "Ana"), (2, "Projects")]
+
+    def test_fields(self, index):
+        assert index.notes_with_field("type", "person") == ["people/Ana.md", "people/Ben.md"]
+        assert index.notes_with_field("active", True) == ["people/Ana.md"]
+        total, fields = index.folder_field_stats("people", exclude="people/Ben.md", skip_keys=["ACTIVE"])
+        assert total == 1
+        assert fields == {"type": {"count": 1, "values": {"person": 1}}}
+
+
+class TestIncrementalUpdates:
+
+    def test_refresh_reads_only_changes(self, vault, index, reads):
+        assert index.refresh() == 0
+        assert reads == []
+
+        (vault / "people" / "Ben.md").write_text("---\ntype: manager\n---\nNo links now\n", encoding="utf-8")
+        (vault / "Flywheel.md").unlink()
+        assert index.refresh() == 2
+        assert reads == ["Ben.md"]
+        assert index.backlinks("Ana") == []
+        assert index.stems() == ["Ana", "Ben"]
+
+    def test_removed_note_rows_are_deleted(self, vault, index):
+        (vault / "people" / "Ana.md").unlink()
+        index.refresh()
+        for table in ("fields", "links", "headings"):
+            orphans = index.conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE note_id NOT IN (SELECT id FROM notes)").fetchone()[0]
+            assert orphans == 0
+
+    def test_refresh_folder_skips_edited_note(self, vault, index, reads):
+        (vault / "people" / "Ana.md").write_text("changed\n", encoding="utf-8")
+        (vault / "people" / "Cy.md").write_text("new\n", encoding="utf-8")
+        index.refresh_folder("people", skip_name="Ana.md")
+        assert reads == ["Cy.md"]
+
+    def test_index_file(self, vault, index):
+        note = vault / "people" / "Ben.md"
+        note.write_text("Now links [[Flywheel]]\n", encoding="utf-8")
+        assert index.index_file(note)
+        assert index.outgoing_links("people/Ben.md") == ["Flywheel"]
+        assert not index.index_file(vault / ".trash" / "Old.md")
+
+    def test_folder_aggregates_match_recount(self, vault, index):
+        (vault / "people" / "Ben.md").write_text("---\ntype: manager\ntags: [x]\n---\n", encoding="utf-8")
+        (vault / "people" / "Cy.md").write_text("---\ntype: person\n---\n", encoding="utf-8")
+        (vault / "people" / "Di.md").write_text("---\ntags: [x]\n---\n", encoding="utf-8")
+        index.refresh()
+        (vault / "people" / "Ana.md").unlink()
+        (vault / "people" / "Di.md").write_text("No frontmatter\n", encoding="utf-8")
+        index.refresh()
+
+        recount = index.conn.execute(
+            "SELECT notes.folder, fields.key, fields.value, COUNT(*) FROM fields "
+            "JOIN notes ON notes.id = fields.note_id GROUP BY 1, 2, 3 ORDER BY 1, 2, 3").fetchall()
+        assert index.conn.execute(
+            "SELECT folder, key, value, notes FROM folder_fields ORDER BY 1, 2, 3").fetchall() == recount
+        assert index.conn.execute("SELECT * FROM folder_totals").fetchall() == [("people", 2)]
+        assert index.folder_field_stats("people", exclude="people/Cy.md", skip_keys=["tags"]) == (
+            1, {"type": {"count": 1, "values": {"manager": 1}}})
+
+    def test_fields_in_first_seen_order(self, vault, index):
+        folder = vault / "projects"
+        folder.mkdir()
+        for name in ("Alpha", "Gamma"):
+            (folder / f"{name}.md").write_text("---\ntype: project\nstatus: active\n---\n", encoding="utf-8")
+        index.refresh_folder("projects")
+        (folder / "Beta.md").write_text("---\nowner: ana\nstatus: done\ntype: project\n---\n", encoding="utf-8")
+        index.refresh_folder("projects")
+        expected = ["type", "status", "owner"]
+        assert list(index.folder_field_stats("projects")[1]) == expected
+        assert list(index.folder_field_stats("projects")[1]["status"]["values"]) == ["active", "done"]
+
+        # Re-indexing a note with the same fields keeps their place
+        (folder / "Alpha.md").write_text("---\ntype: project\nstatus: active\n---\nEdited\n", encoding="utf-8")
+        index.refresh_folder("projects")
+        assert list(index.folder_field_stats("projects")[1]) == expected
+
+    def test_rebuild(self, index, reads):
+        assert index.rebuild() == 3
+        assert sorted(reads) == ["Ana.md", "Ben.md", "Flywheel.md"]
+
+
+class TestStore:
+
+    def test_wal_mode(self, vault, index):
+        assert index.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_schema_change_starts_fresh(self, vault, index):
+        index.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        index.close()
+        with VaultIndex.open(vault) as reopened:
+            assert reopened.note_count() == 0
+
+    def test_corrupt_file_is_replaced(self, vault):
+        index_path(vault).parent.mkdir(exist_ok=True)
+        index_path(vault).write_bytes(b"garbage" * 1000)
+        with VaultIndex.open(vault) as index:
+            assert index.refresh() == 3
+
+
+    def test_nothing_written_outside_a_vault(self, tmp_path, monkeypatch):
+        home = tmp_path / "home"
+        (home / ".claude").mkdir(parents=True)
+        (home / "Note.md").write_text("---\ntype: x\n---\n", encoding="utf-8")
+        monkeypatch.setenv("HOME", str(home))
+        plain = tmp_path / "plain"
+        plain.mkdir()
+        (plain / "Note.md").write_text("---\ntype: x\n---\n", encoding="utf-8")
+
+        for folder in (plain, home):
+            with VaultIndex.open(folder) as index:
+                assert index.refresh_folder("") == 1
+                assert index.folder_field_stats("") == (1, {"type": {"count": 1, "values": {"x": 1}}})
+        assert not (plain / ".claude").exists()
+        assert list((home / ".claude").iterdir()) == []
+
+
+class TestPostMutationUpdate:
+
+    def test_edited_note_is_reindexed(self, vault, index):
+        note = vault / "people" / "Ben.md"
+        note.write_text("---\ntype: person\n---\nMet [[Flywheel]] team\n", encoding="utf-8")
+        load_hook("post-mutation").dispatch({"tool_name": "Write", "tool_input": {"file_path": str(note)}})
+        assert index.outgoing_links("people/Ben.md") == ["Flywheel"]
+
+    def test_no_index_is_created(self, tmp_path):
+        (tmp_path / ".obsidian").mkdir()
+        note = tmp_path / "note.md"
+        note.write_text("Plain note\n", encoding="utf-8")
+        load_hook("post-mutation").dispatch({"tool_name": "Write", "tool_input": {"file_path": str(note)}})
+        assert not index_path(tmp_path).exists()
+
+
+class TestCli:
+
+    def test_refuses_folder_outside_a_vault(self, hooks_dir, tmp_path):
+        result = subprocess.run([sys.executable, str(hooks_dir / "vault-index.py"), "rebuild", str(tmp_path)],
+                                capture_output=True, text=True, timeout=30)
+        assert result.returncode == 1
+        assert "Not a vault" in result.stderr
+        assert not (tmp_path / ".claude").exists()
+
+    def test_rebuild_and_stats(self, hooks_dir, vault):
+        result = subprocess.run([sys.executable, str(hooks_dir / "vault-index.py"), "rebuild", str(vault)],
+                                capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0
+        assert "Indexed 3 notes" in result.stdout
+
+        result = subprocess.run([sys.executable, str(hooks_dir / "vault-index.py"), "stats", str(vault)],
+                                capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0
+        assert "links" in result.stdout
+
+        with sqlite3.connect(str(index_path(vault))) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 3
@@ -0,0 +1,93 @@
+"""
+Vault Scan Tests
+
+Tests for lib/vault_scan.py: the thread-pooled os.scandir walk that
+prunes dot folders before descending, and the scan_notes generator.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import vault_scan
+from lib.vault_scan import list_directory, scan_notes, walk_vault
+
+
+@pytest.fixture
+def vault(tmp_path):
+    for folder in (".git/objects", ".obsidian", ".trash", "people/team", "projects/2025/q1", "empty"):
+        (tmp_path / folder).mkdir(parents=True)
+    for note in ("Home.md", "people/Ana.md", "people/team/Ben.md", "projects/2025/q1/Plan.md",
+                 ".obsidian/Hidden.md", ".trash/Old.md", "people/.draft.md"):
+        (tmp_path / note).write_text("x\n", encoding="utf-8")
+    (tmp_path / "people" / "photo.png").write_bytes(b"")
+    (tmp_path / "people" / "Folder.md").mkdir()
+    return tmp_path
+
+
+EXPECTED = ["Home.md", "people/Ana.md", "people/team/Ben.md", "projects/2025/q1/Plan.md"]
+
+
+class TestScanNotes:
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_finds_notes_outside_dot_folders(self, vault, workers):
+        notes = list(scan_notes(vault, workers=workers))
+        assert sorted(note.rel_path for note in notes) == EXPECTED
+        assert all(note.path == str(vault / note.rel_path) for note in notes)
+        assert all(note.stat is None for note in notes)
+
+    def test_with_stat(self, vault):
+        notes = {note.rel_path: note for note in scan_notes(vault, with_stat=True)}
+        assert notes["people/Ana.md"].stat.st_size == 2
+
+    def test_dot_folders_are_never_listed(self, vault, monkeypatch):
+        listed = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(vault_scan.os, "scandir", lambda p: listed.append(p) or real_scandir(p))
+        list(scan_notes(vault))
+        assert not any(part.startswith(".") for p in listed for part in Path(p).relative_to(vault).parts)
+        assert len(listed) == 8  # root, people, Folder.md, team, projects, 2025, q1, empty
+
+    def test_early_close(self, vault):
+        notes = scan_notes(vault)
+        assert next(notes).rel_path in EXPECTED
+        notes.close()
+
+    def test_missing_root(self, tmp_path):
+        assert list(scan_notes(tmp_path / "missing")) == []
+
+
+class TestWalkVault:
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_visit_controls_descent(self, vault, workers):
+        def visit(rel_dir, abs_dir):
+            if rel_dir == "projects/2025":
+                return None  # Skipped, and nothing below it is visited
+            return rel_dir, list_directory(abs_dir).subdirs
+
+        visited = sorted(walk_vault(vault, visit, workers))
+        assert visited == ["", "empty", "people", "people/Folder.md", "people/team", "projects"]
+
+    def test_visit_errors_propagate(self, vault):
+        def visit(rel_dir, abs_dir):
+            if rel_dir == "people":
+                raise ValueError(rel_dir)
+            return rel_dir, list_directory(abs_dir).subdirs
+
+        with pytest.raises(ValueError):
+            list(walk_vault(vault, visit, workers=4))
+
+    def test_deep_tree(self, tmp_path):
+        path = tmp_path
+        for depth in range(50):
+            path = path / f"d{depth}"
+            for n in range(3):
+                (path / f"n{n}").mkdir(parents=True)
+        (path / "Deep.md").write_text("", encoding="utf-8")
+        notes = [note.rel_path for note in scan_notes(tmp_path, workers=8)]
+        assert notes == ["/".join(f"d{depth}" for depth in range(50)) + "/Deep.md"]
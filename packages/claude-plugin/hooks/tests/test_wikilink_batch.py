@@ -0,0 +1,124 @@
+"""
+Wikilink Batch Tests
+
+Tests for wikilink-auto.py --batch: linking every note in a vault with
+a process pool, dry runs, and resuming an interrupted run.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.hook_loader import load_hook
+from lib.vault_batch import BatchProgress, run_batch
+
+MEETING = "# Standup\nMet Sarah Chen about Flywheel.\n`Sarah Chen` in code stays.\n"
+
+
+@pytest.fixture
+def wikilink_auto():
+    return load_hook("wikilink-auto")
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / "people").mkdir()
+    (tmp_path / "meetings").mkdir()
+    (tmp_path / "people" / "Sarah Chen.md").write_text("# Sarah Chen\nWorks on Flywheel.\n", encoding="utf-8")
+    (tmp_path / "Flywheel.md").write_text("# Flywheel\nLed by Sarah Chen.\n", encoding="utf-8")
+    (tmp_path / "meetings" / "standup.md").write_text(MEETING, encoding="utf-8")
+    (tmp_path / "meetings" / "linked.md").write_text("See [[people/Sarah Chen]]. Sarah Chen again.\n",
+                                                     encoding="utf-8")
+    (tmp_path / "README.md").write_text("Sarah Chen\n", encoding="utf-8")
+    subprocess.run([sys.executable, str(Path(__file__).parent.parent / "wikilink-cache.py")],
+                   cwd=str(tmp_path), capture_output=True, timeout=30)
+    return tmp_path
+
+
+def run_cli(hooks_dir, *args):
+    return subprocess.run([sys.executable, str(hooks_dir / "wikilink-auto.py"), *args],
+                          capture_output=True, text=True, timeout=60)
+
+
+class TestLinkNote:
+
+    def test_links_cache_entities_outside_zones(self, wikilink_auto, vault):
+        content, linked = wikilink_auto.link_note(MEETING, "meetings/standup.md", str(vault))
+        assert content == "# Standup\nMet [[Sarah Chen]] about [[Flywheel]].\n`Sarah Chen` in code stays.\n"
+        assert sorted(linked) == ["Flywheel", "Sarah Chen"]
+
+    def test_skips_own_page_and_existing_links(self, wikilink_auto, vault):
+        own = (vault / "people" / "Sarah Chen.md").read_text(encoding="utf-8")
+        assert wikilink_auto.link_note(own, "people/Sarah Chen.md", str(vault)) == (
+            "# Sarah Chen\nWorks on [[Flywheel]].\n", ["Flywheel"])
+        text = "See [[people/Sarah Chen]]. Sarah Chen again.\n"
+        assert wikilink_auto.link_note(text, "meetings/linked.md", str(vault)) == (text, [])
+
+    def test_linking_again_adds_nothing(self, wikilink_auto, vault):
+        once, _ = wikilink_auto.link_note(MEETING + "Sarah Chen and Flywheel.\n", "meetings/standup.md", str(vault))
+        assert wikilink_auto.link_note(once, "meetings/standup.md", str(vault)) == (once, [])
+
+    def test_heuristics_are_opt_in(self, wikilink_auto, vault):
+        text = "Deployed to Azure Platform today.\n"
+        assert wikilink_auto.link_note(text, "n.md", str(vault))[1] == []
+        assert wikilink_auto.link_note(text, "n.md", str(vault), heuristics=True)[1] == ["Azure Platform"]
+
+    def test_documentation_is_skipped(self, wikilink_auto, vault):
+        assert wikilink_auto.link_note("Sarah Chen\n", "README.md", str(vault)) == ("Sarah Chen\n", [])
+
+    def test_process_pool_matches_in_process(self, vault):
+        options = {"vault": str(vault)}
+        serial = list(run_batch(vault, "wikilink-auto", "link_note", True, workers=1, options=options))
+        pooled = list(run_batch(vault, "wikilink-auto", "link_note", True, workers=2, options=options))
+        assert pooled == serial
+        assert sum(result.fixes for result in serial) == 4
+
+
+class TestBatchMode:
+
+    def test_dry_run_reports_without_writing(self, hooks_dir, vault):
+        result = run_cli(hooks_dir, "--batch", str(vault), "--dry-run", "--workers", "2")
+        assert result.returncode == 0, result.stderr
+        assert "meetings/standup.md: 2 links" in result.stdout
+        assert "Would add 4 links in 3 of 5 notes" in result.stdout
+        assert (vault / "meetings" / "standup.md").read_text(encoding="utf-8") == MEETING
+        assert not (vault / ".claude" / "wikilink-batch.progress").exists()
+
+    def test_dry_run_diff(self, hooks_dir, vault):
+        result = run_cli(hooks_dir, "--batch", str(vault), "--dry-run", "--diff")
+        assert "+Met [[Sarah Chen]] about [[Flywheel]]." in result.stdout
+
+    def test_links_vault_and_clears_progress(self, hooks_dir, vault):
+        result = run_cli(hooks_dir, "--batch", str(vault))
+        assert result.returncode == 0, result.stderr
+        assert "Added 4 links in 3 of 5 notes" in result.stdout
+        assert "[[Sarah Chen]]" in (vault / "meetings" / "standup.md").read_text(encoding="utf-8")
+        assert not (vault / ".claude" / "wikilink-batch.progress").exists()
+
+        again = run_cli(hooks_dir, "--batch", str(vault))
+        assert "Added 0 links" in again.stdout
+
+    def test_resume_skips_finished_notes(self, hooks_dir, vault):
+        progress = BatchProgress(vault / ".claude" / "wikilink-batch.progress")
+        progress.record("meetings/standup.md")
+        progress.close()
+
+        result = run_cli(hooks_dir, "--batch", str(vault), "--resume")
+        assert result.returncode == 0, result.stderr
+        assert "Resuming: 1 notes already linked" in result.stdout
+        assert (vault / "meetings" / "standup.md").read_text(encoding="utf-8") == MEETING
+        assert "[[Flywheel]]" in (vault / "people" / "Sarah Chen.md").read_text(encoding="utf-8")
+
+    def test_builds_missing_cache(self, hooks_dir, vault):
+        for name in ("wikilink-entities.json", "wikilink-entities.bin", "wikilink-index.json"):
+            (vault / ".claude" / name).unlink()
+        result = run_cli(hooks_dir, "--batch", str(vault), "--dry-run")
+        assert result.returncode == 0, result.stderr
+        assert "Would add 4 links" in result.stdout
+
+    def test_missing_directory(self, hooks_dir, tmp_path):
+        assert run_cli(hooks_dir, "--batch", str(tmp_path / "missing")).returncode == 1
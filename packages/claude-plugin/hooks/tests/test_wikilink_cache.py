@@ -0,0 +1,228 @@
+"""
+Wikilink Cache Tests
+
+Tests for wikilink-cache.py: building the entity cache, and incremental
+rebuilds that only re-list directories whose mtime changed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib.hook_loader import load_hook
+
+
+@pytest.fixture
+def wikilink_cache():
+    return load_hook("wikilink-cache")
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    vault = tmp_path / "vault"
+    (vault / "people").mkdir(parents=True)
+    (vault / "projects").mkdir()
+    (vault / "daily-notes").mkdir()
+    (vault / ".obsidian").mkdir()
+    (vault / "people" / "Sarah Chen.md").write_text("", encoding='utf-8')
+    (vault / "projects" / "Flywheel Launch Plan.md").write_text("", encoding='utf-8')
+    (vault / "daily-notes" / "2025-01-01.md").write_text("", encoding='utf-8')
+    (vault / ".obsidian" / "Hidden Page.md").write_text("", encoding='utf-8')
+    (vault / "API.md").write_text("", encoding='utf-8')
+    monkeypatch.chdir(vault)
+    return vault
+
+
+def age_directories(vault: Path) -> None:
+    """Move directory mtimes out of the racy window so they count as unchanged."""
+    past = time.time_ns() - 3600 * 10**9
+    for root, dirs, _ in os.walk(vault):
+        for d in dirs:
+            os.utime(os.path.join(root, d), ns=(past, past))
+    os.utime(vault, ns=(past, past))
+
+
+def entities(vault: Path) -> set:
+    cache = json.loads((vault / ".claude" / "wikilink-entities.json").read_text(encoding='utf-8'))
+    return {e for k, v in cache.items() if k != '_metadata' for e in v}
+
+
+class TestWikilinkCache:
+
+    def test_full_build(self, wikilink_cache, vault):
+        count = wikilink_cache.rebuild_wikilink_cache()
+        found = entities(vault)
+        assert {"Sarah Chen", "people/Sarah Chen", "Flywheel Launch Plan", "API"} <= found
+        # Hidden folders, periodic notes and dates are excluded
+        assert "Hidden Page" not in found
+        assert not any("2025-01-01" in e for e in found)
+        assert count == len(found)
+
+    def test_unchanged_vault_skips_write(self, wikilink_cache, vault):
+        wikilink_cache.rebuild_wikilink_cache()
+        age_directories(vault)
+        wikilink_cache.rebuild_wikilink_cache()  # records the aged mtimes
+
+        cache_file = vault / ".claude" / "wikilink-entities.json"
+        before = cache_file.stat().st_mtime_ns
+        listed = []
+        real_scandir = os.scandir
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(wikilink_cache.os, "scandir", lambda p: listed.append(p) or real_scandir(p))
+            wikilink_cache.rebuild_wikilink_cache()
+
+        assert listed == []
+        assert cache_file.stat().st_mtime_ns == before
+
+    def test_incremental_add_and_remove(self, wikilink_cache, vault):
+        wikilink_cache.rebuild_wikilink_cache()
+        age_directories(vault)
+        wikilink_cache.rebuild_wikilink_cache()
+
+        (vault / "people" / "Mike Jones.md").write_text("", encoding='utf-8')
+        (vault / "projects" / "Flywheel Launch Plan.md").unlink()
+        (vault / "people" / "new-team").mkdir()
+        (vault / "people" / "new-team" / "Ana Lima.md").write_text("", encoding='utf-8')
+
+        listed = []
+        real_scandir = os.scandir
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(wikilink_cache.os, "scandir", lambda p: listed.append(p) or real_scandir(p))
+            wikilink_cache.rebuild_wikilink_cache()
+
+        found = entities(vault)
+        assert {"Mike Jones", "Ana Lima", "people/new-team/Ana Lima", "Sarah Chen"} <= found
+        assert "Flywheel Launch Plan" not in found
+        assert "projects/Flywheel Launch Plan" not in found
+        # Only the directories that changed were listed
+        assert sorted(Path(p).name for p in listed) == ["new-team", "people", "projects"]
+
+    def test_shared_stem_kept_until_last_page_removed(self, wikilink_cache, vault):
+        (vault / "projects" / "Sarah Chen.md").write_text("", encoding='utf-8')
+        wikilink_cache.rebuild_wikilink_cache()
+
+        (vault / "people" / "Sarah Chen.md").unlink()
+        wikilink_cache.rebuild_wikilink_cache()
+        found = entities(vault)
+        assert "Sarah Chen" in found
+        assert "people/Sarah Chen" not in found
+
+        (vault / "projects" / "Sarah Chen.md").unlink()
+        wikilink_cache.rebuild_wikilink_cache()
+        assert "Sarah Chen" not in entities(vault)
+
+    def test_removed_directory(self, wikilink_cache, vault):
+        wikilink_cache.rebuild_wikilink_cache()
+        (vault / "people" / "Sarah Chen.md").unlink()
+        (vault / "people").rmdir()
+        wikilink_cache.rebuild_wikilink_cache()
+        assert "Sarah Chen" not in entities(vault)
+
+    def test_matches_full_rebuild(self, wikilink_cache, vault):
+        wikilink_cache.rebuild_wikilink_cache()
+        (vault / "people" / "Mike Jones.md").write_text("", encoding='utf-8')
+        (vault / "API.md").unlink()
+        wikilink_cache.rebuild_wikilink_cache()
+        incremental = entities(vault)
+
+        (vault / ".claude" / "wikilink-index.json").unlink()
+        wikilink_cache.rebuild_wikilink_cache()
+        assert entities(vault) == incremental
+
+
+class TestEntityCacheUpdates:
+    """Upserts after a write, and background builds instead of vault scans."""
+
+    def test_new_page_is_upserted_and_linkable(self, wikilink_cache, vault):
+        wikilink_cache.rebuild_wikilink_cache()
+        dispatcher = load_hook("post-mutation")
+
+        new_note = vault / "projects" / "Zephyr.md"
+        new_note.write_text("# Zephyr\n", encoding='utf-8')
+        dispatcher.dispatch({"tool_name": "Write", "tool_input": {"file_path": str(new_note)}})
+
+        assert {"Zephyr", "projects/Zephyr"} <= entities(vault)
+        # Not linked to itself
+        assert new_note.read_text(encoding='utf-8') == "# Zephyr\n"
+
+        other = vault / "people" / "standup.md"
+        other.write_text("Shipped the zephyr release.\n", encoding='utf-8')
+        dispatcher.dispatch({"tool_name": "Write", "tool_input": {"file_path": str(other)}})
+        assert "[[Zephyr]]" in other.read_text(encoding='utf-8')
+
+    def test_upsert_skips_known_and_excluded_pages(self, wikilink_cache, vault):
+        from lib.wikilink_entities import upsert_page
+        wikilink_cache.rebuild_wikilink_cache()
+        cache_file = vault / ".claude" / "wikilink-entities.json"
+        before = cache_file.read_text(encoding='utf-8')
+
+        assert upsert_page(vault, "people/Sarah Chen.md", ["daily-notes"]) == []
+        assert upsert_page(vault, "2025-02-02.md", ["daily-notes"]) == []
+        assert cache_file.read_text(encoding='utf-8') == before
+
+    def test_daily_note_write_does_not_read_json(self, wikilink_cache, vault, monkeypatch):
+        from lib import wikilink_entities
+        wikilink_cache.rebuild_wikilink_cache()
+        monkeypatch.setattr(wikilink_entities.json, "loads", lambda *a, **k: pytest.fail("JSON parsed"))
+
+        daily = vault / "daily-notes" / "2025-02-02.md"
+        daily.write_text("# Today\n", encoding='utf-8')
+        load_hook("post-mutation").dispatch({"tool_name": "Write", "tool_input": {"file_path": str(daily)}})
+
+    def test_upsert_skipped_while_build_runs(self, wikilink_cache, vault):
+        from lib.wikilink_entities import upsert_page
+        wikilink_cache.rebuild_wikilink_cache()
+        lock_file = vault / ".claude" / "wikilink-cache.lock"
+
+        # A build holds the lock: its os.replace would drop an upsert made now
+        lock_file.write_text("", encoding='utf-8')
+        assert upsert_page(vault, "projects/Zephyr.md", []) == []
+        assert "Zephyr" not in entities(vault)
+        assert lock_file.exists()  # Still the build's
+
+        lock_file.unlink()
+        assert upsert_page(vault, "projects/Zephyr.md", []) == ["Zephyr", "projects/Zephyr"]
+        assert not lock_file.exists()
+
+    def test_session_start_build_skipped_while_another_runs(self, hooks_dir, vault):
+        (vault / ".claude").mkdir()
+        lock_file = vault / ".claude" / "wikilink-cache.lock"
+        lock_file.write_text("", encoding='utf-8')
+
+        result = subprocess.run([sys.executable, str(hooks_dir / "wikilink-cache.py")],
+                                cwd=str(vault), capture_output=True, text=True, timeout=30)
+        assert "build already running" in result.stdout
+        assert lock_file.exists()
+        assert not (vault / ".claude" / "wikilink-entities.json").exists()
+
+        lock_file.unlink()
+        result = subprocess.run([sys.executable, str(hooks_dir / "wikilink-cache.py")],
+                                cwd=str(vault), capture_output=True, text=True, timeout=30)
+        assert "Sarah Chen" in entities(vault)
+        assert not lock_file.exists()
+
+    def test_missing_cache_builds_in_background(self, vault):
+        wikilink_auto = load_hook("wikilink-auto")
+        cache_file = vault / ".claude" / "wikilink-entities.json"
+        lock_file = vault / ".claude" / "wikilink-cache.lock"
+
+        assert len(wikilink_auto.load_wikilinks_from_cache(vault)) == 0
+
+        for _ in range(100):
+            if cache_file.exists() and not lock_file.exists():
+                break
+            time.sleep(0.05)
+        assert "Sarah Chen" in entities(vault)
+
+    def test_one_background_build_at_a_time(self, vault):
+        from lib.wikilink_entities import start_background_build
+        (vault / ".claude").mkdir()
+        (vault / ".claude" / "wikilink-cache.lock").write_text("", encoding='utf-8')
+
+        assert start_background_build(vault) is False
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Flywheel Vault Index (vault-index.py)
+
+Builds and inspects the SQLite vault index (.claude/vault-index.db) the
+hooks query for other notes' frontmatter, links and headings. The hooks
+keep it current note by note; this rebuilds it in bulk, e.g. after
+importing or bulk-editing notes outside Claude.
+
+Usage:
+    python3 vault-index.py refresh [vault]   # Re-read notes changed since the last run (default)
+    python3 vault-index.py rebuild [vault]   # Re-read every note
+    python3 vault-index.py stats [vault]     # Print note, field, link and heading counts
+
+The vault defaults to the one containing the current directory.
+
+Exit codes:
+- 0: Success
+- 1: Unknown command or no index
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config.loader import find_vault_root, is_state_root
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.vault_index import VaultIndex, index_path
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'refresh'
+    vault_path = Path(sys.argv[2]).resolve() if len(sys.argv) > 2 else find_vault_root()
+
+    if not is_state_root(vault_path):
+        print(f"Not a vault: {vault_path} (no .obsidian or .claude folder)", file=sys.stderr)
+        sys.exit(1)
+
+    if command in ('refresh', 'rebuild'):
+        start = time.perf_counter()
+        with VaultIndex.open(vault_path) as index:
+            changed = index.rebuild() if command == 'rebuild' else index.refresh()
+            total = index.note_count()
+        elapsed = time.perf_counter() - start
+        print(f"Indexed {total} notes in {vault_path} ({changed} changed, {elapsed:.2f}s)")
+        sys.exit(0)
+
+    if command == 'stats':
+        path = index_path(vault_path)
+        if not path.exists():
+            print(f"No vault index at {path} (run: {Path(__file__).name} rebuild)")
+            sys.exit(1)
+        with VaultIndex.open(vault_path) as index:
+            for table in ('notes', 'fields', 'links', 'headings'):
+                count = index.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                print(f"{table:<10}{count:>10}")
+        sys.exit(0)
+
+    print(f"Usage: {Path(__file__).name} refresh|rebuild|stats [vault]", file=sys.stderr)
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,8 +14,15 @@ Exit codes:
 - 0: Always exits 0 to not block operations
 """
 
-import json
+import os
 import sys
+
+# Reject calls this hook would ignore before the heavier imports below
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('verify-mutation')
+
 import re
 from pathlib import Path
 
@@ -25,6 +32,13 @@ try:
 except AttributeError:
     pass
 
+# Shared hook context (stage entry point for post-mutation.py)
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.hook_context import HookContext, run_standalone
+from lib.markdown_document import parse_document
+
+HOOK_LABEL = 'Verify mutation'
+
 
 def validate_yaml_frontmatter(content: str) -> list:
     """
@@ -37,15 +51,8 @@ def validate_yaml_frontmatter(content: str) -> list:
     if not content.startswith('---'):
         return []  # No frontmatter, nothing to validate
 
-    # Find end of frontmatter
-    lines = content.split('\n')
-    end_index = -1
-    for i, line in enumerate(lines[1:], start=1):
-        if line.strip() == '---':
-            end_index = i
-            break
-
-    if end_index == -1:
+    document = parse_document(content)
+    if document.frontmatter_unclosed:
         issues.append({
             'type': 'frontmatter_unclosed',
             'message': 'Frontmatter opened with --- but never closed',
@@ -54,8 +61,8 @@ def validate_yaml_frontmatter(content: str) -> list:
         return issues
 
     # Extract frontmatter content
-    frontmatter_lines = lines[1:end_index]
-    frontmatter_text = '\n'.join(frontmatter_lines)
+    frontmatter_lines = document.frontmatter_lines
+    frontmatter_text = document.frontmatter_text
 
     # Try to parse with PyYAML if available
     try:
@@ -82,151 +89,192 @@ def validate_yaml_frontmatter(content: str) -> list:
     return issues
 
 
-def validate_wikilinks(content: str) -> list:
+# Single-token patterns with no nested quantifiers: each line is scanned
+# in one linear pass, however many brackets or backticks it holds
+_BACKTICKS_RE = re.compile(r'`+')
+_BRACKETS_RE = re.compile(r'\[\[|\]\]')
+
+# Longest nested-link excerpt quoted in a message
+NESTED_EXCERPT = 50
+
+
+def _mask_code_spans(line: str) -> str:
     """
-    Validate wikilink syntax is correct.
-    Returns list of issues found.
+    The line with inline code spans blanked out (same length, so columns
+    are kept). A backtick run opens a span closed by the next run of the
+    same length; a run with no such closer is literal.
     """
+    runs = list(_BACKTICKS_RE.finditer(line))
+    if len(runs) < 2:
+        return line
+
+    # Index of the next run of the same length, from one backward pass
+    closers = {}
+    next_run = {}
+    for i in range(len(runs) - 1, -1, -1):
+        length = len(runs[i].group())
+        if length in next_run:
+            closers[i] = next_run[length]
+        next_run[length] = i
+
+    pieces = []
+    position = 0
+    i = 0
+    while i < len(runs):
+        closer = closers.get(i)
+        if closer is None:
+            i += 1
+            continue
+        span_start, span_end = runs[i].start(), runs[closer].end()
+        pieces.append(line[position:span_start])
+        pieces.append(' ' * (span_end - span_start))
+        position = span_end
+        i = closer + 1
+    pieces.append(line[position:])
+    return ''.join(pieces)
+
+
+def _line_wikilink_issues(line: str, masked: str, line_num: int) -> list:
+    """Unclosed and nested wikilinks on one line, found in its masked copy."""
     issues = []
+    depth = 0  # Open [[ not yet closed
+    start = 0  # Column of the outermost open [[
+    nested = False
+
+    for token in _BRACKETS_RE.finditer(masked):
+        if token.group() == '[[':
+            if depth:
+                nested = True
+            else:
+                start, nested = token.start(), False
+            depth += 1
+        elif depth:
+            depth -= 1
+            if not depth and nested:
+                excerpt = line[start:token.end()]
+                if len(excerpt) > NESTED_EXCERPT:
+                    excerpt = excerpt[:NESTED_EXCERPT] + '...'
+                issues.append({
+                    'type': 'wikilink_nested',
+                    'message': f'Line {line_num}, column {start + 1}: Nested wikilinks detected: {excerpt}',
+                    'severity': 'error',
+                    'line': line_num,
+                    'column': start + 1
+                })
+
+    if depth:
+        # Wikilinks cannot span lines; report the outermost unclosed one
+        issues.append({
+            'type': 'wikilink_unclosed',
+            'message': f'Line {line_num}, column {start + 1}: Wikilink opened [[ but not closed on same line',
+            'severity': 'error',
+            'line': line_num,
+            'column': start + 1
+        })
+    return issues
+
+
+def validate_wikilinks(content: str, first_line: int = 1) -> list:
+    """
+    Validate wikilink syntax is correct.
+    Returns list of issues found, each with its line and column (1-based);
+    first_line is the line number of content's first line within the note.
 
-    # Find unclosed wikilinks
-    # Pattern: [[ without matching ]]
-    open_brackets = 0
+    Lines inside ``` code blocks are skipped and inline code spans are
+    ignored. Every line is tokenized with compiled single-token patterns,
+    so validation is linear in the size of the note.
+    """
+    issues = []
     in_code_block = False
-    in_inline_code = False
 
-    lines = content.split('\n')
-    for line_num, line in enumerate(lines, start=1):
+    for line_num, line in enumerate(content.split('\n'), start=first_line):
         # Track code blocks
-        if line.strip().startswith('```'):
+        if line.lstrip().startswith('```'):
             in_code_block = not in_code_block
             continue
 
-        if in_code_block:
+        if in_code_block or '[[' not in line:
             continue
 
-        # Check for wikilink issues in this line
-        i = 0
-        while i < len(line):
-            # Track inline code
-            if line[i] == '`':
-                in_inline_code = not in_inline_code
-                i += 1
-                continue
-
-            if in_inline_code:
-                i += 1
-                continue
-
-            # Check for [[ opening
-            if i < len(line) - 1 and line[i:i+2] == '[[':
-                # Find closing ]]
-                close_pos = line.find(']]', i + 2)
-                if close_pos == -1:
-                    # Check if it continues on next line (shouldn't for wikilinks)
-                    issues.append({
-                        'type': 'wikilink_unclosed',
-                        'message': f'Line {line_num}: Wikilink opened [[ but not closed on same line',
-                        'severity': 'error',
-                        'line': line_num
-                    })
-                i += 2
-            else:
-                i += 1
+        masked = _mask_code_spans(line) if '`' in line else line
 
-    # Check for nested wikilinks (invalid)
-    nested_pattern = r'\[\[.*\[\[.*\]\].*\]\]'
-    for match in re.finditer(nested_pattern, content):
-        issues.append({
-            'type': 'wikilink_nested',
-            'message': f'Nested wikilinks detected: {match.group()[:50]}...',
-            'severity': 'error'
-        })
+        # Fast path: nothing but well-formed [[...]] pairs
+        brackets = _BRACKETS_RE.findall(masked)
+        if ''.join(brackets) == '[[]]' * (len(brackets) // 2):
+            continue
+
+        issues.extend(_line_wikilink_issues(line, masked, line_num))
 
     return issues
 
 
-def main():
+def process(ctx: HookContext) -> None:
+    """Verify the edited file (stage entry point)."""
+    # Only run on Edit/Write
+    if ctx.tool_name not in ['Edit', 'Write']:
+        return
+
+    file_path = ctx.file_path
+
+    # Only check markdown files
+    if not file_path.endswith('.md'):
+        return
+
+    # Skip .claude directory
+    if '.claude' in file_path:
+        return
+
+    # Check if file exists
+    if not ctx.exists:
+        ctx.print(f"\n⚠️  Post-Mutation Warning: File no longer exists: {file_path}", file=sys.stderr)
+        return
+
+    # Read and validate
     try:
-        # Read hook input from stdin
-        hook_input = json.load(sys.stdin)
+        content = ctx.content
+    except Exception as e:
+        ctx.print(f"\n⚠️  Post-Mutation Warning: Cannot read file after write: {e}", file=sys.stderr)
+        return
 
-        # Only run on Edit/Write
-        tool_name = hook_input.get('tool_name', '')
-        if tool_name not in ['Edit', 'Write']:
-            sys.exit(0)
+    all_issues = []
 
-        # Get the file path from tool input
-        tool_input = hook_input.get('tool_input', {})
-        file_path = tool_input.get('file_path', '')
+    # Validate YAML frontmatter
+    yaml_issues = validate_yaml_frontmatter(content)
+    all_issues.extend(yaml_issues)
 
-        # Only check markdown files
-        if not file_path.endswith('.md'):
-            sys.exit(0)
+    # Validate wikilinks (only around the edit if it can be located)
+    region = ctx.edit_region
+    if region is not None:
+        wikilink_issues = validate_wikilinks(region.text(content), region.first_line)
+    else:
+        wikilink_issues = validate_wikilinks(content)
+    all_issues.extend(wikilink_issues)
 
-        # Skip .claude directory
-        if '.claude' in file_path:
-            sys.exit(0)
+    # Report issues
+    if all_issues:
+        errors = [i for i in all_issues if i['severity'] == 'error']
+        warnings = [i for i in all_issues if i['severity'] == 'warning']
 
-        # Check if file exists
-        path = Path(file_path)
-        if not path.exists():
-            print(f"\n⚠️  Post-Mutation Warning: File no longer exists: {file_path}", file=sys.stderr)
-            sys.exit(0)
+        ctx.print(f"\n⚠️  Post-Mutation Verification: {ctx.path.name}")
+        ctx.print("-" * 60)
 
-        # Read and validate
-        try:
-            content = path.read_text(encoding='utf-8')
-        except Exception as e:
-            print(f"\n⚠️  Post-Mutation Warning: Cannot read file after write: {e}", file=sys.stderr)
-            sys.exit(0)
+        if errors:
+            ctx.print(f"ERRORS ({len(errors)}):")
+            for issue in errors:
+                ctx.print(f"  ❌ {issue['message']}")
 
-        all_issues = []
+        if warnings:
+            ctx.print(f"WARNINGS ({len(warnings)}):")
+            for issue in warnings:
+                ctx.print(f"  ⚠️  {issue['message']}")
 
-        # Validate YAML frontmatter
-        yaml_issues = validate_yaml_frontmatter(content)
-        all_issues.extend(yaml_issues)
+        ctx.print("-" * 60)
+        ctx.print("Action: Review and fix the issues above.")
+        ctx.print("")
 
-        # Validate wikilinks
-        wikilink_issues = validate_wikilinks(content)
-        all_issues.extend(wikilink_issues)
-
-        # Report issues
-        if all_issues:
-            errors = [i for i in all_issues if i['severity'] == 'error']
-            warnings = [i for i in all_issues if i['severity'] == 'warning']
-
-            print(f"\n⚠️  Post-Mutation Verification: {path.name}")
-            print("-" * 60)
-
-            if errors:
-                print(f"ERRORS ({len(errors)}):")
-                for issue in errors:
-                    print(f"  ❌ {issue['message']}")
-
-            if warnings:
-                print(f"WARNINGS ({len(warnings)}):")
-                for issue in warnings:
-                    print(f"  ⚠️  {issue['message']}")
-
-            print("-" * 60)
-            print("Action: Review and fix the issues above.")
-            print("")
-
-        sys.exit(0)
-
-    except json.JSONDecodeError:
-        # No input or invalid JSON - skip silently
-        sys.exit(0)
-    except FileNotFoundError as e:
-        print(f"[flywheel] Verify mutation: File not found - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except PermissionError as e:
-        print(f"[flywheel] Verify mutation: Permission denied - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except Exception as e:
-        print(f"[flywheel] Verify mutation error: {type(e).__name__}: {e}", file=sys.stderr)
-        sys.exit(0)
+
+def main():
+    run_standalone(process, HOOK_LABEL)
 
 
 if __name__ == '__main__':
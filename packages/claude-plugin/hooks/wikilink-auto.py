@@ -26,13 +26,35 @@ Protected zones (never wikilinked):
 - Obsidian comments (%% ... %%)
 - Math expressions ($ ... $)
 
+Batch mode links every note in a vault at once (for imported vaults that
+start without links), with a process pool, atomic per-file writes and
+resumable progress:
+
+    python3 wikilink-auto.py --batch <vault> [--dry-run [--diff]] [--resume] [--workers N]
+
+Batch mode links only entities with a page (--heuristics adds the rest),
+and never an entity a note already links to.
+
 Exit codes:
-- 0: Always (informational only, never blocks)
+- 0: Always as a hook (informational only, never blocks)
+- 1: Batch mode found no entities, or could not read or write some notes
 """
 
-import json
+import os
 import sys
+
+# Reject calls this hook would ignore before the heavier imports below
+# (hook calls only; batch mode takes arguments and no stdin)
+if __name__ == '__main__' and len(sys.argv) == 1:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from lib.bootstrap import prefilter
+    prefilter('wikilink-auto')
+
+import argparse
+import json
 import re
+import subprocess
+import time
 from pathlib import Path
 from collections import defaultdict
 
@@ -42,6 +64,34 @@ try:
 except AttributeError:
     pass
 
+# Add parent directory to path for config import
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config.loader import get_periodic_folders
+
+# Shared hook context (stage entry point for post-mutation.py)
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.entity_matcher import EntityMatcher, fold_case, is_word_char
+from lib.entity_table import MIXED_CASE, EntityTable, encode_entity_table
+from lib.hook_context import HookContext, run_standalone
+from lib.hook_timing import current as current_timer
+from lib.markdown_document import MarkdownDocument
+from lib.protected_zones import ZoneIndex, apply_edits, scan_protected_zones
+from lib.wikilink_entities import (
+    CACHE_FILE, TABLE_FILE, compile_exclusions, is_valid_entity, page_names, relative_page_path,
+    start_background_build, upsert_page, write_bytes_atomic
+)
+
+HOOK_LABEL = 'Wikilink suggest'
+
+# Vault files whose changes make the stage re-run on unchanged notes (lib/content_digest.py)
+VERSION_FILES = (f'.claude/{CACHE_FILE}', f'.claude/{TABLE_FILE}')
+
+# Notes a --batch write run has finished, for --resume (in the vault's .claude/)
+BATCH_PROGRESS_FILE = 'wikilink-batch.progress'
+
+# Documentation files that are never linked
+ROOT_SKIP = ['README.md', 'CONTRIBUTING.md', 'LICENSE.md', 'CHANGELOG.md']
+
 
 # Common words to exclude from wikilink suggestions
 EXCLUDE_WORDS = {
@@ -60,156 +110,151 @@ EXCLUDE_PHRASES = {
 }
 
 
-def load_wikilinks_from_cache(vault_path: Path) -> set:
-    """Load existing wikilinks from cache file."""
-    cache_file = vault_path / '.claude' / 'wikilink-entities.json'
+# Loaded entity tables by cache file, reused while the files are unchanged.
+# Only pays off in a long-lived process (hook-server.py).
+_entity_cache_memo = {}
 
-    if not cache_file.exists():
-        # Fallback: scan vault if cache doesn't exist
-        return extract_existing_wikilinks_fallback(vault_path)
 
+def _cache_stamp(cache_file: Path, table_file: Path) -> tuple:
+    """(mtime, size) of the JSON cache and of the binary table, or None for a table older than the JSON."""
+    stat = cache_file.stat()
     try:
-        cache_data = json.loads(cache_file.read_text(encoding='utf-8'))
-        wikilinks = set()
-
-        # Combine all categories (skip metadata)
-        for category, entities in cache_data.items():
-            if category != '_metadata':
-                wikilinks.update(entities)
-
-        return wikilinks
-    except Exception:
-        # Fallback on error
-        return extract_existing_wikilinks_fallback(vault_path)
+        table = table_file.stat()
+    except OSError:
+        table = None
+    if table is not None and table.st_mtime_ns < stat.st_mtime_ns:
+        table = None  # Written before the JSON (hand edit, older plugin version)
+    return (stat.st_mtime_ns, stat.st_size), (table.st_mtime_ns, table.st_size) if table else None
 
 
-def extract_existing_wikilinks_fallback(vault_path: Path) -> set:
-    """Fallback: Extract all existing wikilinks from the vault."""
-    wikilinks = set()
-
-    # Search all markdown files
-    for md_file in vault_path.rglob('*.md'):
-        # Skip .claude directory
-        if '.claude' in str(md_file):
-            continue
-
-        try:
-            content = md_file.read_text(encoding='utf-8')
-            # Match [[wikilink]] and [[wikilink|alias]]
-            matches = re.findall(r'\[\[([^\]|]+)(?:\|[^\]]+)?\]\]', content)
-            wikilinks.update(matches)
-        except Exception:
-            continue
+def load_wikilinks_from_cache(vault_path: Path) -> EntityTable:
+    """Load the entity table for the vault.
 
-    return wikilinks
+    Maps .claude/wikilink-entities.bin (lookups by binary search, nothing
+    materialized). If it is missing or older than the JSON export, the
+    JSON is parsed instead and the table written for the next edit.
 
+    If the cache is missing or unreadable, a background build is started
+    (at most one per vault) and no cached entities are used for this edit.
+    """
+    cache_file = vault_path / '.claude' / CACHE_FILE
+    table_file = cache_file.with_name(TABLE_FILE)
 
-def find_frontmatter_end(content: str) -> int:
-    """Find where YAML frontmatter ends. Returns 0 if no frontmatter."""
-    if not content.startswith('---'):
-        return 0
+    if not cache_file.exists():
+        start_background_build(vault_path)
+        return EntityTable.from_cache({})
 
-    # Find the closing --- (must be on its own line)
-    lines = content.split('\n')
-    if len(lines) < 2:
-        return 0
+    try:
+        stamp = _cache_stamp(cache_file, table_file)
+        memo = _entity_cache_memo.get(cache_file)
+        if memo and memo[0] == stamp:
+            return memo[1]
+
+        if stamp[1] is not None:
+            table = EntityTable.load(table_file)
+        else:
+            data = encode_entity_table(json.loads(cache_file.read_text(encoding='utf-8')))
+            table = EntityTable(data)
+            try:
+                write_bytes_atomic(table_file, data)
+                stamp = _cache_stamp(cache_file, table_file)
+            except OSError:
+                pass
 
-    # Start after the opening ---
-    for i, line in enumerate(lines[1:], start=1):
-        if line.strip() == '---':
-            # Calculate character position after closing ---
-            return sum(len(l) + 1 for l in lines[:i+1])
+        _entity_cache_memo[cache_file] = (stamp, table)
+        return table
+    except Exception:
+        # Corrupt cache - rebuild it in the background
+        start_background_build(vault_path)
+        return EntityTable.from_cache({})
 
-    return 0  # No closing --- found
 
+def upsert_written_page(ctx: HookContext, existing_wikilinks: EntityTable) -> list:
+    """Add the edited page to the entity cache if it is not there yet.
 
-def apply_wikilinks(content: str, entities_to_link: list) -> tuple[str, int]:
-    """Apply wikilinks to entities in content.
-
-    Returns: (updated_content, count_of_links_added)
+    Makes notes created during a session linkable without waiting for the
+    next cache rebuild. Costs a table lookup when the page is already known
+    or is never an entity (daily notes, periodic folders).
+    """
+    rel_file = relative_page_path(ctx.path, ctx.vault_path)
+    if rel_file is None:
+        return []
+    periodic_folders = get_periodic_folders(ctx.config)
+    exclude_re = compile_exclusions(periodic_folders)
+    if all(page in existing_wikilinks or not is_valid_entity(page, exclude_re)
+           for page in page_names(rel_file)):
+        return []
+    if not existing_wikilinks and not (ctx.vault_path / '.claude' / CACHE_FILE).exists():
+        return []  # No cache yet; the background build will include this page
+    return upsert_page(ctx.vault_path, rel_file, periodic_folders)
+
+
+def choose_links(content: str, entities_to_link: list, zones: ZoneIndex = None) -> list:
+    """Pick the occurrences apply_wikilinks links: [(start, end, entity), ...] by start.
+
+    Args:
+        zones: Protected zones of content (scanned here if not given)
     """
     if not entities_to_link:
-        return content, 0
+        return []
 
     # Sort by length (longest first) to avoid partial replacements
     entities_sorted = sorted(set(entities_to_link), key=len, reverse=True)
 
-    # Skip areas we shouldn't link
-    # CRITICAL: Skip YAML frontmatter (first thing in file between --- markers)
-    frontmatter_end = find_frontmatter_end(content)
-    frontmatter = [(0, frontmatter_end)] if frontmatter_end > 0 else []
-
-    # Remove code blocks
-    code_block_pattern = r'```[\s\S]*?```'
-    code_blocks = list(re.finditer(code_block_pattern, content))
+    # Skip areas we shouldn't link (frontmatter, code, links, URLs, tags, comments, math)
+    # New links are added to this index, so never modify the caller's copy
+    zones = zones.copy() if zones is not None else scan_protected_zones(content)
 
-    # Remove inline code
-    inline_code_pattern = r'`[^`]+`'
-    inline_codes = list(re.finditer(inline_code_pattern, content))
+    # One automaton pass finds every occurrence of every entity
+    occurrences = defaultdict(list)
+    for start, end, entity in EntityMatcher(entities_sorted).find_all(content):
+        occurrences[entity].append((start, end))
 
-    # Remove existing wikilinks
-    wikilink_pattern = r'\[\[[^\]]+\]\]'
-    existing_links = list(re.finditer(wikilink_pattern, content))
+    # Links are chosen in original-content offsets, then spliced in once
+    links = []
+    link_starts, link_ends = set(), set()
 
-    # Remove markdown links [text](url)
-    markdown_link_pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
-    markdown_links = list(re.finditer(markdown_link_pattern, content))
-
-    # Remove bare URLs (http:// or https://)
-    url_pattern = r'https?://[^\s\)\]]+(?:\([^\)]+\))?[^\s\)\]]*'
-    bare_urls = list(re.finditer(url_pattern, content))
-
-    # Remove hashtags (don't wikilink inside tags like #habit, #work)
-    hashtag_pattern = r'#[\w-]+'
-    hashtags = list(re.finditer(hashtag_pattern, content))
-
-    # Remove HTML/XML tags (angle brackets break Obsidian rendering)
-    html_tag_pattern = r'<[^>]+>'
-    html_tags = list(re.finditer(html_tag_pattern, content))
-
-    # Remove Obsidian comments (%% ... %%)
-    obsidian_comment_pattern = r'%%.*?%%'
-    obsidian_comments = list(re.finditer(obsidian_comment_pattern, content, re.DOTALL))
-
-    # Remove math expressions ($ ... $ and $$ ... $$)
-    math_block_pattern = r'\$\$[\s\S]*?\$\$|\$[^\$]+\$'
-    math_blocks = list(re.finditer(math_block_pattern, content))
+    for entity in entities_sorted:
+        last_end = 0
+        for start, end in sorted(occurrences.get(entity, ())):
+            # Same leftmost, non-overlapping order re.finditer would use
+            if start < last_end:
+                continue
+            last_end = end
+
+            # A neighbouring link puts ']]' / '[[' next to this match,
+            # which removes the word boundary on that side
+            if start in link_ends and not is_word_char(content[start]):
+                continue
+            if end in link_starts and not is_word_char(content[end - 1]):
+                continue
 
-    # Combine all skip zones (frontmatter MUST be first to protect it)
-    skip_zones = frontmatter + [(m.start(), m.end()) for m in code_blocks + inline_codes + existing_links + markdown_links + bare_urls + hashtags + html_tags + obsidian_comments + math_blocks]
-    skip_zones.sort()
+            # Check if this match is in a skip zone
+            if not zones.overlaps(start, end):
+                links.append((start, end, entity))
+                link_starts.add(start)
+                link_ends.add(end)
+                # Add this new wikilink to skip zones
+                zones.add(start, end, 'wikilink')
+                break  # Only link first occurrence to avoid over-linking
 
-    links_added = 0
-    new_content = content
+    return sorted(links)
 
-    for entity in entities_sorted:
-        # Find all occurrences with word boundaries (case-insensitive)
-        pattern = r'\b' + re.escape(entity) + r'\b'
 
-        for match in re.finditer(pattern, new_content, re.IGNORECASE):
-            start, end = match.start(), match.end()
+def apply_wikilinks(content: str, entities_to_link: list, zones: ZoneIndex = None) -> tuple[str, int]:
+    """Apply wikilinks to entities in content.
 
-            # Check if this match is in a skip zone
-            in_skip_zone = any(s <= start < e or s < end <= e for s, e in skip_zones)
-
-            if not in_skip_zone:
-                # Apply wikilink
-                matched_text = match.group()
-                wikilinked = f'[[{entity}]]'
-                new_content = new_content[:start] + wikilinked + new_content[end:]
-
-                # Update skip zones (shift positions after this insertion)
-                shift = len(wikilinked) - len(matched_text)
-                skip_zones = [(s if s <= start else s + shift,
-                              e if e <= start else e + shift) for s, e in skip_zones]
-                # Add this new wikilink to skip zones
-                skip_zones.append((start, start + len(wikilinked)))
-                skip_zones.sort()
+    Args:
+        zones: Protected zones of content (scanned here if not given)
 
-                links_added += 1
-                break  # Only link first occurrence to avoid over-linking
+    Returns: (updated_content, count_of_links_added)
+    """
+    links = choose_links(content, entities_to_link, zones)
+    if not links:
+        return content, 0
 
-    return new_content, links_added
+    edits = [(start, end, f'[[{entity}]]') for start, end, entity in links]
+    return apply_edits(content, edits), len(links)
 
 
 def find_heuristic_candidates(content_no_code: str) -> dict:
@@ -294,32 +339,14 @@ def find_heuristic_candidates(content_no_code: str) -> dict:
     return heuristic
 
 
-def find_linkable_candidates(content: str, existing_wikilinks: set) -> dict:
+def find_linkable_candidates(content: str, existing_wikilinks: EntityTable, zones: ZoneIndex = None) -> dict:
     """Find potential wikilink candidates in content."""
     candidates = defaultdict(list)
 
-    # Remove code blocks and already wikilinked content
-    # CRITICAL: Remove YAML frontmatter first
-    frontmatter_end = find_frontmatter_end(content)
-    content_no_code = content[frontmatter_end:] if frontmatter_end > 0 else content
-    # Remove fenced code blocks
-    content_no_code = re.sub(r'```[\s\S]*?```', '', content_no_code)
-    # Remove inline code
-    content_no_code = re.sub(r'`[^`]+`', '', content_no_code)
-    # Remove existing wikilinks
-    content_no_code = re.sub(r'\[\[[^\]]+\]\]', '', content_no_code)
-    # Remove markdown links [text](url)
-    content_no_code = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', '', content_no_code)
-    # Remove bare URLs (http:// or https://)
-    content_no_code = re.sub(r'https?://[^\s\)\]]+(?:\([^\)]+\))?[^\s\)\]]*', '', content_no_code)
-    # Remove hashtags
-    content_no_code = re.sub(r'#[\w-]+', '', content_no_code)
-    # Remove HTML/XML tags
-    content_no_code = re.sub(r'<[^>]+>', '', content_no_code)
-    # Remove Obsidian comments
-    content_no_code = re.sub(r'%%.*?%%', '', content_no_code, flags=re.DOTALL)
-    # Remove math expressions
-    content_no_code = re.sub(r'\$\$[\s\S]*?\$\$|\$[^\$]+\$', '', content_no_code)
+    # Remove frontmatter, code blocks and already wikilinked content
+    if zones is None:
+        zones = scan_protected_zones(content)
+    content_no_code = zones.strip(content)
 
     # Pattern 1: Capitalized multi-word phrases (2-4 words)
     multi_word_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b'
@@ -338,12 +365,9 @@ def find_linkable_candidates(content: str, existing_wikilinks: set) -> dict:
             candidates['Acronyms/Projects'].append(acronym)
 
     # Pattern 3: Technology/tool names (known from existing wikilinks)
-    for wikilink in existing_wikilinks:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(wikilink) + r'\b'
-        if re.search(pattern, content_no_code, re.IGNORECASE):
-            if any(char.isupper() for char in wikilink) and any(char.islower() for char in wikilink):
-                candidates['Existing Entities'].append(wikilink)
+    # Prefix search of the table for mixed-case entities (word-bounded, case-insensitive)
+    for wikilink in existing_wikilinks.entities_in(content_no_code, MIXED_CASE):
+        candidates['Existing Entities'].append(wikilink)
 
     # Deduplicate each category
     for category in candidates:
@@ -352,6 +376,35 @@ def find_linkable_candidates(content: str, existing_wikilinks: set) -> dict:
     return candidates
 
 
+def collect_candidates(content: str, existing_wikilinks: EntityTable, zones: ZoneIndex,
+                       heuristics: bool = True) -> dict:
+    """Entities to link in content, by display category (cache first, then heuristics)."""
+    # TIER 1: Find cache-based candidates (entities with backing notes)
+    cache_candidates = find_linkable_candidates(content, existing_wikilinks, zones)
+
+    # TIER 2: Find heuristic candidates (high-probability patterns)
+    heuristic_candidates = find_heuristic_candidates(zones.strip(content)) if heuristics else {}
+
+    # Merge candidates (cache takes precedence, heuristic fills gaps)
+    all_candidates = defaultdict(list)
+
+    # Add cache-based first (HIGH confidence - they have backing notes)
+    for category, items in cache_candidates.items():
+        all_candidates[f"✓ {category} (Has Notes)"].extend(items)
+
+    # Add heuristic-based (MEDIUM-HIGH confidence - pattern match only)
+    for category, items in heuristic_candidates.items():
+        # Don't add if already in cache
+        new_items = [item for item in items if not any(
+            item in cache_items for cache_items in cache_candidates.values()
+        )]
+        if new_items:
+            all_candidates[f"⚡ {category} (Heuristic)"].extend(new_items)
+
+    # Remove empty categories
+    return {k: v for k, v in all_candidates.items() if v}
+
+
 def get_vault_path_from_env() -> Path | None:
     """Get the vault path from PROJECT_PATH environment variable."""
     import os
@@ -384,152 +437,207 @@ def is_within_vault(file_path: Path, vault_path: Path) -> bool:
         return False
 
 
-def main():
+def is_skipped_note(file_path: str) -> bool:
+    """Files never auto-linked: non-markdown, dot folders, CLAUDE.md and docs."""
+    # Only check markdown files
+    if not file_path.endswith('.md'):
+        return True
+
+    # Skip any dot-folder (.claude, .git, .obsidian, etc.)
+    # Check if any path component starts with a dot
+    path_parts = Path(file_path).parts
+    if any(part.startswith('.') and len(part) > 1 for part in path_parts):
+        return True
+
+    # Skip CLAUDE.md files (case-insensitive)
+    if file_path.lower().endswith('claude.md'):
+        return True
+
+    # Skip documentation/ directory
+    if '/documentation/' in file_path or '\\documentation\\' in file_path:
+        return True
+
+    # Skip docs/ directory (repo documentation)
+    if '/docs/' in file_path or '\\docs\\' in file_path:
+        return True
+
+    # Skip root-level documentation files
+    return Path(file_path).name in ROOT_SKIP
+
+
+def process(ctx: HookContext) -> None:
+    """Auto-apply wikilinks to the edited file (stage entry point)."""
+    # CRITICAL: Only run auto-fixes on Edit/Write, not Read
+    if ctx.tool_name not in ['Edit', 'Write']:
+        return
+
+    file_path = ctx.file_path
+
+    # CRITICAL: Check vault boundary - only operate on files within PROJECT_PATH
+    # This prevents pollution of files outside the vault (e.g., other repos)
+    env_vault_path = get_vault_path_from_env()
+    if env_vault_path:
+        file_p = Path(file_path)
+        if not is_within_vault(file_p, env_vault_path):
+            # File is outside vault - skip silently
+            return
+
+    if is_skipped_note(file_path):
+        return
+
+    # Check if file exists
+    if not ctx.exists:
+        return
+
+    # Load existing wikilinks from cache
+    existing_wikilinks = load_wikilinks_from_cache(ctx.vault_path)
+    current_timer().count('entities', len(existing_wikilinks))
+
+    # New pages become linkable from the next edit (not linked to themselves here)
+    upsert_written_page(ctx, existing_wikilinks)
+
+    # Only the region around an Edit is analyzed when it can be located;
+    # one tokenizer pass (shared document for whole notes) feeds every step below
+    region = ctx.edit_region
+    if region is not None:
+        content = region.text(ctx.content)
+        zones = scan_protected_zones(content)
+    else:
+        content = ctx.content
+        zones = ctx.document.zones()
+    all_candidates = collect_candidates(content, existing_wikilinks, zones)
+
+    if all_candidates:
+        # Collect all entities to link
+        all_entities = []
+        for items in all_candidates.values():
+            all_entities.extend(items)
+
+        # Apply wikilinks automatically
+        updated_content, links_added = apply_wikilinks(content, all_entities, zones)
+
+        if links_added > 0:
+            # Hand updated content back for write-back
+            ctx.content = region.splice(ctx.content, updated_content) if region is not None else updated_content
+
+            ctx.print(f"\n✓ Auto-Applied {links_added} Wikilinks to {ctx.path.name}")
+            ctx.print("-" * 60)
+
+            for category, items in all_candidates.items():
+                # Show what was linked (limit to top 5 per category)
+                display_items = items[:min(5, len(items))]
+                ctx.print(f"{category}: {', '.join(display_items)}")
+                if len(items) > 5:
+                    ctx.print(f"  ... and {len(items) - 5} more")
+
+            ctx.print("-" * 60)
+            ctx.print("")
+
+
+def link_note(content: str, rel_path: str, vault: str, heuristics: bool = False) -> tuple:
+    """Batch fixer (--batch): link the entities in one whole note.
+
+    Same candidates, protected zones and apply_wikilinks choice as process(),
+    except that entities the note already links to, and the note's own name,
+    are left alone, so linking a note again (e.g. after --resume) adds nothing.
+
+    Returns: (updated_content, [entity per link added])
+    """
+    if is_skipped_note(str(Path(vault) / rel_path)):
+        return content, []
+
+    existing_wikilinks = load_wikilinks_from_cache(Path(vault))
+    document = MarkdownDocument(content)
+    zones = document.zones()
+
+    # Compare by page name: [[people/Sarah Chen]] already links Sarah Chen
+    linked = {fold_case(link.target.strip().rsplit('/', 1)[-1]) for link in document.wikilinks}
+    linked.add(fold_case(page_names(rel_path)[0]))
+
+    entities = [
+        entity
+        for items in collect_candidates(content, existing_wikilinks, zones, heuristics).values()
+        for entity in items
+        if fold_case(entity.rsplit('/', 1)[-1]) not in linked
+    ]
+    links = choose_links(content, entities, zones)
+    if not links:
+        return content, []
+
+    edits = [(start, end, f'[[{entity}]]') for start, end, entity in links]
+    return apply_edits(content, edits), [entity for _, _, entity in links]
+
+
+def run_batch_mode(argv: list) -> int:
+    """Link entities across every note in a vault; returns the exit code."""
+    from lib.vault_batch import BatchProgress, run_batch
+
+    parser = argparse.ArgumentParser(prog='wikilink-auto.py', description='Apply wikilinks across a vault')
+    parser.add_argument('--batch', type=Path, required=True, metavar='VAULT',
+                        help='Vault to link (entity cache in its .claude/, built if missing)')
+    parser.add_argument('--dry-run', action='store_true', help='Report links per note instead of writing')
+    parser.add_argument('--diff', action='store_true', help='With --dry-run, print diffs instead of counts')
+    parser.add_argument('--heuristics', action='store_true',
+                        help='Also link heuristic phrases that have no note (off: only existing pages)')
+    parser.add_argument('--resume', action='store_true', help='Skip notes an interrupted run already linked')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    vault = args.batch.resolve()
+    if not vault.is_dir():
+        print(f"Not a directory: {args.batch}", file=sys.stderr)
+        return 1
+
+    # Build the cache up front; workers then only map its binary table
+    if not (vault / '.claude' / CACHE_FILE).exists():
+        subprocess.run([sys.executable, str(Path(__file__).parent / 'wikilink-cache.py')],
+                       cwd=str(vault), stdout=subprocess.DEVNULL)
+    entity_count = len(load_wikilinks_from_cache(vault))
+    if not entity_count:
+        print(f"No entities in {vault / '.claude' / CACHE_FILE}", file=sys.stderr)
+        return 1
+
+    progress = None if args.dry_run else BatchProgress(vault / '.claude' / BATCH_PROGRESS_FILE, args.resume)
+    skip = progress.done if progress else set()
+    if skip:
+        print(f"Resuming: {len(skip)} notes already linked")
+
+    scanned = changed = links = errors = 0
+    start = time.perf_counter()
+    finished = False
     try:
-        # Read hook input from stdin
-        hook_input = json.load(sys.stdin)
-
-        # CRITICAL: Only run auto-fixes on Edit/Write, not Read
-        tool_name = hook_input.get('tool_name', '')
-        if tool_name not in ['Edit', 'Write']:
-            sys.exit(0)
-
-        # Get the file path from tool input
-        tool_input = hook_input.get('tool_input', {})
-        file_path = tool_input.get('file_path', '')
-
-        # CRITICAL: Check vault boundary - only operate on files within PROJECT_PATH
-        # This prevents pollution of files outside the vault (e.g., other repos)
-        env_vault_path = get_vault_path_from_env()
-        if env_vault_path:
-            file_p = Path(file_path)
-            if not is_within_vault(file_p, env_vault_path):
-                # File is outside vault - skip silently
-                sys.exit(0)
-
-        # Only check markdown files
-        if not file_path.endswith('.md'):
-            sys.exit(0)
-
-        # Skip any dot-folder (.claude, .git, .obsidian, etc.)
-        # Check if any path component starts with a dot
-        path_parts = Path(file_path).parts
-        if any(part.startswith('.') and len(part) > 1 for part in path_parts):
-            sys.exit(0)
-
-        # Skip CLAUDE.md files (case-insensitive)
-        if file_path.lower().endswith('claude.md'):
-            sys.exit(0)
-
-        # Skip documentation/ directory
-        if '/documentation/' in file_path or '\\documentation\\' in file_path:
-            sys.exit(0)
-
-        # Skip docs/ directory (repo documentation)
-        if '/docs/' in file_path or '\\docs\\' in file_path:
-            sys.exit(0)
-
-        # Skip root-level documentation files
-        root_skip = ['README.md', 'CONTRIBUTING.md', 'LICENSE.md', 'CHANGELOG.md']
-        file_name = Path(file_path).name
-        if file_name in root_skip:
-            sys.exit(0)
-
-        # Check if file exists
-        path = Path(file_path)
-        if not path.exists():
-            sys.exit(0)
-
-        # Get vault root (assuming file is in vault)
-        vault_path = path
-        while vault_path.parent != vault_path:
-            if (vault_path / '.obsidian').exists() or (vault_path / '.claude').exists():
-                break
-            vault_path = vault_path.parent
-
-        # Load existing wikilinks from cache
-        existing_wikilinks = load_wikilinks_from_cache(vault_path)
-
-        # Read file content
-        content = path.read_text(encoding='utf-8')
-
-        # Prepare cleaned content for analysis (reuse the cleaning logic)
-        frontmatter_end = find_frontmatter_end(content)
-        content_no_code = content[frontmatter_end:] if frontmatter_end > 0 else content
-        content_no_code = re.sub(r'```[\s\S]*?```', '', content_no_code)
-        content_no_code = re.sub(r'`[^`]+`', '', content_no_code)
-        content_no_code = re.sub(r'\[\[[^\]]+\]\]', '', content_no_code)
-        content_no_code = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', '', content_no_code)
-        content_no_code = re.sub(r'https?://[^\s\)\]]+(?:\([^\)]+\))?[^\s\)\]]*', '', content_no_code)
-        content_no_code = re.sub(r'#[\w-]+', '', content_no_code)
-        content_no_code = re.sub(r'<[^>]+>', '', content_no_code)
-        content_no_code = re.sub(r'%%.*?%%', '', content_no_code, flags=re.DOTALL)
-        content_no_code = re.sub(r'\$\$[\s\S]*?\$\$|\$[^\$]+\$', '', content_no_code)
-
-        # TIER 1: Find cache-based candidates (entities with backing notes)
-        cache_candidates = find_linkable_candidates(content, existing_wikilinks)
-
-        # TIER 2: Find heuristic candidates (high-probability patterns)
-        heuristic_candidates = find_heuristic_candidates(content_no_code)
-
-        # Merge candidates (cache takes precedence, heuristic fills gaps)
-        all_candidates = defaultdict(list)
-
-        # Add cache-based first (HIGH confidence - they have backing notes)
-        for category, items in cache_candidates.items():
-            all_candidates[f"✓ {category} (Has Notes)"].extend(items)
-
-        # Add heuristic-based (MEDIUM-HIGH confidence - pattern match only)
-        for category, items in heuristic_candidates.items():
-            # Don't add if already in cache
-            new_items = [item for item in items if not any(
-                item in cache_items for cache_items in cache_candidates.values()
-            )]
-            if new_items:
-                all_candidates[f"⚡ {category} (Heuristic)"].extend(new_items)
-
-        # Remove empty categories
-        all_candidates = {k: v for k, v in all_candidates.items() if v}
-
-        if all_candidates:
-            # Collect all entities to link
-            all_entities = []
-            for items in all_candidates.values():
-                all_entities.extend(items)
-
-            # Apply wikilinks automatically
-            updated_content, links_added = apply_wikilinks(content, all_entities)
-
-            if links_added > 0:
-                # Write updated content back to file
-                path.write_text(updated_content, encoding='utf-8')
-
-                print(f"\n✓ Auto-Applied {links_added} Wikilinks to {path.name}")
-                print("-" * 60)
-
-                for category, items in all_candidates.items():
-                    # Show what was linked (limit to top 5 per category)
-                    display_items = items[:min(5, len(items))]
-                    print(f"{category}: {', '.join(display_items)}")
-                    if len(items) > 5:
-                        print(f"  ... and {len(items) - 5} more")
-
-                print("-" * 60)
-                print("")
-
-        sys.exit(0)
-
-    except json.JSONDecodeError:
-        sys.exit(0)
-    except FileNotFoundError as e:
-        print(f"[flywheel] Wikilink suggest: File not found - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except PermissionError as e:
-        print(f"[flywheel] Wikilink suggest: Permission denied - {e.filename}", file=sys.stderr)
-        sys.exit(0)
-    except Exception as e:
-        print(f"[flywheel] Wikilink suggest error: {type(e).__name__}: {e}", file=sys.stderr)
-        sys.exit(0)
+        for result in run_batch(vault, 'wikilink-auto', 'link_note', args.dry_run, args.workers,
+                                options={'vault': str(vault), 'heuristics': args.heuristics}, skip=skip):
+            scanned += 1
+            if result.error:
+                errors += 1
+                print(f"{result.rel_path}: {result.error}", file=sys.stderr)
+                continue
+            if progress:
+                progress.record(result.rel_path)
+            if result.fixes:
+                changed += 1
+                links += result.fixes
+                if args.dry_run and args.diff:
+                    print(result.diff, end='')
+                else:
+                    print(f"{result.rel_path}: {result.fixes} links")
+        finished = True
+    finally:
+        # Notes that failed stay out of the log, so a resumed run retries them
+        if progress:
+            progress.close(finished=finished and not errors)
+
+    verb = 'Would add' if args.dry_run else 'Added'
+    print(f"{verb} {links} links in {changed} of {scanned} notes "
+          f"({entity_count} entities, {time.perf_counter() - start:.1f}s)")
+    return 1 if errors else 0
+
+
+def main():
+    if len(sys.argv) > 1:
+        sys.exit(run_batch_mode(sys.argv[1:]))
+    run_standalone(process, HOOK_LABEL)
 
 
 if __name__ == '__main__':
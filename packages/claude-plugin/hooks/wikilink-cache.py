@@ -7,15 +7,22 @@ Part of the wikilink-* hook family:
 - wikilink-auto.py  : PostToolUse  - Auto-applies wikilinks after edits
 
 Scans the vault for actual .md files and builds a cache of valid entities
-that can be wikilinked. Only includes pages that actually exist.
+that can be wikilinked. Only includes pages that actually exist. The
+cache is written as JSON and as the binary table wikilink-auto.py maps
+(lib/entity_table.py).
+
+Also started by wikilink-auto.py with --background when the cache is
+missing (see lib/wikilink_entities.py).
 
 Exit codes:
 - 0: Success (cache rebuilt)
 """
 
 import json
+import os
 import sys
-import re
+import signal
+import time
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
@@ -24,125 +31,218 @@ from collections import defaultdict
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.loader import load_config, get_periodic_folders
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.wikilink_entities import (
+    BUILD_LOCK_STALE, acquire_build_lock, categorize_entity, compile_exclusions, is_valid_entity,
+    page_names, release_build_lock, write_entity_cache, write_json_atomic
+)
+from lib.hook_timing import current as current_timer, timed_hook
+from lib.vault_scan import SCAN_WORKERS, list_directory, walk_vault
+
+# Directory index format; bump to force a full rescan after format changes
+INDEX_VERSION = 1
+
+# Directories modified this recently are not trusted as unchanged next run
+RACY_WINDOW_NS = 2_000_000_000
 
 def get_vault_path():
     """Get the vault path from current working directory."""
     return Path.cwd()
 
 
+def load_json(path: Path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def scan_directories(vault_path: Path, previous: dict, workers: int = SCAN_WORKERS) -> tuple:
+    """
+    Walk the vault, re-listing only directories whose mtime changed.
+
+    A directory's mtime changes whenever an entry is added, removed or
+    renamed in it, which is all the cache depends on (page names, not
+    content). Unchanged directories are stat'ed but not listed. Both run
+    on lib/vault_scan.py's thread pool.
+
+    Returns:
+        (dirs, changed) - dirs maps 'rel/dir' -> {'mtime_ns', 'files', 'subdirs'};
+        changed lists the directories that were re-listed
+    """
+    def visit(rel_dir: str, abs_dir: str):
+        try:
+            mtime_ns = os.stat(abs_dir).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = previous.get(rel_dir)
+        listed = entry is None or entry.get('mtime_ns') != mtime_ns
+        if listed:
+            # A change in the same clock tick as this scan would not move the
+            # mtime again, so recently modified directories are re-listed next time
+            racy = time.time_ns() - mtime_ns < RACY_WINDOW_NS
+            try:
+                listing = list_directory(abs_dir)
+            except OSError:
+                return None
+            entry = {
+                'mtime_ns': None if racy else mtime_ns,
+                'files': sorted(item.name for item in listing.files),
+                'subdirs': sorted(listing.subdirs),
+            }
+        return (rel_dir, entry, listed), entry['subdirs']
+
+    timer = current_timer()
+    dirs = {}
+    changed = []
+    for rel_dir, entry, listed in walk_vault(vault_path, visit, workers):
+        dirs[rel_dir] = entry
+        if listed:
+            changed.append(rel_dir)
+            timer.count('files_scanned', len(entry['files']))
+    timer.count('dirs_listed', len(changed))
+    timer.count('dirs_unchanged', len(dirs) - len(changed))
+
+    # Listings complete in any order; keep the saved index stable
+    return dict(sorted(dirs.items())), sorted(changed)
+
+
+def file_deltas(previous: dict, dirs: dict, changed: list) -> tuple:
+    """(added, removed) vault-relative .md paths between two directory indexes."""
+    added, removed = set(), set()
+
+    def paths(rel_dir, names):
+        prefix = rel_dir + '/' if rel_dir else ''
+        return {prefix + name for name in names}
+
+    for rel_dir in changed:
+        old = paths(rel_dir, previous.get(rel_dir, {}).get('files', ()))
+        new = paths(rel_dir, dirs[rel_dir]['files'])
+        added |= new - old
+        removed |= old - new
+
+    # Directories that no longer exist (deleted, renamed or now hidden)
+    for rel_dir in previous.keys() - dirs.keys():
+        removed |= paths(rel_dir, previous[rel_dir].get('files', ()))
+
+    return added, removed
+
+
 def rebuild_wikilink_cache():
-    """Rebuild wikilink cache by scanning vault for actual page files."""
+    """
+    Bring the wikilink cache up to date with the pages in the vault.
+
+    Uses .claude/wikilink-index.json (per-directory mtimes and file lists)
+    to rescan only directories that changed since the last run, then
+    applies the added/removed pages to the existing entity cache. Falls
+    back to a full scan when the index is missing, stale or the periodic
+    folder config changed.
+    """
     config = load_config()
     vault_path = get_vault_path()
     cache_file = vault_path / '.claude' / 'wikilink-entities.json'
+    index_file = vault_path / '.claude' / 'wikilink-index.json'
 
-    # Tech keywords for categorization
-    TECH_KEYWORDS = [
-        'databricks', 'api', 'code', 'azure', 'sql', 'git',
-        'node', 'react', 'powerbi', 'excel', 'copilot',
-        'fabric', 'apim', 'endpoint', 'synology', 'tailscale',
-        'obsidian', 'claude', 'powershell',
-        'adf', 'adb', 'net', 'python', 'javascript'
-    ]
-
-    # Get periodic note folders from config
+    # Get periodic note folders from config (excluded from entities)
     periodic_folders = get_periodic_folders(config)
 
-    # Build a set of all actual pages in the vault (file stems without .md)
-    # Only include wikilinks that have backing pages
-    existing_pages = set()
-    page_paths = {}  # Map page name to relative path for context
-
-    for md_file in vault_path.rglob('*.md'):
-        # Skip .claude and .obsidian directories
-        rel_path = md_file.relative_to(vault_path)
-        if any(part.startswith('.') for part in rel_path.parts):
-            continue
-
-        # Get the page name (file stem)
-        page_name = md_file.stem
-        existing_pages.add(page_name)
-
-        # Also add the relative path without extension as a valid link target
-        rel_path_no_ext = str(rel_path.with_suffix('')).replace('\\', '/')
-        existing_pages.add(rel_path_no_ext)
-        page_paths[page_name] = str(rel_path)
-
-    # Build exclusion patterns dynamically from config
-    EXCLUDE_PATTERNS = [
-        r'^\d{4}-\d{2}-\d{2}$',           # ISO dates like 2025-01-01
-        r'^\d{1,2}/\d{1,2}/\d{4}$',       # UK dates like 1/10/2024
-        r'^\d{4}-W\d{2}$',                 # Week dates like 2025-W17
-        r'^\d{4}-\d{2}$',                  # Month format like 2025-01
-        r'^\d{4}-Q\d$',                    # Quarter dates like 2025-Q4
-        r'^\d+$',                          # Pure numbers
-        r'^@',                             # Twitter handles
-        r'^<',                             # XML/HTML tags
-        r'^\{\{',                          # Template placeholders
-        r'\\$',                            # Paths ending in backslash
-        r'\.(?:md|js|py|json|jpg|png|pdf|csv)$',  # File extensions
-        r'^[a-z0-9_-]+\.[a-z]+$',          # File names with extensions
-    ]
-
-    # Add periodic note folder exclusions from config
-    for folder in periodic_folders:
-        EXCLUDE_PATTERNS.append(f'^{re.escape(folder)}/')
-
-    # Collect pages that pass all filters
-    valid_entities = set()
-
-    for page in existing_pages:
-        # Skip if matches any exclude pattern
-        if any(re.match(pattern, page, re.IGNORECASE) for pattern in EXCLUDE_PATTERNS):
-            continue
-
-        # Skip very short names (likely abbreviations or common words)
-        if len(page) < 2:
-            continue
-
-        valid_entities.add(page)
-
-    # Categorize
-    categorized = defaultdict(list)
-
-    for link in valid_entities:
-        # Categorize
-        if any(tech in link.lower() for tech in TECH_KEYWORDS):
-            categorized['technologies'].append(link)
-        elif link.isupper() and 2 <= len(link) <= 6:
-            categorized['acronyms'].append(link)
-        elif ' ' in link and len(link.split()) == 2:
-            categorized['people'].append(link)
-        elif ' ' in link:
-            categorized['projects'].append(link)
-        else:
-            categorized['other'].append(link)
+    # Previous state is only usable if both files agree on format and config
+    index = load_json(index_file)
+    cache = load_json(cache_file)
+    incremental = (
+        isinstance(index, dict) and isinstance(cache, dict)
+        and index.get('version') == INDEX_VERSION
+        and index.get('periodic_folders') == periodic_folders
+        and isinstance(index.get('dirs'), dict)
+    )
+    previous_dirs = index['dirs'] if incremental else {}
+
+    timer = current_timer()
+    with timer.stage('scan'):
+        dirs, changed = scan_directories(vault_path, previous_dirs)
+
+    if incremental and not changed and dirs.keys() == previous_dirs.keys():
+        # Nothing added, removed or renamed anywhere - cache is current
+        return cache.get('_metadata', {}).get('total_entities', 0)
+
+    # Only pages in directories that changed need to be looked at
+    added_files, removed_files = file_deltas(previous_dirs, dirs, changed)
+
+    exclude_re = compile_exclusions(periodic_folders)
+
+    # Start from the previous categories and apply the page deltas
+    categorized = defaultdict(set)
+    if incremental:
+        for category, entities in cache.items():
+            if category != '_metadata':
+                categorized[category].update(entities)
+
+    if removed_files:
+        # A stem stays linkable while any other page still has it
+        remaining_stems = {
+            name[:-3] for entry in dirs.values() for name in entry['files']
+        }
+        for rel_file in removed_files:
+            stem, rel_no_ext = page_names(rel_file)
+            removed_pages = [rel_no_ext] if rel_no_ext != stem else []
+            if stem not in remaining_stems:
+                removed_pages.append(stem)
+            for page in removed_pages:
+                if is_valid_entity(page, exclude_re):
+                    categorized[categorize_entity(page)].discard(page)
+
+    for rel_file in added_files:
+        for page in page_names(rel_file):
+            if is_valid_entity(page, exclude_re):
+                categorized[categorize_entity(page)].add(page)
 
     # Sort each category
-    cache = {k: sorted(set(v)) for k, v in categorized.items()}
+    cache = {k: sorted(v) for k, v in categorized.items() if v}
 
     # Add metadata
     cache['_metadata'] = {
-        'total_entities': sum(len(v) for v in categorized.values()),
+        'total_entities': sum(len(v) for v in cache.values()),
         'generated_at': datetime.now().isoformat(),
         'vault_path': str(vault_path),
         'source': 'flywheel wikilink-cache hook',
         'generator': 'flywheel v1.0.0'
     }
 
-    # Save cache
+    # Save cache (JSON export + binary table) and directory index
+    # (compact, atomic - hooks read these mid-build)
     try:
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-        cache_file.write_text(json.dumps(cache, indent=2), encoding='utf-8')
+        with timer.stage('write'):
+            write_entity_cache(cache_file, cache)
+            write_json_atomic(index_file, {
+                'version': INDEX_VERSION,
+                'periodic_folders': periodic_folders,
+                'dirs': dirs,
+            })
+        timer.count('entities', cache['_metadata']['total_entities'])
         return cache['_metadata']['total_entities']
     except Exception as e:
         raise RuntimeError(f"Failed to write cache: {e}")
 
 
 def main():
-    """Main entry point for SessionStart hook."""
+    """Main entry point for SessionStart hook (or --background build from wikilink-auto.py)."""
+    background = '--background' in sys.argv[1:]
+    if background:
+        # The lock was taken by start_background_build()
+        # Stay out of the way of the session, and never outlive the build lock
+        if hasattr(os, 'nice'):
+            os.nice(10)
+        if hasattr(signal, 'SIGALRM'):
+            signal.alarm(BUILD_LOCK_STALE)
+    elif not acquire_build_lock(get_vault_path()):
+        # A background build is bringing the cache up to date already
+        print("Wikilink cache: build already running")
+        sys.exit(0)
+
     try:
-        entity_count = rebuild_wikilink_cache()
+        with timed_hook('wikilink-cache', background=background):
+            entity_count = rebuild_wikilink_cache()
 
         # Output status message (will be picked up by session-start.py)
         print(f"Wikilink cache: {entity_count} entities")
@@ -152,6 +252,9 @@ def main():
         print(f"Wikilink cache error: {e}", file=sys.stderr)
         sys.exit(0)  # Don't block session start
 
+    finally:
+        release_build_lock(get_vault_path())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Hook Benchmark - Measures how the hook pipeline scales with vault size.
+
+Generates synthetic vaults (notes spread over a two-level folder tree,
+frontmatter, entity mentions, a session transcript), then runs each hook
+several times in-process (as hook-server.py does) and as a subprocess
+(as Claude Code does without the server), and reports wall time per call.
+
+The first call after the vault caches are reset is reported as cold_ms;
+median/p95/max cover the remaining (warm) calls. Between calls the
+benchmark makes the change a session would: the edited note gets a new
+log line, a note is added for wikilink-cache, and the transcript grows.
+
+The noop case is the most common call of all: post-mutation for an Edit
+of a non-markdown file, which hook-client.py rejects before any hook
+import (lib/bootstrap.py).
+
+Usage:
+    python packages/claude-plugin/scripts/benchmark-hooks.py
+    python packages/claude-plugin/scripts/benchmark-hooks.py --sizes 1000,10000,100000 --output results.json
+    python packages/claude-plugin/scripts/benchmark-hooks.py --check
+    python packages/claude-plugin/scripts/benchmark-hooks.py --baseline results.json --max-regression 0.25
+
+Generated vaults are kept in --work-dir and reused by later runs with the
+same parameters.
+
+Exit codes:
+    0: Benchmark ran (and met the thresholds, with --check/--baseline)
+    1: A hook exceeded its budget or regressed past --max-regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Configure UTF-8 output for Windows console
+try:
+    sys.stdout.reconfigure(encoding='utf-8')
+except AttributeError:
+    pass
+
+HOOKS_DIR = Path(__file__).parent.parent / 'hooks'
+sys.path.insert(0, str(HOOKS_DIR))
+from lib.hook_server import run_hook_main
+from lib.hook_timing import percentile
+
+DEFAULT_THRESHOLDS = Path(__file__).parent / 'benchmark-thresholds.json'
+
+HOOKS = ('noop', 'wikilink-cache', 'pre-mutation-gate', 'wikilink-auto', 'frontmatter-auto', 'post-mutation')
+
+# Script and hook run for each case, when it is not <hook>.py / <hook>
+SUBPROCESS_COMMANDS = {'noop': ['hook-client.py', 'post-mutation']}
+INPROCESS_HOOKS = {'noop': 'post-mutation'}
+MODES = ('inprocess', 'subprocess')
+
+RESULTS_VERSION = 1
+
+# Median growth below this is timer noise, whatever --max-regression says
+NOISE_FLOOR_MS = 2.0
+
+# Name parts for synthetic entities: 400 two-syllable words, 160k two-word names
+_SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ven', 'tor', 'sel', 'dun', 'bri', 'fa',
+              'hol', 'mar', 'zen', 'pel', 'rus', 'tam', 'wil', 'yor', 'lin', 'bek']
+_WORDS = [(a + b).capitalize() for a in _SYLLABLES for b in _SYLLABLES if a != b] + \
+         [(a + a).capitalize() for a in _SYLLABLES]
+
+_FILLER = ('the', 'team', 'review', 'plan', 'notes', 'about', 'with', 'follow', 'up', 'on',
+           'draft', 'meeting', 'ideas', 'for', 'next', 'week', 'and', 'open', 'questions', 'from')
+
+_STATUSES = ('active', 'active', 'done', 'paused')
+
+
+def entity_name(index: int) -> str:
+    """Deterministic unique two-word note name."""
+    return f"{_WORDS[index % len(_WORDS)]} {_WORDS[(index // len(_WORDS)) % len(_WORDS)]}"
+
+
+class VaultSpec:
+    """Parameters of one synthetic vault."""
+
+    def __init__(self, notes: int, fanout: int, entity_density: float, note_words: int,
+                 transcript_events: int, seed: int):
+        self.notes = notes
+        self.fanout = fanout
+        self.entity_density = entity_density
+        self.note_words = note_words
+        self.transcript_events = transcript_events
+        self.seed = seed
+
+    def to_json(self) -> dict:
+        return dict(vars(self))
+
+    @property
+    def dir_name(self) -> str:
+        return (f"vault-{self.notes}-f{self.fanout}-e{self.entity_density}-w{self.note_words}"
+                f"-t{self.transcript_events}-s{self.seed}")
+
+    def folders(self) -> list:
+        """Leaf folders: fanout top-level areas with fanout subfolders each."""
+        return [f"area-{a:02d}/topic-{t:02d}" for a in range(self.fanout) for t in range(self.fanout)]
+
+    def note_path(self, index: int) -> str:
+        folders = self.folders()
+        return f"{folders[index % len(folders)]}/{entity_name(index)}.md"
+
+
+def note_body(rng: random.Random, spec: VaultSpec, folder_type: str) -> str:
+    words = []
+    for _ in range(spec.note_words):
+        if rng.random() < spec.entity_density:
+            words.append(entity_name(rng.randrange(spec.notes)))
+        else:
+            words.append(rng.choice(_FILLER))
+    lines = [' '.join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    frontmatter = f"---\ntype: {folder_type}\nstatus: {rng.choice(_STATUSES)}\ntags: [bench]\n---\n"
+    return frontmatter + "\n## Log\n" + '\n'.join(f"- {line}" for line in lines) + "\n"
+
+
+def generate_vault(work_dir: Path, spec: VaultSpec) -> Path:
+    """Create (or reuse) the vault for spec. Returns the vault path."""
+    vault = work_dir / spec.dir_name
+    marker = vault / '.bench-complete'
+    if marker.exists():
+        return vault
+
+    if vault.exists():
+        shutil.rmtree(vault)
+    rng = random.Random(spec.seed)
+    (vault / '.obsidian').mkdir(parents=True)
+    for folder in spec.folders():
+        (vault / folder).mkdir(parents=True)
+
+    for index in range(spec.notes):
+        rel = spec.note_path(index)
+        folder_type = rel.split('/', 1)[0]
+        (vault / rel).write_text(note_body(rng, spec, folder_type), encoding='utf-8')
+
+    # Session transcript: mostly conversation lines, one in five a Read
+    target = vault / spec.note_path(spec.notes // 2)
+    with open(vault / '.bench-transcript.jsonl', 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'type': 'tool_use', 'name': 'Read', 'input': {'file_path': str(target)}}) + '\n')
+        for _ in range(spec.transcript_events):
+            f.write(transcript_event(rng, spec, vault) + '\n')
+
+    marker.write_text(json.dumps(spec.to_json()), encoding='utf-8')
+    return vault
+
+
+def transcript_event(rng: random.Random, spec: VaultSpec, vault: Path) -> str:
+    if rng.random() < 0.2:
+        path = vault / spec.note_path(rng.randrange(spec.notes))
+        return json.dumps({'type': 'tool_use', 'name': 'Read', 'input': {'file_path': str(path)}})
+    text = ' '.join(rng.choice(_FILLER) for _ in range(40))
+    return json.dumps({'type': 'assistant', 'message': {'content': [{'type': 'text', 'text': text}]}})
+
+
+def reset_caches(vault: Path, state_dir: Path) -> None:
+    """Drop everything the hooks persisted, so the next call is cold."""
+    shutil.rmtree(vault / '.claude', ignore_errors=True)
+    shutil.rmtree(state_dir, ignore_errors=True)
+    state_dir.mkdir(parents=True)
+
+
+class HookRun:
+    """Prepares the vault before each call of one hook and builds its input."""
+
+    def __init__(self, hook: str, vault: Path, spec: VaultSpec, mode: str):
+        self.hook = hook
+        self.vault = vault
+        self.spec = spec
+        self.mode = mode
+        self.target = vault / spec.note_path(spec.notes // 2)
+        self.original = self.target.read_text(encoding='utf-8')
+        self.transcript = vault / '.bench-transcript.jsonl'
+        self.transcript_size = self.transcript.stat().st_size
+        self.rng = random.Random(spec.seed + 1)
+        self.scratch = []
+
+    def prepare(self, call: int) -> str:
+        """Apply this call's change and return the hook's stdin JSON."""
+        if self.hook == 'wikilink-cache':
+            if call:
+                scratch = self.target.with_name(f'Bench Scratch {call}.md')
+                scratch.write_text("# Scratch\n", encoding='utf-8')
+                self.scratch.append(scratch)
+            return ''
+
+        if self.hook == 'noop':
+            return json.dumps({
+                'tool_name': 'Edit',
+                'tool_input': {'file_path': str(self.target.with_suffix('.py'))},
+            })
+
+        if self.hook == 'pre-mutation-gate':
+            if call:
+                with open(self.transcript, 'a', encoding='utf-8') as f:
+                    for _ in range(20):
+                        f.write(transcript_event(self.rng, self.spec, self.vault) + '\n')
+            return json.dumps({
+                'tool_name': 'Edit',
+                'tool_input': {'file_path': str(self.target)},
+                'session_id': f'bench-{self.mode}',
+                'transcript_path': str(self.transcript),
+            })
+
+        mention = entity_name(self.rng.randrange(self.spec.notes))
+        new_line = f"- call {call}: synced with {mention} on the plan\n"
+        self.target.write_text(self.original + new_line, encoding='utf-8')
+        return json.dumps({
+            'tool_name': 'Edit',
+            'tool_input': {'file_path': str(self.target), 'old_string': '', 'new_string': new_line},
+        })
+
+    def restore(self) -> None:
+        self.target.write_text(self.original, encoding='utf-8')
+        for scratch in self.scratch:
+            scratch.unlink()
+        with open(self.transcript, 'r+b') as f:
+            f.truncate(self.transcript_size)
+
+
+def call_inprocess(hook: str, raw_input: str) -> float:
+    hook = INPROCESS_HOOKS.get(hook, hook)
+    start = time.perf_counter()
+    run_hook_main(hook, raw_input)
+    return (time.perf_counter() - start) * 1000
+
+
+def call_subprocess(hook: str, raw_input: str, vault: Path, env: dict) -> float:
+    script, *args = SUBPROCESS_COMMANDS.get(hook, [f'{hook}.py'])
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(HOOKS_DIR / script), *args], input=raw_input.encode('utf-8'),
+                   capture_output=True, cwd=str(vault), env=env, timeout=600)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_hook(hook: str, mode: str, vault: Path, spec: VaultSpec, runs: int, env: dict) -> dict:
+    run = HookRun(hook, vault, spec, mode)
+    samples = []
+    try:
+        for call in range(runs):
+            raw_input = run.prepare(call)
+            if mode == 'inprocess':
+                samples.append(call_inprocess(hook, raw_input))
+            else:
+                samples.append(call_subprocess(hook, raw_input, vault, env))
+    finally:
+        run.restore()
+
+    warm = samples[1:] or samples
+    return {
+        'hook': hook,
+        'mode': mode,
+        'notes': spec.notes,
+        'runs': runs,
+        'cold_ms': round(samples[0], 3),
+        'median_ms': round(percentile(warm, 50), 3),
+        'p95_ms': round(percentile(warm, 95), 3),
+        'max_ms': round(max(warm), 3),
+    }
+
+
+def run_benchmarks(work_dir: Path, specs: list, hooks: tuple, modes: tuple, runs: int, log=print) -> dict:
+    """Benchmark every hook, mode and vault spec. Returns the results document."""
+    state_dir = work_dir / 'state'
+    saved_env, saved_cwd = dict(os.environ), os.getcwd()
+    os.environ['CLAUDE_LOCAL_STATE_DIR'] = str(state_dir)
+    os.environ.pop('FLYWHEEL_HOOK_TIMING', None)
+    env = dict(os.environ)
+    results = []
+    try:
+        for spec in specs:
+            log(f"Generating vault: {spec.notes} notes")
+            vault = generate_vault(work_dir, spec)
+            os.chdir(vault)
+            for mode in modes:
+                reset_caches(vault, state_dir)
+                for hook in hooks:
+                    result = bench_hook(hook, mode, vault, spec, runs, env)
+                    results.append(result)
+                    log(format_result(result))
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+    return {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'specs': [spec.to_json() for spec in specs],
+        'results': results,
+    }
+
+
+def format_result(result: dict) -> str:
+    return (f"  {result['hook']:<18} {result['mode']:<10} {result['notes']:>7} notes  "
+            f"cold {result['cold_ms']:>9.1f} ms  median {result['median_ms']:>9.1f} ms  "
+            f"p95 {result['p95_ms']:>9.1f} ms")
+
+
+def result_key(result: dict) -> str:
+    return f"{result['hook']}:{result['mode']}:{result['notes']}"
+
+
+def check_budgets(results: list, budgets: dict) -> list:
+    """Failures for results whose median exceeds budgets[hook:mode:notes] (ms)."""
+    failures = []
+    for result in results:
+        budget = budgets.get(result_key(result))
+        if budget is not None and result['median_ms'] > budget:
+            failures.append(f"{result_key(result)}: median {result['median_ms']:.1f} ms > budget {budget} ms")
+    return failures
+
+
+def check_regressions(results: list, baseline: list, max_regression: float) -> list:
+    """Failures for results whose median grew by more than max_regression over the baseline."""
+    previous = {result_key(r): r['median_ms'] for r in baseline}
+    failures = []
+    for result in results:
+        before = previous.get(result_key(result))
+        if before and result['median_ms'] > max(before * (1 + max_regression), before + NOISE_FLOOR_MS):
+            failures.append(f"{result_key(result)}: median {result['median_ms']:.1f} ms vs "
+                            f"baseline {before:.1f} ms (+{result['median_ms'] / before - 1:.0%})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flywheel hooks against synthetic vaults.")
+    parser.add_argument('--sizes', default='1000', help="Comma-separated note counts (default: 1000)")
+    parser.add_argument('--fanout', type=int, default=10, help="Folders per level, two levels deep (default: 10)")
+    parser.add_argument('--entity-density', type=float, default=0.02,
+                        help="Fraction of body words that mention another note (default: 0.02)")
+    parser.add_argument('--note-words', type=int, default=200, help="Body words per note (default: 200)")
+    parser.add_argument('--transcript-events', type=int, default=5000,
+                        help="Lines in the session transcript (default: 5000)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--runs', type=int, default=7, help="Calls per hook and mode (default: 7)")
+    parser.add_argument('--hooks', default=','.join(HOOKS))
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--work-dir', type=Path, default=Path(tempfile.gettempdir()) / 'flywheel-bench',
+                        help="Where generated vaults are kept")
+    parser.add_argument('--output', type=Path, help="Write the results JSON to this file")
+    parser.add_argument('--check', nargs='?', type=Path, const=DEFAULT_THRESHOLDS, metavar='THRESHOLDS',
+                        help="Fail if a median exceeds its budget (default: benchmark-thresholds.json)")
+    parser.add_argument('--baseline', type=Path, help="Results JSON of an earlier run to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="Allowed median growth over --baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    specs = [VaultSpec(int(size), args.fanout, args.entity_density, args.note_words,
+                       args.transcript_events, args.seed) for size in args.sizes.split(',')]
+    hooks = tuple(h for h in args.hooks.split(',') if h)
+    modes = tuple(m for m in args.modes.split(',') if m)
+    unknown = [h for h in hooks if h not in HOOKS] + [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown hook or mode: {', '.join(unknown)}")
+
+    args.work_dir.mkdir(parents=True, exist_ok=True)
+    document = run_benchmarks(args.work_dir, specs, hooks, modes, max(args.runs, 1))
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + '\n', encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+    failures = []
+    if args.check:
+        thresholds = json.loads(args.check.read_text(encoding='utf-8'))
+        failures += check_budgets(document['results'], thresholds.get('budgets', {}))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        failures += check_regressions(document['results'], baseline.get('results', []), args.max_regression)
+
+    if failures:
+        print(f"\n❌ {len(failures)} benchmark threshold(s) exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+    if args.check or args.baseline:
+        print("\n✅ All benchmarks within thresholds")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()